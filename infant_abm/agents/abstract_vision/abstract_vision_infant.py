@@ -2,7 +2,7 @@ import math
 import numpy as np
 
 from infant_abm.agents.infant import Infant, Params
-from infant_abm.agents.events import ToySelected, ToyThrown, ThrowEvaluation
+from infant_abm.agents.events import THROW_EVALUATION
 from infant_abm.agents.position import Position
 from infant_abm.agents import infant_actions
 
@@ -39,7 +39,7 @@ class AbstractVisionInfant(Infant):
 
         self.current_persistence_boost_duration = 0
 
-        self.next_action = infant_actions.LookForToy()
+        self.next_action = infant_actions.LOOK_FOR_TOY
 
     def step(self):
         next_action = super()._perform_action(self.next_action)
@@ -52,47 +52,50 @@ class AbstractVisionInfant(Infant):
         self.current_persistence_boost_duration = 0
         self.params.persistence.reset()
 
-        toys = self.model.get_toys()
-
-        probabilities = np.array([self._toy_probability(toy) for toy in toys])
-        probabilities /= probabilities.sum()
-
-        [target] = np.random.choice(toys, size=1, p=probabilities)
+        target = self._choose_toy()
         self.velocity = Position.calc_norm_vector(self.pos, target.pos)
         self.target = target
 
-        return infant_actions.EvaluateToy()
+        return infant_actions.EVALUATE_TOY
 
     def _step_evaluate_toy(self, action: infant_actions.EvaluateToy):
-        if self.parent_visible and self.model.parent.infant_visible:
+        if self.parent_visible and self.parent.infant_visible:
             self.params.persistence.boost(self.PERSISTENCE_BOOST_VALUE)
 
             self._reset_visible()
-            return infant_actions.Crawl(metadata="persistence_boost")
+            return infant_actions.CRAWL_PERSISTENCE_BOOST
         elif action.duration == self.TOY_EVALUATION_DURATION:
             self._reset_visible()
-            return infant_actions.Crawl(metadata="no_boost")
+            return infant_actions.CRAWL_NO_BOOST
         else:
-            if chance(self.TOY_EVALUATION_INFANT_CHANCE, self.TOY_EVALUATION_DURATION):
+            if chance(
+                self.TOY_EVALUATION_INFANT_CHANCE,
+                self.TOY_EVALUATION_DURATION,
+                self.model.rng,
+            ):
                 self.parent_visible = True
 
-            if chance(self.TOY_EVALUATION_PARENT_CHANCE, self.TOY_EVALUATION_DURATION):
-                self.model.parent.handle_event(ToySelected(self.target))
+            if chance(
+                self.TOY_EVALUATION_PARENT_CHANCE,
+                self.TOY_EVALUATION_DURATION,
+                self.model.rng,
+            ):
+                self.parent.handle_event(self.target.selected_event)
 
-            return infant_actions.EvaluateToy(action.duration + 1)
+            return action.next()
 
     def _step_interact_with_toy(self, _action):
         self.params.coordination.reset()
         throw_direction = None
 
-        if self.params.coordination.e2 > np.random.rand():
-            parent_dist = math.dist(self.pos, self.model.parent.pos)
+        if self.params.coordination.e2 > self.model.rng.random():
+            parent_dist = math.dist(self.pos, self.parent.pos)
             throw_range = min(self.TOY_THROW_RANGE, parent_dist)
             throw_direction = (
-                Position.calc_norm_vector(self.pos, self.model.parent.pos) * throw_range
+                Position.calc_norm_vector(self.pos, self.parent.pos) * throw_range
             )
         else:
-            throw_angle = np.random.uniform(0, 2 * np.pi)
+            throw_angle = self.model.rng.uniform(0, 2 * np.pi)
             throw_direction = np.array([np.cos(throw_angle), np.sin(throw_angle)])
             throw_direction *= self.TOY_THROW_RANGE
 
@@ -100,20 +103,20 @@ class AbstractVisionInfant(Infant):
         self.target.move_agent(new_pos)
 
         self.target.interact()
-        self.model.parent.handle_event(ToyThrown(self.target))
+        self.parent.handle_event(self.target.thrown_event)
 
         self.target = None
 
-        return infant_actions.LookForToy()
+        return infant_actions.LOOK_FOR_TOY
 
     def _step_crawl(self, _action):
         if self._target_in_range():
             self._start_evaluating_throw()
-            return infant_actions.EvaluateThrow()
+            return infant_actions.EVALUATE_THROW
 
         if self._gets_distracted():
             self.target = None
-            return infant_actions.LookForToy()
+            return infant_actions.LOOK_FOR_TOY
 
         self._move()
 
@@ -121,37 +124,41 @@ class AbstractVisionInfant(Infant):
         if self.current_persistence_boost_duration == self.PERSISTENCE_BOOST_DURATION:
             self.params.persistence.reset()
 
-        return infant_actions.Crawl()
+        return infant_actions.CRAWL
 
     def _step_evaluate_throw(self, action: infant_actions.EvaluateThrow):
-        if self.parent_visible and self.model.parent.infant_visible:
+        if self.parent_visible and self.parent.infant_visible:
             self.params.coordination.boost(self.COORDINATION_BOOST_VALUE)
 
             self._reset_visible()
-            return infant_actions.InteractWithToy(metadata="coordination_boost")
+            return infant_actions.INTERACT_WITH_TOY_COORDINATION_BOOST
         elif action.duration == self.TOY_EVALUATION_DURATION:
             self._reset_visible()
-            return infant_actions.InteractWithToy()
+            return infant_actions.INTERACT_WITH_TOY
         else:
             if chance(
-                self.THROW_EVALUATION_INFANT_CHANCE, self.THROW_EVALUATION_DURATION
+                self.THROW_EVALUATION_INFANT_CHANCE,
+                self.THROW_EVALUATION_DURATION,
+                self.model.rng,
             ):
                 self.parent_visible = True
 
             if chance(
-                self.THROW_EVALUATION_PARENT_CHANCE, self.THROW_EVALUATION_DURATION
+                self.THROW_EVALUATION_PARENT_CHANCE,
+                self.THROW_EVALUATION_DURATION,
+                self.model.rng,
             ):
-                self.model.parent.handle_event(ThrowEvaluation())
+                self.parent.handle_event(THROW_EVALUATION)
 
-            return infant_actions.EvaluateThrow(action.duration + 1)
+            return action.next()
 
     # Helper functions
 
     def _start_evaluating_throw(self):
-        if 0.5 > np.random.rand():
+        if 0.5 > self.model.rng.random():
             self.parent_visible = True
-            self.model.parent.handle_event(ThrowEvaluation())
+            self.parent.handle_event(THROW_EVALUATION)
 
     def _reset_visible(self):
         self.parent_visible = False
-        self.model.parent.infant_visible = False
+        self.parent.infant_visible = False
@@ -13,13 +13,24 @@ class Agent(mesa.Agent):
         self.pos = pos
 
         # Direction of the agent ranging from 0 to +2π
-        self.direction = np.random.uniform(0, 2 * np.pi)
+        self.direction = self.model.rng.uniform(0, 2 * np.pi)
 
     def move_agent(self, new_pos):
-        new_pos = Position.correct_out_of_bounds(new_pos)
-        self.rotate_towards(new_pos)
-
-        self.model.space.move_agent(self, new_pos)
+        # Corrected in place, callers turn towards the corrected position
+        x, y = Position.correct_out_of_bounds(new_pos).tolist()
+        self.move_to(x, y)
+
+    def move_to(self, x: float, y: float):
+        """
+        Move to the point corrected for the arena bounds, facing the direction
+        of the move. The position array is updated in place.
+        """
+        x, y = Position.within_bounds(x, y)
+        x1, y1 = self.pos.tolist()
+        self.direction = Position.heading(x - x1, y - y1)
+
+        self.pos[0] = x
+        self.pos[1] = y
 
     def rotate_towards(self, pos):
         self.direction = Position.angle(self.pos, pos)
@@ -1,12 +1,50 @@
-class ToyThrown:
-    def __init__(self, toy) -> None:
-        self.toy = toy
+"""
+Events sent by infants to their parent.
+
+Like infant actions, events are immutable and preallocated: every toy holds
+its ToyThrown and ToySelected events, and THROW_EVALUATION is shared. The
+integer `code` of an event class is its position in EVENTS, which
+Parent.handle_event uses to look up the handler method named by `handler`.
+"""
+
+
+class Event:
+    __slots__ = ()
 
+    code: int = None
+    handler: str = None
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class ToyEvent(Event):
+    __slots__ = ("toy",)
 
-class ToySelected:
     def __init__(self, toy) -> None:
-        self.toy = toy
+        object.__setattr__(self, "toy", toy)
+
+    def __reduce__(self):
+        return type(self), (self.toy,)
+
+
+class ToyThrown(ToyEvent):
+    __slots__ = ()
+    handler = "_handle_event_toy_thrown"
+
+
+class ToySelected(ToyEvent):
+    __slots__ = ()
+    handler = "_handle_event_toy_selected"
+
+
+class ThrowEvaluation(Event):
+    __slots__ = ()
+    handler = "_handle_event_throw_evaluation"
+
 
+EVENTS = (ToyThrown, ToySelected, ThrowEvaluation)
+for code, event_class in enumerate(EVENTS):
+    event_class.code = code
 
-class ThrowEvaluation:
-    pass
+THROW_EVALUATION = ThrowEvaluation()
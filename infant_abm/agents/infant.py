@@ -3,7 +3,7 @@ import numpy as np
 import dataclasses
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 from infant_abm.agents.parameter import Parameter
 from infant_abm.agents.agent import Agent
@@ -38,7 +38,7 @@ class Params:
         return np.array([self.perception.e2, self.persistence.e2, self.coordination.e2])
 
     def to_dict(self):
-        return {k: parameter.e2 for k, parameter in asdict(self).items()}
+        return {f.name: getattr(self, f.name).e2 for f in dataclasses.fields(self)}
 
     def reset(self):
         fields = dataclasses.fields(self)
@@ -68,37 +68,53 @@ class Infant(Agent, ABC):
         self.params: Params = params
         self.velocity = None
 
+        # Partner of the dyad, set by pair()
+        self.parent = None
+
     @abstractmethod
     def step(self):
         pass
 
+    def pair(self, parent):
+        """
+        Make the infant and the parent partners of one dyad
+        """
+        self.parent = parent
+        parent.infant = self
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Handler function of every action code, None for unsupported actions
+        cls._action_handlers = tuple(
+            getattr(cls, action.handler, None) for action in infant_actions.ACTIONS
+        )
+
     def _perform_action(self, action):
-        match action:
-            case infant_actions.LookForToy():
-                return self._step_look_for_toy(action)
-            case infant_actions.EvaluateToy():
-                return self._step_evaluate_toy(action)
-            case infant_actions.Crawl():
-                return self._step_crawl(action)
-            case infant_actions.InteractWithToy():
-                return self._step_interact_with_toy(action)
-            case infant_actions.EvaluateThrow():
-                return self._step_evaluate_throw(action)
+        return self._action_handlers[action.code](self, action)
 
     def _move(self):
-        self.velocity = Position.calc_norm_vector(self.pos, self.target.pos)
-        new_pos = self.pos + self.velocity * self.SPEED
-        self.move_agent(new_pos)
+        dx, dy = Position.norm_components(self.pos, self.target.pos)
+        x, y = self.pos.tolist()
+        self.move_to(x + dx * self.SPEED, y + dy * self.SPEED)
 
-    def _toy_probability(self, toy):
-        return np.power(
-            (toy.times_interacted_with + 1e-5), 2 * self.params.perception.e2 - 1
-        )
+    def _choose_toy(self):
+        """
+        Random toy, weighted by the number of past interactions with it:
+        perception above 0.5 prefers familiar toys, below 0.5 novel ones
+        """
+        exponent = 2 * self.params.perception.e2 - 1
+        index = self.model.toy_choice.choose(exponent, self.model.rng)
+
+        return self.model.toys[index]
 
     def _gets_distracted(self):
         if self.params.persistence.e1 == 1:
             return True
-        return self.params.persistence.e2**self.DISTRACTION_EXPONENT < np.random.rand()
+        return (
+            self.params.persistence.e2**self.DISTRACTION_EXPONENT
+            < self.model.rng.random()
+        )
 
     def _target_in_range(self):
         return math.dist(self.pos, self.target.pos) < self.TOY_INTERACTION_RANGE
@@ -1,27 +1,105 @@
+"""
+Actions of the infants' state machines.
+
+Actions are immutable and shared between infants: the module constants and
+the instances returned by EvaluateToy.of / EvaluateThrow.of are allocated
+once, so stepping an infant allocates no actions. Every action class has an
+integer `code`, its position in ACTIONS, which Infant._perform_action uses to
+look up the handler method named by `handler`.
+"""
+
+
 class InfantAction:
+    __slots__ = ("metadata",)
+
+    code: int = None
+    handler: str = None
+
     def __init__(self, metadata=None):
-        self.metadata = metadata
+        object.__setattr__(self, "metadata", metadata)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.metadata,)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(metadata={self.metadata!r})"
 
 
 class Crawl(InfantAction):
-    pass
+    __slots__ = ()
+    handler = "_step_crawl"
 
 
 class LookForToy(InfantAction):
-    pass
+    __slots__ = ()
+    handler = "_step_look_for_toy"
 
 
 class InteractWithToy(InfantAction):
-    pass
+    __slots__ = ()
+    handler = "_step_interact_with_toy"
 
 
-class EvaluateToy(InfantAction):
-    def __init__(self, duration=0, metadata=None):
-        super().__init__(metadata)
-        self.duration = duration
+class TimedAction(InfantAction):
+    """
+    Action lasting several steps, `duration` counts the steps already taken
+    """
 
+    __slots__ = ("duration",)
 
-class EvaluateThrow(InfantAction):
     def __init__(self, duration=0, metadata=None):
         super().__init__(metadata)
-        self.duration = duration
+        object.__setattr__(self, "duration", duration)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._instances = {}
+
+    @classmethod
+    def of(cls, duration: int):
+        """
+        Shared instance with the given duration
+        """
+        action = cls._instances.get(duration)
+        if action is None:
+            action = cls._instances[duration] = cls(duration)
+        return action
+
+    def next(self):
+        """
+        The same action one step later
+        """
+        return self.of(self.duration + 1)
+
+    def __reduce__(self):
+        return type(self), (self.duration, self.metadata)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(duration={self.duration})"
+
+
+class EvaluateToy(TimedAction):
+    __slots__ = ()
+    handler = "_step_evaluate_toy"
+
+
+class EvaluateThrow(TimedAction):
+    __slots__ = ()
+    handler = "_step_evaluate_throw"
+
+
+ACTIONS = (LookForToy, EvaluateToy, Crawl, InteractWithToy, EvaluateThrow)
+for code, action_class in enumerate(ACTIONS):
+    action_class.code = code
+
+LOOK_FOR_TOY = LookForToy()
+CRAWL = Crawl()
+CRAWL_PERSISTENCE_BOOST = Crawl(metadata="persistence_boost")
+CRAWL_NO_BOOST = Crawl(metadata="no_boost")
+INTERACT_WITH_TOY = InteractWithToy()
+INTERACT_WITH_TOY_COORDINATION_BOOST = InteractWithToy(metadata="coordination_boost")
+EVALUATE_TOY = EvaluateToy.of(0)
+EVALUATE_THROW = EvaluateThrow.of(0)
@@ -3,7 +3,6 @@ import numpy as np
 
 from infant_abm.agents import infant_actions
 from infant_abm.agents.infant import Infant, Params
-from infant_abm.agents.events import ToySelected, ToyThrown
 from infant_abm.agents.position import Position
 from infant_abm.agents.toy import Toy
 
@@ -20,7 +19,7 @@ class NoVisionInfant(Infant):
 
         self.target: Toy = None
 
-        self.next_action = infant_actions.LookForToy()
+        self.next_action = infant_actions.LOOK_FOR_TOY
 
     def step(self):
         next_action = super()._perform_action(self.next_action)
@@ -32,14 +31,16 @@ class NoVisionInfant(Infant):
     def _step_interact_with_toy(self, _action):
         throw_direction = None
 
-        if self.params.coordination.e2 > np.random.rand():
-            parent_dist = math.dist(self.pos, self.model.parent.pos)
+        if self.params.coordination.e2 > self.model.rng.random():
+            parent_dist = math.dist(self.pos, self.parent.pos)
             throw_range = min(self.TOY_THROW_RANGE, parent_dist)
             throw_direction = (
-                Position.calc_norm_vector(self.pos, self.model.parent.pos) * throw_range
+                Position.calc_norm_vector(self.pos, self.parent.pos) * throw_range
             )
         else:
-            throw_direction = np.random.rand(2)
+            throw_direction = np.array(
+                [self.model.rng.random(), self.model.rng.random()]
+            )
             throw_direction = (
                 throw_direction / np.linalg.norm(throw_direction) * self.TOY_THROW_RANGE
             )
@@ -48,32 +49,27 @@ class NoVisionInfant(Infant):
         self.target.move_agent(new_pos)
         self.rotate_towards(new_pos)
 
-        self.model.parent.handle_event(ToyThrown(self.target))
+        self.parent.handle_event(self.target.thrown_event)
 
         self.target.interact()
         self.target = None
 
-        return infant_actions.LookForToy()
+        return infant_actions.LOOK_FOR_TOY
 
     def _step_look_for_toy(self, _action):
-        toys = self.model.get_toys()
-
-        probabilities = np.array([self._toy_probability(toy) for toy in toys])
-        probabilities /= probabilities.sum()
-
-        [target] = np.random.choice(toys, size=1, p=probabilities)
+        target = self._choose_toy()
         self.velocity = Position.calc_norm_vector(self.pos, target.pos)
         self.target = target
-        self.model.parent.handle_event(ToySelected(self.target))
-        return infant_actions.Crawl()
+        self.parent.handle_event(self.target.selected_event)
+        return infant_actions.CRAWL
 
     def _step_crawl(self, _action):
         if self._target_in_range():
-            return infant_actions.InteractWithToy()
+            return infant_actions.INTERACT_WITH_TOY
 
         if self._gets_distracted():
             self.target = None
-            return infant_actions.LookForToy()
+            return infant_actions.LOOK_FOR_TOY
 
         self._move()
-        return infant_actions.Crawl()
+        return infant_actions.CRAWL
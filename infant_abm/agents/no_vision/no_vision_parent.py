@@ -25,9 +25,9 @@ class NoVisionParent(Parent):
         self.next_action = next_action
 
     def _step_pass_toy(self):
-        throw_direction = Position.calc_norm_vector(
-            self.pos, self.model.infant.pos
-        ) * min(self.TOY_THROW_RANGE, math.dist(self.pos, self.model.infant.pos))
+        throw_direction = Position.calc_norm_vector(self.pos, self.infant.pos) * min(
+            self.TOY_THROW_RANGE, math.dist(self.pos, self.infant.pos)
+        )
 
         new_pos = self.pos + throw_direction
         self.target.move_agent(new_pos)
@@ -43,13 +43,13 @@ class NoVisionParent(Parent):
             self.next_action = Action.PASS_TOY
             return
 
-        self.velocity = Position.calc_norm_vector(self.pos, self.target.pos)
-        new_pos = self.pos + self.velocity * self.SPEED
-        self.move_agent(new_pos)
+        dx, dy = Position.norm_components(self.pos, self.target.pos)
+        x, y = self.pos.tolist()
+        self.move_to(x + dx * self.SPEED, y + dy * self.SPEED)
 
     def _handle_event_toy_thrown(self, event: ToyThrown):
-        if self.responsiveness > np.random.rand():
-            if self.relevant_response_probability > np.random.rand():
+        if self.responsiveness > self.model.rng.random():
+            if self.relevant_response_probability > self.model.rng.random():
                 self._respond_relevant(event.toy)
             else:
                 self._respond_irrelevant()
@@ -64,5 +64,5 @@ class NoVisionParent(Parent):
         probabilities = np.array([1 for _ in toys])
         probabilities = probabilities / probabilities.sum()
 
-        [target] = np.random.choice(toys, size=1, p=probabilities)
+        target = self.model.rng.choice(toys, p=probabilities)
         self.target = target
@@ -1,4 +1,6 @@
 class Parameter:
+    __slots__ = ("e1_base", "e2_base", "e1", "e2")
+
     def __init__(self, exploitation):
         assert exploitation >= 0.0 and exploitation <= 1.0
 
@@ -20,4 +22,6 @@ class Parameter:
 
     def __eq__(self, other) -> bool:
         assert isinstance(other, Parameter)
-        return self.__dict__ == other.__dict__
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
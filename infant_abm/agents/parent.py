@@ -1,18 +1,26 @@
-from enum import Enum
+from enum import IntEnum
 
 from abc import ABC, abstractmethod
 
 from infant_abm.agents.agent import Agent
 from infant_abm.agents.position import Position
-from infant_abm.agents.events import ToySelected, ToyThrown, ThrowEvaluation
+from infant_abm.agents.events import EVENTS
 
 
-class Action(Enum):
+class Action(IntEnum):
     WAIT = 1
     FETCH_TOY = 2
     PASS_TOY = 3
 
 
+# Handler method of every action
+ACTION_HANDLERS = {
+    Action.WAIT: "_step_wait",
+    Action.FETCH_TOY: "_step_fetch_toy",
+    Action.PASS_TOY: "_step_pass_toy",
+}
+
+
 class Parent(Agent, ABC):
     responsiveness = 0.5
     relevant_response_probability = 0.5
@@ -24,6 +32,18 @@ class Parent(Agent, ABC):
     def __init__(self, unique_id, model, pos):
         super().__init__(unique_id, model, pos)
 
+        # Partner of the dyad, set by Infant.pair()
+        self.infant = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Handler functions of actions and event codes, looked up once per class
+        cls._action_handlers = {
+            action: getattr(cls, name, None) for action, name in ACTION_HANDLERS.items()
+        }
+        cls._event_handlers = tuple(getattr(cls, event.handler) for event in EVENTS)
+
     @abstractmethod
     def step(self):
         pass
@@ -32,25 +52,16 @@ class Parent(Agent, ABC):
         """
         Respond to infant's interaction with a toy
         """
-        match event:
-            case ToyThrown():
-                self._handle_event_toy_thrown(event)
-            case ToySelected():
-                self._handle_event_toy_selected(event)
-            case ThrowEvaluation():
-                self._handle_event_throw_evaluation(event)
+        self._event_handlers[event.code](self, event)
 
     def _perform_action(self, action):
-        match action:
-            case Action.WAIT:
-                return Action.WAIT
-            case Action.FETCH_TOY:
-                return self._step_fetch_toy()
-            case Action.PASS_TOY:
-                return self._step_pass_toy()
+        return self._action_handlers[action](self)
+
+    def _step_wait(self):
+        return Action.WAIT
 
     def _update_infant_visible(self):
-        infant_angle = Position.angle(self.pos, self.model.infant.pos)
+        infant_angle = Position.angle(self.pos, self.infant.pos)
         self.infant_visible = abs(infant_angle - self.direction) < self.sight_angle
 
     def _handle_event_toy_thrown(self, event):
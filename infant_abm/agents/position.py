@@ -1,39 +1,106 @@
-import random
+import math
+
 import numpy as np
 
+TWO_PI = 2 * math.pi
+
 
 class Position:
+    """
+    Geometry of 2D positions.
+
+    Functions of single positions work on scalars, without building 2-element
+    temporaries, and give the same results as their NumPy formulation. The
+    batched variants operate on arrays of shape (..., 2).
+    """
+
     x_max = None
     y_max = None
 
     @staticmethod
-    def random():
-        x = random.random() * Position.x_max
-        y = random.random() * Position.y_max
+    def random(rng):
+        x = rng.random() * Position.x_max
+        y = rng.random() * Position.y_max
 
         return np.array([x, y])
 
     @staticmethod
     def calc_norm_vector(first, second) -> np.ndarray:
-        vec = second - first
-        norm = np.linalg.norm(vec)
+        return np.array(Position.norm_components(first, second))
+
+    @staticmethod
+    def norm_components(first, second) -> tuple[float, float]:
+        """
+        Components of the unit vector from the first point to the second one,
+        (1, 1) for equal points
+        """
+        x1, y1 = first.tolist()
+        x2, y2 = second.tolist()
+        dx = x2 - x1
+        dy = y2 - y1
+
+        norm = math.sqrt(dx * dx + dy * dy)
         if norm == 0:
-            return np.ones(2)
+            return 1.0, 1.0
         else:
-            return vec / norm
+            return dx / norm, dy / norm
 
     @staticmethod
     def correct_out_of_bounds(pos):
-        for idx, value in enumerate([Position.x_max, Position.y_max]):
-            pos[idx] = max(0, pos[idx])
-            pos[idx] = min(value - 1e-10, pos[idx])
+        pos[0], pos[1] = Position.within_bounds(*pos.tolist())
 
         return pos
 
+    @staticmethod
+    def within_bounds(x: float, y: float) -> tuple[float, float]:
+        return (
+            min(Position.x_max - 1e-10, max(0, x)),
+            min(Position.y_max - 1e-10, max(0, y)),
+        )
+
     @staticmethod
     def angle(first, second) -> float:
         """
         Calculate compass angle from the first point to the second one
         """
-        vec = Position.calc_norm_vector(first, second)
-        return np.arctan2(*vec) % (2 * np.pi)
+        x1, y1 = first.tolist()
+        x2, y2 = second.tolist()
+        return Position.heading(x2 - x1, y2 - y1)
+
+    @staticmethod
+    def heading(dx: float, dy: float) -> float:
+        """
+        Compass angle of the vector (dx, dy)
+        """
+        # Normalized first: np.arctan2 of the raw components differs in the
+        # last bit for about a tenth of the inputs
+        norm = math.sqrt(dx * dx + dy * dy)
+        if norm == 0:
+            x, y = 1.0, 1.0
+        else:
+            x, y = dx / norm, dy / norm
+
+        # np.arctan2 rather than math.atan2, which differs in the last bit
+        return float(np.arctan2(x, y)) % TWO_PI
+
+    @staticmethod
+    def calc_norm_vectors(first, second) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Row-wise calc_norm_vector, returns unit vectors and distances
+        """
+        vec = second - first
+        norm = np.sqrt(np.sum(vec * vec, axis=-1))
+
+        zero = norm == 0
+        safe_norm = np.where(zero, 1.0, norm)
+        vec = np.where(zero[..., None], 1.0, vec / safe_norm[..., None])
+
+        return vec, norm
+
+    @staticmethod
+    def angles(first, second) -> np.ndarray:
+        """
+        Row-wise angle
+        """
+        vec, _ = Position.calc_norm_vectors(first, second)
+        return np.arctan2(vec[..., 0], vec[..., 1]) % TWO_PI
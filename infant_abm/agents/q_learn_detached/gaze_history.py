@@ -0,0 +1,134 @@
+class GazeHistory:
+    """
+    Gaze history of an infant-parent dyad, kept as two integer-coded ring buffers.
+
+    Gaze targets are coded as [None, partner, toy_0, toy_1, ...], which is also
+    the order of the infant's Q-learning actions. The bits of the Q-learning
+    state are maintained on every push, so reading the state is O(1):
+
+    * infant_looked_at_toy - any toy in the infant's history,
+    * parent_looked_at_toy - the parent looked at a toy within FOLLOW_WINDOW
+      steps after the infant looked at it,
+    * mutual_gaze - the last gazes of both agents are directed at each other,
+      and the last parent follow (if any) was at least MUTUAL_GAZE_MIN_INDEX
+      positions into the history.
+
+    Gazes are identified by their push time t, stored at slot t % size. The
+    state is defined for aligned histories - both agents pushed the same
+    number of gazes - which is the case whenever QLearningAgent reads it.
+    """
+
+    NONE = 0
+    PARTNER = 1
+    TOY_OFFSET = 2
+
+    FOLLOW_WINDOW = 5
+    MUTUAL_GAZE_MIN_INDEX = 5
+
+    def __init__(self, infant_targets: list, parent_targets: list, size: int = 11):
+        assert infant_targets[self.NONE] is None and parent_targets[self.NONE] is None
+
+        self.size = size
+        self.infant_targets = infant_targets
+        self.parent_targets = parent_targets
+
+        self._infant_codes = {obj: code for code, obj in enumerate(infant_targets)}
+        self._parent_codes = {obj: code for code, obj in enumerate(parent_targets)}
+
+        self.load([None] * size, [None] * size)
+
+    def load(self, infant_directions: list, parent_directions: list):
+        """
+        Replace both histories with lists of gaze targets, oldest first
+        """
+        assert len(infant_directions) == len(parent_directions) == self.size
+
+        self._infant = [self.NONE] * self.size
+        self._parent = [self.NONE] * self.size
+        self._n_infant = 0
+        self._n_parent = 0
+
+        self._infant_toys = 0
+        # Push time of the first parent gaze following each infant gaze, or -1
+        self._first_follow = [-1] * self.size
+        # Push time of the most recent infant gaze followed by the parent, or -1
+        self._last_followed = -1
+
+        for infant_target, parent_target in zip(infant_directions, parent_directions):
+            self.push_infant(infant_target)
+            self.push_parent(parent_target)
+
+    def push_infant(self, target):
+        self.push_infant_code(self._infant_codes[target])
+
+    def push_parent(self, target):
+        self.push_parent_code(self._parent_codes[target])
+
+    def push_infant_code(self, code: int):
+        size = self.size
+        t = self._n_infant
+        slot = t % size
+
+        if self._infant[slot] >= self.TOY_OFFSET:
+            self._infant_toys -= 1
+
+        self._infant[slot] = code
+        self._first_follow[slot] = -1
+        self._n_infant += 1
+
+        if code < self.TOY_OFFSET:
+            return
+
+        self._infant_toys += 1
+
+        # Parent gazes pushed ahead of the infant's
+        last = min(t + self.FOLLOW_WINDOW, self._n_parent - 1)
+        for t_parent in range(t + 1, last + 1):
+            if self._parent[t_parent % size] == code:
+                self._first_follow[slot] = t_parent
+                self._last_followed = t
+                return
+
+    def push_parent_code(self, code: int):
+        size = self.size
+        t = self._n_parent
+
+        self._parent[t % size] = code
+        self._n_parent += 1
+
+        if code < self.TOY_OFFSET:
+            return
+
+        first = max(t - self.FOLLOW_WINDOW, self._n_infant - size, 0)
+        last = min(t - 1, self._n_infant - 1)
+        for t_infant in range(first, last + 1):
+            slot = t_infant % size
+            if self._infant[slot] == code and self._first_follow[slot] == -1:
+                self._first_follow[slot] = t
+                self._last_followed = max(self._last_followed, t_infant)
+
+    def get_state(self) -> int:
+        size = self.size
+
+        infant_looked = self._infant_toys > 0
+        parent_looked = self._last_followed >= self._n_infant - size
+
+        mutual_gaze = (
+            self._infant[(self._n_infant - 1) % size] == self.PARTNER
+            and self._parent[(self._n_parent - 1) % size] == self.PARTNER
+        )
+        if mutual_gaze and parent_looked:
+            t_follow = self._first_follow[self._last_followed % size]
+            index = t_follow - (self._n_parent - size)
+            mutual_gaze = index >= self.MUTUAL_GAZE_MIN_INDEX
+
+        return 4 * infant_looked + 2 * parent_looked + mutual_gaze
+
+    def infant_directions(self) -> list:
+        return self._decode(self._infant, self._n_infant, self.infant_targets)
+
+    def parent_directions(self) -> list:
+        return self._decode(self._parent, self._n_parent, self.parent_targets)
+
+    def _decode(self, codes, n, targets):
+        return [targets[codes[t % self.size]] for t in range(n - self.size, n)]
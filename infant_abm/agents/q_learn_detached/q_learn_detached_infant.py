@@ -2,10 +2,10 @@ import math
 import numpy as np
 
 from infant_abm.agents.infant import Infant, Params
-from infant_abm.agents.events import ToyThrown
 from infant_abm.agents.position import Position
 from infant_abm.agents.infant import infant_actions
 
+from infant_abm.agents.q_learn_detached.gaze_history import GazeHistory
 from infant_abm.agents.q_learn_detached.q_learning_agent import QLearningAgent
 
 
@@ -25,27 +25,39 @@ class QLearnDetachedInfant(Infant):
     ):
         super().__init__(unique_id, model, pos, params)
 
-        self.gaze_directions = [None] * self.GAZE_HISTORY_SIZE
         self.current_persistence_boost_duration = 0
         self.q_learning_state = None
+        self.q_action = None
         self.last_reward = None
 
+        # The gaze history and Q-learning agent refer to the parent, so they
+        # are created by pair()
+        self.learning_params = dict(alpha=alpha, gamma=gamma, epsilon=epsilon)
+        self.gaze_history = None
+        self.q_learning_agent = None
+
+        self.next_action = infant_actions.LOOK_FOR_TOY
+
+    def pair(self, parent):
+        super().pair(parent)
+
+        self.gaze_history = GazeHistory(
+            infant_targets=self.get_q_actions(),
+            parent_targets=[None, self] + self.model.get_toys(),
+            size=self.GAZE_HISTORY_SIZE,
+        )
+
         self.q_learning_agent = QLearningAgent(
-            model=model,
+            model=self.model,
             actions=self.get_q_actions(),
-            alpha=alpha,
-            gamma=gamma,
-            epsilon=epsilon,
+            gaze_history=self.gaze_history,
+            **self.learning_params,
         )
 
-        self.next_action = infant_actions.LookForToy()
-
     def step(self):
         self.q_learning_state = self.q_learning_agent.get_state()
-        new_q_action = self.q_learning_agent.choose_action()
-
-        self.gaze_directions.append(new_q_action)
-        self.gaze_directions.pop(0)
+        self.q_action = self.q_learning_agent.choose_action()
+        self.gaze_history.push_infant(self.q_action)
 
         next_action = super()._perform_action(self.next_action)
 
@@ -58,41 +70,44 @@ class QLearnDetachedInfant(Infant):
         self.last_reward = self.q_learning_agent.reward(next_state)
         self.q_learning_agent.update_q_table(
             self.q_learning_state,
-            self.gaze_directions[-1],
+            self.q_action,
             self.last_reward,
             next_state,
         )
 
+    @property
+    def gaze_directions(self):
+        return self.gaze_history.infant_directions()
+
+    @gaze_directions.setter
+    def gaze_directions(self, directions):
+        self.gaze_history.load(directions, self.gaze_history.parent_directions())
+
     def get_q_actions(self):
-        return [None, self.model.parent] + self.model.get_toys()
+        return [None, self.parent] + self.model.get_toys()
 
     def _step_look_for_toy(self, _action):
         self.current_persistence_boost_duration = 0
         self.params.persistence.reset()
 
-        toys = self.model.get_toys()
-
-        probabilities = np.array([self._toy_probability(toy) for toy in toys])
-        probabilities /= probabilities.sum()
-
-        [target] = np.random.choice(toys, size=1, p=probabilities)
+        target = self._choose_toy()
         self.velocity = Position.calc_norm_vector(self.pos, target.pos)
         self.target = target
 
-        return infant_actions.Crawl()
+        return infant_actions.CRAWL
 
     def _step_interact_with_toy(self, _action):
         self.params.coordination.reset()
         throw_direction = None
 
-        if self.params.coordination.e2 > np.random.rand():
-            parent_dist = math.dist(self.pos, self.model.parent.pos)
+        if self.params.coordination.e2 > self.model.rng.random():
+            parent_dist = math.dist(self.pos, self.parent.pos)
             throw_range = min(self.TOY_THROW_RANGE, parent_dist)
             throw_direction = (
-                Position.calc_norm_vector(self.pos, self.model.parent.pos) * throw_range
+                Position.calc_norm_vector(self.pos, self.parent.pos) * throw_range
             )
         else:
-            throw_angle = np.random.uniform(0, 2 * np.pi)
+            throw_angle = self.model.rng.uniform(0, 2 * np.pi)
             throw_direction = np.array([np.cos(throw_angle), np.sin(throw_angle)])
             throw_direction *= self.TOY_THROW_RANGE
 
@@ -100,19 +115,19 @@ class QLearnDetachedInfant(Infant):
         self.target.move_agent(new_pos)
 
         self.target.interact()
-        self.model.parent.handle_event(ToyThrown(self.target))
+        self.parent.handle_event(self.target.thrown_event)
 
         self.target = None
 
-        return infant_actions.LookForToy()
+        return infant_actions.LOOK_FOR_TOY
 
     def _step_crawl(self, _action):
         if self._target_in_range():
-            return infant_actions.InteractWithToy()
+            return infant_actions.INTERACT_WITH_TOY
 
         if self._gets_distracted():
             self.target = None
-            return infant_actions.LookForToy()
+            return infant_actions.LOOK_FOR_TOY
 
         self._move()
 
@@ -120,4 +135,4 @@ class QLearnDetachedInfant(Infant):
         if self.current_persistence_boost_duration == self.PERSISTENCE_BOOST_DURATION:
             self.params.persistence.reset()
 
-        return infant_actions.Crawl()
+        return infant_actions.CRAWL
@@ -1,5 +1,4 @@
 import math
-import numpy as np
 
 from infant_abm.agents.parent import Parent, Action
 from infant_abm.agents.events import ToyThrown, ToySelected, ThrowEvaluation
@@ -8,23 +7,17 @@ from infant_abm.agents.position import Position
 
 
 class QLearnDetachedParent(Parent):
-    GAZE_HISTORY_SIZE = 11
-
     ALLOWED_ACTIONS = [Action.WAIT, Action.PASS_TOY]
 
     def __init__(self, unique_id, model, pos):
         super().__init__(unique_id, model, pos)
 
         self.target: Toy = None
-        self.gaze_directions = [None] * self.GAZE_HISTORY_SIZE
-
-        self.target = None
 
         self.next_action = Action.WAIT
 
     def step(self):
-        self.gaze_directions.append(self._random_gaze_direction())
-        self.gaze_directions.pop(0)
+        self.infant.gaze_history.push_parent(self._random_gaze_direction())
 
         next_action = super()._perform_action(self.next_action)
 
@@ -32,10 +25,19 @@ class QLearnDetachedParent(Parent):
 
         self.next_action = next_action
 
+    @property
+    def gaze_directions(self):
+        return self.infant.gaze_history.parent_directions()
+
+    @gaze_directions.setter
+    def gaze_directions(self, directions):
+        gaze_history = self.infant.gaze_history
+        gaze_history.load(gaze_history.infant_directions(), directions)
+
     def _step_pass_toy(self):
-        throw_direction = Position.calc_norm_vector(
-            self.pos, self.model.infant.pos
-        ) * min(self.TOY_THROW_RANGE, math.dist(self.pos, self.model.infant.pos))
+        throw_direction = Position.calc_norm_vector(self.pos, self.infant.pos) * min(
+            self.TOY_THROW_RANGE, math.dist(self.pos, self.infant.pos)
+        )
 
         new_pos = self.pos + throw_direction
         self.target.move_agent(new_pos)
@@ -45,8 +47,8 @@ class QLearnDetachedParent(Parent):
         return Action.WAIT
 
     def _handle_event_toy_thrown(self, event: ToyThrown):
-        if self.responsiveness > np.random.rand():
-            if self.relevant_response_probability > np.random.rand():
+        if self.responsiveness > self.model.rng.random():
+            if self.relevant_response_probability > self.model.rng.random():
                 self._find_toy_nearby(event.toy)
 
     def _handle_event_throw_evaluation(self, _event: ThrowEvaluation):
@@ -63,24 +65,27 @@ class QLearnDetachedParent(Parent):
         elif toy in toys:
             target = toy
         else:
-            [target] = np.random.choice(toys, size=1)
+            target = self.model.rng.choice(toys)
         self.target = target
         self.next_action = Action.PASS_TOY
 
     def _random_gaze_direction(self):
-        target = self.model.infant.target
+        target = self.infant.target
 
-        match np.random.choice(np.arange(3)):
+        match self.model.rng.integers(3):
             case 0:
                 return None
             case 1:
-                return self.model.infant
+                return self.infant
             case 2:
-                if target is not None and 0.5 > np.random.rand():
+                if target is not None and 0.5 > self.model.rng.random():
                     return target
-                else:
-                    toys = list(self.model.get_toys())
-                    if target in toys:
-                        toys.remove(target)
 
-                    return np.random.choice(toys)
+                # Any toy other than the infant's target, without copying the
+                # toy list
+                toys = self.model.get_toys()
+                if target is None:
+                    return toys[self.model.rng.integers(len(toys))]
+
+                index = self.model.rng.integers(len(toys) - 1)
+                return toys[index if index < target.index else index + 1]
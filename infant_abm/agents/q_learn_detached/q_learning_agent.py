@@ -1,6 +1,6 @@
 import numpy as np
 
-from infant_abm.agents.toy import Toy
+from infant_abm.agents.q_learn_detached.gaze_history import GazeHistory
 
 STATE_SPACE = np.array([2, 2, 2])
 STATE_SPACE_SIZE = np.multiply.reduce(STATE_SPACE)
@@ -8,9 +8,18 @@ GOAL_STATE = np.array([1, 1, 1])
 
 
 class QLearningAgent:
-    def __init__(self, model, actions, alpha=0.1, gamma=0.9, epsilon=0.1):
+    def __init__(
+        self,
+        model,
+        actions,
+        gaze_history: GazeHistory,
+        alpha=0.1,
+        gamma=0.9,
+        epsilon=0.1,
+    ):
         self.model = model
-        self.q_table = np.random.rand(STATE_SPACE_SIZE, len(actions))
+        self.gaze_history = gaze_history
+        self.q_table = model.rng.generator.random((STATE_SPACE_SIZE, len(actions)))
 
         self.alpha = alpha
         self.gamma = gamma
@@ -21,8 +30,9 @@ class QLearningAgent:
     def choose_action(self):
         state = self.get_state()
 
-        if np.random.rand() < self.epsilon:
-            return np.random.choice(list(self.actions.keys()))  # Explore
+        if self.model.rng.random() < self.epsilon:
+            explore = self.model.rng.integers(len(self.number_actions))
+            return self.number_actions[explore]  # Explore
         else:
             return self.number_actions[np.argmax(self.q_table[state])]  # Exploit
 
@@ -36,42 +46,10 @@ class QLearningAgent:
 
     def get_state(self):
         # [infant_looked_at_toy, parent_looked_at_toy, mutual_gaze]
-
-        index, parent_looked = self._parent_looked_at_toy_after_infant()
-        print(index)
-        mutual_gaze = self._mutual_gaze() and (index is None or index >= 5)
-
-        raw_state = np.array(
-            [
-                int(self._infant_looked_at_toy()),
-                int(parent_looked),
-                int(mutual_gaze),
-            ]
-        )
-
-        multiplier = np.array([4, 2, 1])
-        return np.sum(raw_state * multiplier)
+        return self.gaze_history.get_state()
 
     def reward(self, state):
         if np.all(state == GOAL_STATE):
             return 1
         else:
             return 0
-
-    def _infant_looked_at_toy(self):
-        return any([isinstance(obj, Toy) for obj in self.model.infant.gaze_directions])
-
-    def _parent_looked_at_toy_after_infant(self):
-        for i, obj in reversed(list(enumerate(self.model.infant.gaze_directions))):
-            if isinstance(obj, Toy):
-                for j in range(i + 1, min(i + 6, 11)):
-                    if self.model.parent.gaze_directions[j] == obj:
-                        return j, True
-
-        return None, False
-
-    def _mutual_gaze(self):
-        return (
-            self.model.infant.gaze_directions[-1] == self.model.parent
-            and self.model.parent.gaze_directions[-1] == self.model.infant
-        )
@@ -1,5 +1,4 @@
 import math
-import numpy as np
 
 from infant_abm.agents.parent import Parent, Action
 from infant_abm.agents.events import ToyThrown, ToySelected, ThrowEvaluation
@@ -28,9 +27,9 @@ class SpatialVisionParent(Parent):
         self.next_action = next_action
 
     def _step_pass_toy(self):
-        throw_direction = Position.calc_norm_vector(
-            self.pos, self.model.infant.pos
-        ) * min(self.TOY_THROW_RANGE, math.dist(self.pos, self.model.infant.pos))
+        throw_direction = Position.calc_norm_vector(self.pos, self.infant.pos) * min(
+            self.TOY_THROW_RANGE, math.dist(self.pos, self.infant.pos)
+        )
 
         new_pos = self.pos + throw_direction
         self.target.move_agent(new_pos)
@@ -40,19 +39,19 @@ class SpatialVisionParent(Parent):
         return Action.WAIT
 
     def _handle_event_toy_thrown(self, event: ToyThrown):
-        if self.responsiveness > np.random.rand():
-            self.rotate_towards(self.model.infant.pos)
+        if self.responsiveness > self.model.rng.random():
+            self.rotate_towards(self.infant.pos)
 
-            if self.relevant_response_probability > np.random.rand():
+            if self.relevant_response_probability > self.model.rng.random():
                 self._find_toy_nearby(event.toy)
 
     def _handle_event_throw_evaluation(self, event: ThrowEvaluation):
-        if self.relevant_response_probability > np.random.rand():
-            self.rotate_towards(self.model.infant.pos)
+        if self.relevant_response_probability > self.model.rng.random():
+            self.rotate_towards(self.infant.pos)
 
     def _handle_event_toy_selected(self, event: ToySelected):
-        if self.relevant_response_probability > np.random.rand():
-            self.rotate_towards(self.model.infant.pos)
+        if self.relevant_response_probability > self.model.rng.random():
+            self.rotate_towards(self.infant.pos)
 
     def _find_toy_nearby(self, toy: Toy):
         toys = self.model.get_toys(self.pos, self.TOY_INTERACTION_RANGE)
@@ -62,6 +61,6 @@ class SpatialVisionParent(Parent):
         elif toy in toys:
             target = toy
         else:
-            [target] = np.random.choice(toys, size=1)
+            target = self.model.rng.choice(toys)
         self.target = target
         self.next_action = Action.PASS_TOY
@@ -1,28 +1,44 @@
 from infant_abm.agents.agent import Agent
+from infant_abm.agents.events import ToySelected, ToyThrown
 
 
 class Toy(Agent):
+    INITIAL_COLOR = "#00FF00"
+
     def __init__(self, unique_id, model, pos, color=None):
         super().__init__(unique_id, model, pos)
 
         self.model = model
-        self.color = "#00FF00"
         self.times_interacted_with = 0
 
+        # Position in the model's toy index
+        self.index = None
+
+        # Events about this toy, preallocated for the infants to send
+        self.thrown_event = ToyThrown(self)
+        self.selected_event = ToySelected(self)
+
     def step(self):
         pass
 
+    def move_to(self, x, y):
+        super().move_to(x, y)
+        self.model.toy_index.move(self.index, self.pos)
+
     def interact(self):
         self.times_interacted_with += 1
-
-        self.update_color()
-
-    def update_color(self, max_interactions=None):
-        if max_interactions is None:
-            max_interactions = max([t.times_interacted_with for t in self.model.toys])
-            for toy in self.model.toys:
-                toy.update_color(max_interactions)
+        self.model.toy_choice.interact(self.index)
+
+    @property
+    def color(self):
+        """
+        Green to red with the number of interactions relative to the most
+        played with toy, computed only when rendered
+        """
+        max_interactions = self.model.toy_interactions.max()
+        if max_interactions == 0:
+            return self.INITIAL_COLOR
 
         intensity = self.times_interacted_with / max_interactions
         color_red = (round(255 * intensity), round(255 * (1 - intensity)), 0)
-        self.color = "#" + ("%02x%02x%02x" % color_red)
+        return "#" + ("%02x%02x%02x" % color_red)
@@ -0,0 +1,3 @@
+from .q_learn_detached import QLearnDetachedBatch
+
+__all__ = ("QLearnDetachedBatch",)
@@ -0,0 +1,398 @@
+"""
+Batched QLearnDetached model
+=============================================================
+Lockstep implementation of many independent InfantModel replicas with
+QLearnDetachedInfant and QLearnDetachedParent agents.
+
+The state of every replica is kept as struct-of-arrays and all replicas are
+stepped together with vectorized NumPy operations. The dynamics follow the
+object-based model step by step (infant step, parent step, infant advance),
+but random numbers are drawn in a different order, so the results match the
+object-based model statistically rather than bit-for-bit.
+"""
+
+import inspect
+
+import numpy as np
+
+from infant_abm.agents import QLearnDetachedInfant, QLearnDetachedParent
+from infant_abm.agents.infant import Params as InfantParams
+from infant_abm.agents.position import Position
+from infant_abm.agents.q_learn_detached.gaze_history import GazeHistory
+from infant_abm.agents.q_learn_detached.q_learning_agent import (
+    GOAL_STATE,
+    STATE_SPACE_SIZE,
+)
+from infant_abm.config import Config
+
+# Gaze targets are coded the same way as in GazeHistory:
+# [None, partner, toy_0, toy_1, ...]
+GAZE_NONE = GazeHistory.NONE
+GAZE_PARTNER = GazeHistory.PARTNER
+GAZE_TOY_OFFSET = GazeHistory.TOY_OFFSET
+
+# Infant actions
+LOOK_FOR_TOY = 0
+CRAWL = 1
+INTERACT_WITH_TOY = 2
+
+# Parent actions
+WAIT = 0
+PASS_TOY = 1
+
+NO_TARGET = -1
+
+
+def _q_learn_defaults():
+    signature = inspect.signature(QLearnDetachedInfant.__init__)
+    return {
+        name: signature.parameters[name].default
+        for name in ("alpha", "gamma", "epsilon")
+    }
+
+
+class QLearnDetachedBatch:
+    """
+    R replicas of InfantModel(QLearnDetachedInfant, QLearnDetachedParent)
+    stepped in lockstep.
+
+    Every replica can have its own infant parameters and Q-learning
+    parameters, given in the same format as Simulation parameter sets. The
+    environment part of the config (toy count, layout and arena size) has
+    to be the same for all replicas.
+    QLearnDetached agents never boost their parameters, so persistence and
+    coordination are constant per replica.
+    """
+
+    GAZE_HISTORY_SIZE = QLearnDetachedInfant.GAZE_HISTORY_SIZE
+    PARENT_FOLLOW_WINDOW = GazeHistory.FOLLOW_WINDOW
+
+    def __init__(self, param_sets: list[dict], rng=None):
+        self.rng = np.random.default_rng(rng)
+        self.n_replicas = len(param_sets)
+        self.steps = 0
+
+        self.config = _environment_config(param_sets)
+        self.n_toys = self.config.n_toys
+        self.n_actions = GAZE_TOY_OFFSET + self.n_toys
+
+        self._rows = np.arange(self.n_replicas)
+        self._bounds = np.full(2, self.config.arena_size, dtype=float)
+
+        self._init_params(param_sets)
+        self._init_state()
+
+    @staticmethod
+    def from_param_set(param_set: dict, replicas: int, rng=None):
+        return QLearnDetachedBatch([param_set] * replicas, rng=rng)
+
+    def run(self, iterations: int) -> list[dict]:
+        """
+        Run all replicas and return one result per replica, in the format
+        produced by v2Collector
+        """
+        rewards = np.empty((self.n_replicas, iterations), dtype=np.int64)
+
+        for iteration in range(iterations):
+            self.step()
+            rewards[:, iteration] = self.last_reward
+
+        return [
+            {"rewards": rewards[r], "q_table": self.q_table[r].copy()}
+            for r in range(self.n_replicas)
+        ]
+
+    def step(self):
+        # Infant.step
+        q_learning_state = self.get_states()
+        q_action = self._choose_actions(q_learning_state)
+        self._push_gaze(self.infant_gaze, q_action)
+
+        look = np.flatnonzero(self.infant_action == LOOK_FOR_TOY)
+        crawl = np.flatnonzero(self.infant_action == CRAWL)
+        interact = np.flatnonzero(self.infant_action == INTERACT_WITH_TOY)
+
+        if look.size:
+            self._step_look_for_toy(look)
+        if crawl.size:
+            self._step_crawl(crawl)
+        if interact.size:
+            self._step_interact_with_toy(interact)
+
+        # Parent.step
+        self._push_gaze(self.parent_gaze, self._random_gaze_directions())
+
+        pass_toy = np.flatnonzero(self.parent_action == PASS_TOY)
+        if pass_toy.size:
+            self._step_pass_toy(pass_toy)
+
+        # Infant.advance
+        next_state = self.get_states()
+        self.last_reward = self.rewards(next_state)
+        self._update_q_tables(q_learning_state, q_action, self.last_reward, next_state)
+
+        self.steps += 1
+
+    def get_states(self) -> np.ndarray:
+        """
+        Vectorized QLearningAgent.get_state for all replicas
+        """
+        infant_gaze = self.infant_gaze
+        parent_gaze = self.parent_gaze
+        size = self.GAZE_HISTORY_SIZE
+
+        toy_gaze = infant_gaze >= GAZE_TOY_OFFSET
+        infant_looked = toy_gaze.any(axis=1)
+
+        # followed[r, i, k - 1] - parent looked at the toy from infant_gaze[r, i]
+        # exactly k steps later
+        followed = np.zeros(
+            (self.n_replicas, size, self.PARENT_FOLLOW_WINDOW), dtype=bool
+        )
+        for k in range(1, self.PARENT_FOLLOW_WINDOW + 1):
+            followed[:, : size - k, k - 1] = toy_gaze[:, : size - k] & (
+                parent_gaze[:, k:] == infant_gaze[:, : size - k]
+            )
+
+        followed_any = followed.any(axis=2)
+        parent_looked = followed_any.any(axis=1)
+
+        # The most recent infant gaze that was followed, and the first parent
+        # gaze following it
+        last_followed = size - 1 - np.argmax(followed_any[:, ::-1], axis=1)
+        first_follow = np.argmax(followed[self._rows, last_followed], axis=1) + 1
+        index = last_followed + first_follow
+
+        mutual_gaze = (
+            (infant_gaze[:, -1] == GAZE_PARTNER)
+            & (parent_gaze[:, -1] == GAZE_PARTNER)
+            & (~parent_looked | (index >= GazeHistory.MUTUAL_GAZE_MIN_INDEX))
+        )
+
+        return 4 * infant_looked + 2 * parent_looked + mutual_gaze
+
+    @staticmethod
+    def rewards(states: np.ndarray) -> np.ndarray:
+        """
+        Vectorized QLearningAgent.reward
+        """
+        return np.all(states[:, None] == GOAL_STATE, axis=1).astype(np.int64)
+
+    # Initialization
+
+    def _init_params(self, param_sets):
+        defaults = _q_learn_defaults()
+
+        infant_params = []
+        q_learn_params = []
+        for param_set in param_sets:
+            params = param_set.get("infant_params")
+            if params is None:
+                params = InfantParams.from_array(
+                    [
+                        param_set["perception"],
+                        param_set["persistence"],
+                        param_set["coordination"],
+                    ]
+                )
+            infant_params.append(params)
+
+            kwargs = {**defaults, **param_set.get("infant_kwargs", {})}
+            q_learn_params.append([kwargs[k] for k in ("alpha", "gamma", "epsilon")])
+
+        self.perception = np.array([p.perception.e2 for p in infant_params])
+        self.persistence_e1 = np.array([p.persistence.e1 for p in infant_params])
+        self.persistence_e2 = np.array([p.persistence.e2 for p in infant_params])
+        self.coordination = np.array([p.coordination.e2 for p in infant_params])
+
+        self.alpha, self.gamma, self.epsilon = np.array(q_learn_params, dtype=float).T
+
+    def _init_state(self):
+        R = self.n_replicas
+        rng = self.rng
+
+        self.toy_pos = np.stack([self.config.toy_positions(rng) for _ in range(R)])
+        self.toy_interactions = np.zeros((R, self.n_toys), dtype=np.int64)
+
+        self.parent_pos = rng.uniform(0.25, 0.75, size=(R, 2)) * self._bounds
+        self.parent_action = np.full(R, WAIT, dtype=np.int8)
+        self.parent_target = np.full(R, NO_TARGET, dtype=np.int64)
+        self.parent_gaze = np.full((R, self.GAZE_HISTORY_SIZE), GAZE_NONE, np.int8)
+
+        self.infant_pos = np.tile(0.5 * self._bounds, (R, 1))
+        self.infant_action = np.full(R, LOOK_FOR_TOY, dtype=np.int8)
+        self.infant_target = np.full(R, NO_TARGET, dtype=np.int64)
+        self.infant_gaze = np.full((R, self.GAZE_HISTORY_SIZE), GAZE_NONE, np.int8)
+
+        self.q_table = rng.random((R, STATE_SPACE_SIZE, self.n_actions))
+        self.last_reward = np.zeros(R, dtype=np.int64)
+
+    # Q-learning
+
+    def _choose_actions(self, states):
+        explore = self.rng.random(self.n_replicas) < self.epsilon
+        random_actions = self.rng.integers(self.n_actions, size=self.n_replicas)
+        greedy_actions = np.argmax(self.q_table[self._rows, states], axis=1)
+
+        return np.where(explore, random_actions, greedy_actions)
+
+    def _update_q_tables(self, states, actions, rewards, next_states):
+        rows = self._rows
+        best_next_action = np.max(self.q_table[rows, next_states], axis=1)
+        current = self.q_table[rows, states, actions]
+
+        self.q_table[rows, states, actions] = current + self.alpha * (
+            rewards + self.gamma * best_next_action - current
+        )
+
+    def _push_gaze(self, gaze, directions):
+        gaze[:, :-1] = gaze[:, 1:]
+        gaze[:, -1] = directions
+
+    # Infant actions
+
+    def _step_look_for_toy(self, idx):
+        exponent = 2 * self.perception[idx, None] - 1
+        weights = np.power(self.toy_interactions[idx] + 1e-5, exponent)
+
+        cdf = np.cumsum(weights, axis=1)
+        cdf /= cdf[:, -1:]
+        uniform = self.rng.random(idx.size)
+
+        target = np.sum(cdf <= uniform[:, None], axis=1)
+        self.infant_target[idx] = np.minimum(target, self.n_toys - 1)
+        self.infant_action[idx] = CRAWL
+
+    def _step_crawl(self, idx):
+        pos = self.infant_pos[idx]
+        target_pos = self.toy_pos[idx, self.infant_target[idx]]
+        velocity, dist = Position.calc_norm_vectors(pos, target_pos)
+
+        in_range = dist < QLearnDetachedInfant.TOY_INTERACTION_RANGE
+        self.infant_action[idx[in_range]] = INTERACT_WITH_TOY
+
+        distracted = (self.persistence_e1[idx] == 1) | (
+            self.persistence_e2[idx] ** QLearnDetachedInfant.DISTRACTION_EXPONENT
+            < self.rng.random(idx.size)
+        )
+        distracted &= ~in_range
+        self.infant_target[idx[distracted]] = NO_TARGET
+        self.infant_action[idx[distracted]] = LOOK_FOR_TOY
+
+        moving = ~(in_range | distracted)
+        new_pos = pos[moving] + velocity[moving] * QLearnDetachedInfant.SPEED
+        self.infant_pos[idx[moving]] = self._correct_out_of_bounds(new_pos)
+
+    def _step_interact_with_toy(self, idx):
+        n = idx.size
+        infant_pos = self.infant_pos[idx]
+        toy = self.infant_target[idx]
+
+        parent_direction, parent_dist = Position.calc_norm_vectors(
+            infant_pos, self.parent_pos[idx]
+        )
+        throw_range = np.minimum(QLearnDetachedInfant.TOY_THROW_RANGE, parent_dist)
+        coordinated_throw = parent_direction * throw_range[:, None]
+
+        throw_angle = self.rng.uniform(0, 2 * np.pi, size=n)
+        random_throw = (
+            np.stack([np.cos(throw_angle), np.sin(throw_angle)], axis=1)
+            * QLearnDetachedInfant.TOY_THROW_RANGE
+        )
+
+        coordinated = self.coordination[idx] > self.rng.random(n)
+        throw_direction = np.where(
+            coordinated[:, None], coordinated_throw, random_throw
+        )
+
+        new_pos = self.toy_pos[idx, toy] + throw_direction
+        self.toy_pos[idx, toy] = self._correct_out_of_bounds(new_pos)
+        self.toy_interactions[idx, toy] += 1
+
+        self._handle_toy_thrown(idx, toy)
+
+        self.infant_target[idx] = NO_TARGET
+        self.infant_action[idx] = LOOK_FOR_TOY
+
+    # Parent actions
+
+    def _handle_toy_thrown(self, idx, toy):
+        n = idx.size
+        responds = (QLearnDetachedParent.responsiveness > self.rng.random(n)) & (
+            QLearnDetachedParent.relevant_response_probability > self.rng.random(n)
+        )
+        idx, toy = idx[responds], toy[responds]
+
+        # Same neighbourhood semantics as ContinuousSpace.get_neighbors with
+        # include_center=False
+        deltas = self.toy_pos[idx] - self.parent_pos[idx, None]
+        dists = np.sum(deltas * deltas, axis=2)
+        nearby = (dists > 0) & (dists <= QLearnDetachedParent.TOY_INTERACTION_RANGE**2)
+
+        random_keys = np.where(nearby, self.rng.random(nearby.shape), -1.0)
+        random_nearby = np.argmax(random_keys, axis=1)
+
+        thrown_nearby = nearby[np.arange(idx.size), toy]
+        found = nearby.any(axis=1)
+
+        self.parent_target[idx[found]] = np.where(thrown_nearby, toy, random_nearby)[
+            found
+        ]
+        self.parent_action[idx[found]] = PASS_TOY
+
+    def _step_pass_toy(self, idx):
+        parent_pos = self.parent_pos[idx]
+        direction, dist = Position.calc_norm_vectors(parent_pos, self.infant_pos[idx])
+        throw_direction = (
+            direction * np.minimum(QLearnDetachedParent.TOY_THROW_RANGE, dist)[:, None]
+        )
+
+        new_pos = parent_pos + throw_direction
+        self.toy_pos[idx, self.parent_target[idx]] = self._correct_out_of_bounds(
+            new_pos
+        )
+
+        self.parent_target[idx] = NO_TARGET
+        self.parent_action[idx] = WAIT
+
+    def _random_gaze_directions(self):
+        R = self.n_replicas
+        rng = self.rng
+
+        choice = rng.integers(3, size=R)
+        target = self.infant_target
+        has_target = target != NO_TARGET
+
+        follows_target = has_target & (0.5 > rng.random(R))
+
+        # Uniformly pick one of the toys other than the infant's target
+        other_toy = np.floor(rng.random(R) * (self.n_toys - has_target)).astype(int)
+        other_toy += has_target & (other_toy >= target)
+
+        toy = np.where(follows_target, target, other_toy)
+
+        return np.select(
+            [choice == 0, choice == 1],
+            [GAZE_NONE, GAZE_PARTNER],
+            GAZE_TOY_OFFSET + toy,
+        )
+
+    # Helper functions
+
+    def _correct_out_of_bounds(self, pos):
+        return np.clip(pos, 0, self._bounds - 1e-10)
+
+
+def _environment_config(param_sets) -> Config:
+    configs = {
+        (config.n_toys, config.toy_layout, config.arena_size): config
+        for config in (p.get("config", Config()) for p in param_sets)
+    }
+    if len(configs) != 1:
+        raise ValueError("All replicas need the same toy count, layout and arena")
+
+    config = next(iter(configs.values()))
+    if config.n_dyads != 1:
+        raise ValueError("Batched replicas are single-dyad models")
+
+    return config
@@ -0,0 +1,599 @@
+"""
+Benchmarks
+=============================================================
+Throughput of the models and of the simulation machinery:
+
+* steps/sec of a single model of every generation,
+* steps/sec as the number of toys grows,
+* model construction time,
+* per-step overhead of data collectors,
+* pool scaling efficiency of Simulation from 1 to N processes,
+* save_partial / load_run / ResultStore I/O time.
+
+Results are written as JSON, together with the machine and commit they were
+measured on, so runs can be compared across machines and commits:
+
+    python -m infant_abm.benchmark run --output benchmark.json
+
+The regression gate runs the steps/sec and peak memory scenarios of every
+model and compares them to the committed baseline, failing with a report on
+regressions beyond tolerance:
+
+    python -m infant_abm.benchmark check
+    python -m infant_abm.benchmark baseline  # after an intended change
+
+Throughput is compared relative to a calibration workload measured in the
+same process, which factors out most of the speed difference between
+machines, and the tolerance widens with the noise of both measurements.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import mesa
+import numpy as np
+
+from infant_abm import Config, InfantModel, InfantParams
+from infant_abm.db_utils import load_run, save_partial
+from infant_abm.result_store import ResultStore
+from infant_abm.simulation import (
+    ArrayCollector,
+    DataCollector,
+    Model_0_1_0,
+    Model_0_1_1,
+    Model_0_1_2,
+    Model_0_2_0,
+    Series,
+    Simulation,
+)
+
+MODELS = {
+    "v0.1.0": Model_0_1_0,
+    "v0.1.1": Model_0_1_1,
+    "v0.1.2": Model_0_1_2,
+    "v0.2.0": Model_0_2_0,
+}
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "benchmarks",
+    "baseline.json",
+)
+
+# Allowed relative throughput drop: a multiple of the measured relative
+# noise, within bounds
+RATE_TOLERANCE = 0.15
+MAX_RATE_TOLERANCE = 0.5
+NOISE_FACTOR = 3.0
+
+# Allowed relative growth of the traced peak, which varies by about 1%
+# between runs
+MEMORY_TOLERANCE = 0.1
+
+PARAM_SET = {
+    "infant_params": InfantParams.from_array([0.5, 0.5, 0.5]),
+    "config": Config(),
+}
+
+
+class NullCollector(DataCollector):
+    def after_step(self):
+        return True
+
+    def to_dict(self):
+        return {}
+
+
+class ListCollector(DataCollector):
+    def __init__(self, model):
+        super().__init__(model)
+        self.rewards = []
+
+    def after_step(self):
+        self.rewards.append(self.model.infant.last_reward)
+        return True
+
+    def to_dict(self):
+        return {"rewards": np.array(self.rewards)}
+
+
+class RewardCollector(ArrayCollector):
+    series = {"rewards": Series("infant.last_reward", dtype=np.uint8)}
+
+
+COLLECTORS = {
+    "list": ListCollector,
+    "array": RewardCollector,
+}
+
+
+def new_model(model, seed=0, config=None):
+    param_set = PARAM_SET if config is None else {**PARAM_SET, "config": config}
+
+    return InfantModel(
+        infant_class=model.infant_class,
+        parent_class=model.parent_class,
+        rng=seed,
+        headless=True,
+        **param_set,
+    )
+
+
+def measure_steps_per_second(model, steps, samples=5, warmup=100, seed=None):
+    """
+    Steps/sec of a single model, one sample per fresh model. Samples use
+    consecutive seeds, or all the same `seed`.
+    """
+    rates = []
+    for sample in range(samples):
+        instance = new_model(model, sample if seed is None else seed)
+        for _ in range(warmup):
+            instance.step()
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            instance.step()
+        rates.append(steps / (time.perf_counter() - start))
+
+    return _summary(rates, unit="steps/s")
+
+
+def measure_toy_scaling(steps, counts=(4, 64, 256, 1024, 4096), samples=3):
+    """
+    Steps/sec of every model with growing toy populations, placed randomly in
+    an arena growing with them, so toy density stays constant
+    """
+    results = {}
+    for name, model in MODELS.items():
+        results[name] = {}
+        for n_toys in counts:
+            config = Config(
+                n_toys=n_toys, toy_layout="random", arena_size=50 * math.sqrt(n_toys)
+            )
+
+            rates = []
+            for seed in range(samples):
+                instance = new_model(model, seed, config)
+                start = time.perf_counter()
+                for _ in range(steps):
+                    instance.step()
+                rates.append(steps / (time.perf_counter() - start))
+
+            results[name][str(n_toys)] = _summary(rates, unit="steps/s")
+
+    return results
+
+
+def measure_dyad_scaling(steps, counts=(1, 16, 64, 256), samples=3):
+    """
+    Microseconds per dyad and step of every model with growing numbers of
+    dyads. Toys and arena grow with them, so a dyad has the same four toys
+    and 100x100 area on average as in the default environment; constant
+    values mean linear scaling.
+    """
+    results = {}
+    for name, model in MODELS.items():
+        results[name] = {}
+        for n_dyads in counts:
+            config = Config(
+                n_toys=4 * n_dyads,
+                toy_layout="random",
+                arena_size=100 * math.sqrt(n_dyads),
+                n_dyads=n_dyads,
+            )
+            # Same number of agent steps for every count
+            dyad_steps = max(1, steps // n_dyads)
+
+            times = []
+            for seed in range(samples):
+                instance = new_model(model, seed, config)
+                start = time.perf_counter()
+                for _ in range(dyad_steps):
+                    instance.step()
+                elapsed = time.perf_counter() - start
+                times.append(elapsed / (dyad_steps * n_dyads) * 1e6)
+
+            results[name][str(n_dyads)] = _summary(times, unit="us/dyad-step")
+
+    return results
+
+
+def measure_peak_memory(model, steps):
+    """
+    Peak of memory allocated by Python while creating and running a model
+    """
+    tracemalloc.start()
+    try:
+        instance = new_model(model)
+        for _ in range(steps):
+            instance.step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def measure_calibration(samples=5, rounds=20000):
+    """
+    Rate of a fixed workload mixing Python arithmetic, attribute access and
+    small numpy operations, like a model step
+    """
+    rates = []
+    for _ in range(samples):
+        vector = np.array([1.0, 2.0])
+        state = {"total": 0.0}
+
+        start = time.perf_counter()
+        for i in range(rounds):
+            state["total"] += (i * 0.5) ** 0.5
+            vector = vector * 0.999 + 0.001
+        rates.append(rounds / (time.perf_counter() - start))
+
+    return _summary(rates, unit="rounds/s")
+
+
+def measure_construction(model, samples=50):
+    durations = []
+    for seed in range(samples):
+        start = time.perf_counter()
+        new_model(model, seed)
+        durations.append(time.perf_counter() - start)
+
+    return _summary(durations, unit="s")
+
+
+def measure_collector_overhead(steps, samples=5):
+    """
+    Per-step cost of data collectors on top of a v0.2.0 model step
+    """
+
+    def step_time(collector_class):
+        times = []
+        for seed in range(samples):
+            model = new_model(Model_0_2_0, seed)
+            collector = collector_class(model)
+            collector.start(steps)
+
+            start = time.perf_counter()
+            for _ in range(steps):
+                model.step()
+                collector.after_step()
+            collector.to_dict()
+            times.append((time.perf_counter() - start) / steps)
+
+        return statistics.median(times)
+
+    baseline = step_time(NullCollector)
+
+    return {
+        name: {
+            "overhead_per_step_us": (step_time(collector) - baseline) * 1e6,
+            "baseline_step_us": baseline * 1e6,
+        }
+        for name, collector in COLLECTORS.items()
+    }
+
+
+def measure_pool_scaling(iterations, repeats_per_process, max_processes=None):
+    """
+    Wall time of a Simulation with a fixed amount of work per process, so a
+    perfectly scaling pool keeps it constant
+    """
+    max_processes = max_processes or os.cpu_count()
+    processes = sorted({1, *[2**i for i in range(1, 8)], max_processes})
+    processes = [p for p in processes if p <= max_processes]
+
+    results = {}
+    base_rate = None
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for n in processes:
+            simulation = Simulation(
+                model=Model_0_2_0(),
+                model_param_sets=[PARAM_SET],
+                iterations=iterations,
+                repeats=repeats_per_process * n,
+                datacollector=NullCollector,
+                run_name=f"scaling_{n}",
+                output_dir=output_dir,
+                processes=n,
+                seed=0,
+            )
+
+            start = time.perf_counter()
+            simulation.run()
+            elapsed = time.perf_counter() - start
+
+            rate = repeats_per_process * n * iterations / elapsed
+            base_rate = base_rate or rate
+            results[str(n)] = {
+                "seconds": elapsed,
+                "steps_per_second": rate,
+                "efficiency": rate / (base_rate * n),
+            }
+
+    return results
+
+
+def measure_io(iterations, repeats, samples=3):
+    """
+    Save and load time of a parameter set with an int8 per-step array and a
+    Q-table per repetition
+    """
+    rng = np.random.default_rng(0)
+    result = {
+        str(rep): {
+            "iterations": iterations,
+            "rewards": rng.integers(0, 2, iterations, dtype=np.int8),
+            "q_table": rng.random((8, 6)),
+        }
+        for rep in range(repeats)
+    }
+
+    timings = {key: [] for key in ("save_partial", "load_run", "load_run_lazy")}
+    timings.update({"store_write": [], "store_read": []})
+
+    for _ in range(samples):
+        with tempfile.TemporaryDirectory() as run_path:
+            with open(os.path.join(run_path, "description.csv"), "w") as file:
+                file.write(",perception\n0,0.5\n")
+
+            timings["save_partial"].append(
+                _timed(save_partial, run_path, 0, _copy_result(result))
+            )
+
+            _, load_partial = load_run(run_path)
+            timings["load_run"].append(_timed(load_partial, 0))
+
+            _, load_lazy = load_run(run_path, lazy=True)
+            timings["load_run_lazy"].append(
+                _timed(lambda: [np.sum(r["rewards"]) for r in load_lazy(0).values()])
+            )
+
+        with tempfile.TemporaryDirectory() as run_path:
+            store = ResultStore(run_path)
+            timings["store_write"].append(_timed(store.write, 0, result))
+            timings["store_read"].append(_timed(store.read_partial, 0))
+
+    return {key: _summary(values, unit="s") for key, values in timings.items()}
+
+
+def run_benchmarks(scale=1.0, processes=None) -> dict:
+    steps = max(100, int(2000 * scale))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        results = {
+            "steps_per_second": {
+                name: measure_steps_per_second(model, steps)
+                for name, model in MODELS.items()
+            },
+            "toy_scaling": measure_toy_scaling(steps // 4),
+            "dyad_scaling": measure_dyad_scaling(steps),
+            "construction": {
+                name: measure_construction(model) for name, model in MODELS.items()
+            },
+            "collector_overhead": measure_collector_overhead(steps),
+            "pool_scaling": measure_pool_scaling(
+                iterations=steps, repeats_per_process=4, max_processes=processes
+            ),
+            "io": measure_io(iterations=25 * steps, repeats=20),
+        }
+
+    return {"meta": _metadata(scale), "results": results}
+
+
+def run_gate_scenarios(scale=1.0) -> dict:
+    steps = max(100, int(2000 * scale))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+
+        scenarios = {
+            name: {
+                "steps_per_second": measure_steps_per_second(model, steps, seed=0),
+                "peak_memory": measure_peak_memory(model, steps // 4),
+            }
+            for name, model in MODELS.items()
+        }
+
+    return {
+        "meta": _metadata(scale),
+        "calibration": measure_calibration(),
+        "scenarios": scenarios,
+    }
+
+
+def compare(baseline: dict, current: dict, absolute=False) -> list[dict]:
+    """
+    Per-scenario comparison of gate results, with a "regressed" flag
+    """
+    if absolute:
+        speed = 1.0
+    else:
+        speed = current["calibration"]["median"] / baseline["calibration"]["median"]
+
+    report = []
+    for name, base in baseline["scenarios"].items():
+        if name not in current["scenarios"]:
+            continue
+        cur = current["scenarios"][name]
+
+        base_rate = base["steps_per_second"]
+        cur_rate = cur["steps_per_second"]
+        expected = base_rate["median"] * speed
+        noise = _relative_noise(base_rate) + _relative_noise(cur_rate)
+        tolerance = min(max(RATE_TOLERANCE, NOISE_FACTOR * noise), MAX_RATE_TOLERANCE)
+        report.append(
+            {
+                "scenario": name,
+                "metric": "steps_per_second",
+                "baseline": expected,
+                "current": cur_rate["median"],
+                "change": cur_rate["median"] / expected - 1,
+                "allowed": -tolerance,
+                "regressed": cur_rate["median"] < expected * (1 - tolerance),
+            }
+        )
+
+        base_memory = base["peak_memory"]
+        cur_memory = cur["peak_memory"]
+        limit = base_memory * (1 + MEMORY_TOLERANCE)
+        report.append(
+            {
+                "scenario": name,
+                "metric": "peak_memory",
+                "baseline": base_memory,
+                "current": cur_memory,
+                "change": cur_memory / base_memory - 1,
+                "allowed": limit / base_memory - 1,
+                "regressed": cur_memory > limit,
+            }
+        )
+
+    return report
+
+
+def format_report(report: list[dict]) -> str:
+    lines = [
+        f"{'scenario':<10}{'metric':<18}{'baseline':>14}{'current':>14}"
+        f"{'change':>9}{'allowed':>9}"
+    ]
+    for row in report:
+        status = "REGRESSED" if row["regressed"] else "ok"
+        lines.append(
+            f"{row['scenario']:<10}{row['metric']:<18}{row['baseline']:>14.0f}"
+            f"{row['current']:>14.0f}{row['change']:>+9.1%}{row['allowed']:>+9.1%}"
+            f"  {status}"
+        )
+
+    return "\n".join(lines)
+
+
+def _relative_noise(summary):
+    """
+    Robust relative spread of the samples, scaled MAD over the median
+    """
+    median = summary["median"]
+    mad = statistics.median(abs(v - median) for v in summary["samples"])
+    return 1.4826 * mad / median
+
+
+def _summary(values, unit):
+    return {
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+        "samples": values,
+        "unit": unit,
+    }
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def _copy_result(result):
+    # save_partial replaces arrays with their descriptions in place
+    return {rep: dict(values) for rep, values in result.items()}
+
+
+def _metadata(scale):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "scale": scale,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "mesa": mesa.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiplier of the number of steps"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the full benchmark suite")
+    run.add_argument("--output", default="benchmark.json")
+    run.add_argument("--processes", type=int, default=None)
+
+    check = commands.add_parser("check", help="Compare against the baseline")
+    check.add_argument("--baseline", default=BASELINE_PATH)
+    check.add_argument("--output", default=None, help="Also save the results")
+    check.add_argument(
+        "--absolute",
+        action="store_true",
+        help="Compare raw steps/sec, without machine speed calibration",
+    )
+
+    baseline = commands.add_parser("baseline", help="Record a new baseline")
+    baseline.add_argument("--output", default=BASELINE_PATH)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_benchmarks(scale=args.scale, processes=args.processes)
+        _save(report, args.output)
+
+        for name, summary in report["results"]["steps_per_second"].items():
+            print(f"{name}: {summary['median']:.0f} steps/s")
+
+    elif args.command == "baseline":
+        _save(run_gate_scenarios(scale=args.scale), args.output)
+
+    elif args.command == "check":
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        current = run_gate_scenarios(scale=baseline["meta"]["scale"] * args.scale)
+        if args.output:
+            _save(current, args.output)
+
+        report = compare(baseline, current, absolute=args.absolute)
+        print(format_report(report))
+
+        regressions = [row for row in report if row["regressed"]]
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}")
+            sys.exit(1)
+
+
+def _save(report, output):
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,48 @@
+import math
 from dataclasses import dataclass, asdict
 
+import numpy as np
+
+TOY_LAYOUTS = ("grid", "random")
+
 
 @dataclass
 class Config:
     persistence_boost_value: float = 0.0
     coordination_boost_value: float = 0.0
 
+    # Environment: number of toys, their initial placement, the side length
+    # of the square arena and the number of infant-parent pairs sharing it
+    n_toys: int = 4
+    toy_layout: str = "grid"
+    arena_size: float = 100.0
+    n_dyads: int = 1
+
+    def __post_init__(self):
+        if self.toy_layout not in TOY_LAYOUTS:
+            raise ValueError(f"Unknown toy layout: {self.toy_layout}")
+        if self.n_dyads < 1:
+            raise ValueError("A model needs at least one dyad")
+
     def to_dict(self):
         return asdict(self)
+
+    def toy_positions(self, generator: np.random.Generator) -> np.ndarray:
+        """
+        Initial (n_toys, 2) toy positions. The grid layout puts toys in the
+        middle of the cells of a near-square grid, column by column, so four
+        toys are at the quarter points of the arena. The random layout draws
+        them uniformly from the generator.
+        """
+        if self.toy_layout == "random":
+            return generator.random((self.n_toys, 2)) * self.arena_size
+
+        columns = math.ceil(math.sqrt(self.n_toys))
+        rows = math.ceil(self.n_toys / columns)
+        cells = [
+            [(column + 0.5) / columns, (row + 0.5) / rows]
+            for column in range(columns)
+            for row in range(rows)
+        ]
+
+        return np.array(cells[: self.n_toys]).reshape(-1, 2) * self.arena_size
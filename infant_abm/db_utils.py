@@ -1,4 +1,6 @@
 import json
+import os
+import shutil
 import numpy as np
 import pandas as pd
 
@@ -6,10 +8,21 @@ import pandas as pd
 from os import path
 from pathlib import Path
 
+from infant_abm.result_store import ResultStore, pad_stack
 
-def load_run(run_path):
+
+def load_run(run_path, lazy=False):
+    """
+    Description of a run and a function loading the results of a parameter set.
+
+    With lazy=True arrays of partials are read-only np.memmap views, only the
+    parts actually accessed are read from disk.
+    """
     description_df = pd.read_csv(path.join(run_path, "description.csv"), index_col=0)
 
+    if ResultStore.exists(run_path):
+        return description_df, ResultStore(run_path).read_partial
+
     def load_partial(index):
         partial_path = get_partial_path(run_path, index)
         partial_dir = get_partial_dir(run_path, index)
@@ -19,18 +32,105 @@ def load_run(run_path):
 
         for repeat, rep_result in result.items():
             for k, v in rep_result.items():
-                if isinstance(v, list) and v[0] == "ndarray":
+                if _is_array_entry(v):
                     data_path = path.join(partial_dir, str(repeat), str(k))
+                    result[repeat][k] = _load_array(data_path, v, lazy)
+
+        return result
+
+    return description_df, load_partial
+
+
+class SweepArray:
+    """
+    Lazy (index, repetition, step, ...) view of an array output of a run.
+
+    Indexing reads only the requested parameter sets, repetitions and steps:
+
+        rewards = SweepArray(run_path, "rewards")
+        rewards[[0, 5, 7], 0:10, 40_000:50_000]
 
-                    shape = [int(s) for s in v[2]]
+    Parameter sets are selected by their description index labels, an integer
+    drops the axis like in numpy. Runs stopped early are zero-padded to the
+    longest selected run.
+    """
 
-                    result[repeat][k] = np.fromfile(data_path, dtype=v[1]).reshape(
-                        shape
-                    )
+    def __init__(self, run_path, key: str):
+        self.run_path = run_path
+        self.key = key
 
+        description_df, self._load_partial = load_run(run_path, lazy=True)
+        self.indices = np.asarray(description_df.index)
+
+        self._store = ResultStore(run_path) if ResultStore.exists(run_path) else None
+
+    def __getitem__(self, item):
+        if not isinstance(item, tuple):
+            item = (item,)
+        item = item + (slice(None),) * (3 - len(item))
+        index_item, repetitions, steps = item[0], item[1], item[2:]
+
+        if isinstance(index_item, slice):
+            indices = self.indices[index_item]
+        else:
+            indices = np.atleast_1d(index_item)
+
+        arrays = [self._read(index, repetitions, steps) for index in indices]
+        result = pad_stack(arrays)
+
+        if np.ndim(index_item) == 0 and not isinstance(index_item, slice):
+            return result[0]
         return result
 
-    return description_df, load_partial
+    def _read(self, index, repetitions, steps):
+        if self._store is not None:
+            chunk = self._store.read_array(self.key, [index])[0]
+            lengths = self._store.read_lengths(self.key, [index])[0]
+            arrays = [values[:length] for values, length in zip(chunk, lengths)]
+        else:
+            arrays = [rep[self.key] for rep in self._load_partial(index).values()]
+
+        selected = np.arange(len(arrays))[repetitions]
+        if np.ndim(selected) == 0:
+            return np.array(arrays[selected][steps])
+
+        return pad_stack([arrays[rep][steps] for rep in selected])
+
+
+def _is_array_entry(value):
+    return isinstance(value, list) and value and value[0] == "ndarray"
+
+
+def _load_array(data_path, entry, lazy):
+    _, dtype, shape = entry
+    shape = tuple(int(s) for s in shape)
+
+    if lazy:
+        if 0 in shape:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(data_path, dtype=dtype, mode="r", shape=shape)
+
+    return np.fromfile(data_path, dtype=dtype).reshape(shape)
+
+
+def convert_run(run_path, remove=False) -> ResultStore:
+    """
+    Move a run saved as per-index partials into a single ResultStore
+    """
+    description_df, load_partial = load_run(run_path)
+    store = ResultStore(run_path)
+
+    for index in description_df.index:
+        if not partial_exists(run_path, index) or store.contains(index):
+            continue
+
+        store.write(index, load_partial(index))
+
+        if remove:
+            Path(get_partial_path(run_path, index)).unlink()
+            shutil.rmtree(get_partial_dir(run_path, index), ignore_errors=True)
+
+    return store
 
 
 def partial_exists(run_path, index):
@@ -42,6 +142,9 @@ def save_partial(run_path: str, index: int, result: dict):
     partial_path = get_partial_path(run_path, index)
     partial_dir = get_partial_dir(run_path, index)
 
+    # Left over by a save interrupted before the JSON was renamed
+    shutil.rmtree(partial_dir, ignore_errors=True)
+
     arrays_stored = any([isinstance(v, np.ndarray) for v in result["0"].values()])
     if arrays_stored:
         Path(partial_dir).mkdir(parents=False, exist_ok=False)
@@ -58,8 +161,38 @@ def save_partial(run_path: str, index: int, result: dict):
 
                 result[repetition][k] = [("ndarray"), str(v.dtype), v.shape]
 
-    with open(partial_path, "w") as file:
+    # Renamed once complete, the file marks the parameter set as saved
+    tmp_path = f"{partial_path}.tmp"
+    with open(tmp_path, "w") as file:
         json.dump(result, file)
+    os.replace(tmp_path, partial_path)
+
+
+def aggregate_exists(run_path, index):
+    return path.exists(get_aggregate_path(run_path, index))
+
+
+def save_aggregate(run_path: str, index: int, aggregate: dict[str, np.ndarray]):
+    aggregate_path = get_aggregate_path(run_path, index)
+
+    # Renamed once complete, the file marks the parameter set as saved
+    tmp_path = f"{aggregate_path}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez(file, **aggregate)
+    os.replace(tmp_path, aggregate_path)
+
+
+def load_aggregate(run_path, index) -> dict[str, np.ndarray]:
+    """
+    Cross-repeat aggregates of a parameter set of a run saved with an
+    Aggregate, see Aggregate.to_dict
+    """
+    with np.load(get_aggregate_path(run_path, index)) as aggregate:
+        return dict(aggregate)
+
+
+def get_aggregate_path(run_path, index):
+    return path.join(run_path, f"{index}.aggregate.npz")
 
 
 def get_partial_dir(run_path, index):
@@ -4,6 +4,7 @@ Infant Model
 A Mesa implementation of Infant ABM Model
 """
 
+import copy
 import math
 from typing import List
 import mesa
@@ -13,15 +14,24 @@ import warnings
 from infant_abm.agents import Toy, Position, Infant, Parent
 from infant_abm.agents.infant import Params as InfantParams
 from infant_abm.config import Config
+from infant_abm.rng import RandomSource
+from infant_abm.toy_choice import ToyChoice
+from infant_abm.toy_index import ToyIndex
 
 
 class InfantModel(mesa.Model):
     """
     Flocker model class. Handles agent creation, placement and scheduling.
-    """
 
-    WIDTH = 100
-    HEIGHT = 100
+    A headless model has no Mesa space and scheduler, which are only needed by
+    the visualisation. It steps its agents directly, in the order the Mesa
+    scheduler uses (toys, which do nothing, infant, parent, then the same
+    order for advance), so both modes give the same results.
+
+    The arena is a square of config.arena_size, with config.n_toys toys shared
+    by config.n_dyads infant-parent pairs. Every agent interacts with its own
+    partner only; `infant` and `parent` are the first dyad.
+    """
 
     def __init__(
         self,
@@ -33,8 +43,17 @@ class InfantModel(mesa.Model):
         persistence=None,
         coordination=None,
         infant_kwargs=dict(),
+        rng=None,
+        headless=False,
     ):
         mesa.Model.__init__(self)
+        self.headless = headless
+
+        if not isinstance(rng, RandomSource):
+            rng = RandomSource(rng)
+        self.rng: RandomSource = rng
+        # Mesa's own Python RNG is seeded from the same source
+        self.reset_randomizer(int(self.rng.generator.integers(2**63)))
 
         if infant_params is None:
             infant_params = InfantParams.from_array(
@@ -42,11 +61,15 @@ class InfantModel(mesa.Model):
             )
         self.next_agent_id = 0
 
-        self.space = mesa.space.ContinuousSpace(self.WIDTH, self.HEIGHT, False)
-        self.schedule = mesa.time.SimultaneousActivation(model=self)
+        self.config = config
+        self.width = self.height = config.arena_size
+
+        if not headless:
+            self.space = mesa.space.ContinuousSpace(self.width, self.height, False)
+            self.schedule = mesa.time.SimultaneousActivation(model=self)
 
-        Position.x_max = self.WIDTH
-        Position.y_max = self.HEIGHT
+        Position.x_max = self.width
+        Position.y_max = self.height
 
         assert issubclass(infant_class, Infant)
         self.infant_class = infant_class
@@ -56,43 +79,56 @@ class InfantModel(mesa.Model):
 
         self.parent: Parent = None
         self.infant: Infant = None
+        self.dyads: List[tuple[Infant, Parent]] = None
         self.toys: List[Toy] = None
 
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", category=UserWarning)
             self.make_agents(infant_params, infant_kwargs)
 
-        self.config = config
         self._apply_config(config)
 
+    def __setstate__(self, state):
+        # Restore the class-level settings of a model unpickled in a fresh
+        # process, e.g. when resuming from a checkpoint
+        self.__dict__.update(state)
+
+        Position.x_max = self.width
+        Position.y_max = self.height
+        self._apply_config(self.config)
+
     def make_agents(self, infant_params, infant_kwargs):
         self.toys = self._create_toys()
 
-        parent_x = np.random.uniform(0.25, 0.75) * Position.x_max
-        parent_y = np.random.uniform(0.25, 0.75) * Position.y_max
+        # Agents are not placed in the Mesa space, which only defines the
+        # bounds; toy positions and interaction counts are kept in arrays
+        self.toy_index = ToyIndex([toy.pos for toy in self.toys])
+        self.toy_interactions = np.zeros(len(self.toys), dtype=np.int64)
+        self.toy_choice = ToyChoice(self.toy_interactions)
+        for index, toy in enumerate(self.toys):
+            toy.index = index
 
-        self.parent = self.parent_class(
-            model=self,
-            unique_id=self._next_agent_id(),
-            pos=np.array([parent_x, parent_y]),
-        )
+        self.dyads = []
+        for dyad in range(self.config.n_dyads):
+            # Every infant adapts its own parameters
+            params = infant_params if dyad == 0 else copy.deepcopy(infant_params)
+            self.dyads.append(self._create_dyad(params, infant_kwargs))
 
-        x, y = (0.5 * Position.x_max, 0.5 * Position.y_max)
+        self.infant, self.parent = self.dyads[0]
+        self._agents = [agent for dyad in self.dyads for agent in dyad]
 
-        self.infant = self.infant_class(
-            model=self,
-            unique_id=self._next_agent_id(),
-            pos=np.array([x, y]),
-            params=infant_params,
-            **infant_kwargs,
-        )
-
-        for agent in self.toys + [self.infant] + [self.parent]:
-            self.schedule.add(agent)
-            self.space.place_agent(agent, agent.pos)
+        if not self.headless:
+            for agent in self.toys + self._agents:
+                self.schedule.add(agent)
 
     def step(self):
-        self.schedule.step()
+        if self.headless:
+            for agent in self._agents:
+                agent.step()
+            for agent in self._agents:
+                agent.advance()
+        else:
+            self.schedule.step()
 
     def get_middle_dist(self) -> float:
         middle_point = (self.parent.pos + self.infant.pos) / 2
@@ -108,18 +144,44 @@ class InfantModel(mesa.Model):
         if pos is None or range is None:
             return self.toys
         else:
-            toys = self.space.get_neighbors(pos, range, False)
-            return [t for t in toys if isinstance(t, Toy)]
+            return [self.toys[i] for i in self.toy_index.query(pos, range)]
+
+    def _create_dyad(self, infant_params, infant_kwargs):
+        """
+        A single dyad starts with the infant in the middle of the arena and the
+        parent in its central half. With more dyads, every dyad starts around
+        a random point, the parent up to a quarter of the arena away from it.
+        """
+        if self.config.n_dyads == 1:
+            parent_x = self.rng.uniform(0.25, 0.75) * Position.x_max
+            parent_y = self.rng.uniform(0.25, 0.75) * Position.y_max
+            x, y = (0.5 * Position.x_max, 0.5 * Position.y_max)
+        else:
+            x = self.rng.uniform(0, Position.x_max)
+            y = self.rng.uniform(0, Position.y_max)
+            parent_x = x + self.rng.uniform(-0.25, 0.25) * Position.x_max
+            parent_y = y + self.rng.uniform(-0.25, 0.25) * Position.y_max
 
-    def _create_toys(self):
-        toys = []
+        parent = self.parent_class(
+            model=self,
+            unique_id=self._next_agent_id(),
+            pos=Position.correct_out_of_bounds(np.array([parent_x, parent_y])),
+        )
 
-        for x in [1 / 4, 3 / 4]:
-            for y in [1 / 4, 3 / 4]:
-                toy_pos = np.array([x * self.space.x_max, y * self.space.y_max])
-                toys.append(Toy(self._next_agent_id(), self, toy_pos))
+        infant = self.infant_class(
+            model=self,
+            unique_id=self._next_agent_id(),
+            pos=Position.correct_out_of_bounds(np.array([x, y])),
+            params=infant_params,
+            **infant_kwargs,
+        )
+        infant.pair(parent)
+
+        return infant, parent
 
-        return toys
+    def _create_toys(self):
+        positions = self.config.toy_positions(self.rng.generator)
+        return [Toy(self._next_agent_id(), self, pos) for pos in positions]
 
     def _next_agent_id(self):
         agent_id = self.next_agent_id
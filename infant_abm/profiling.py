@@ -0,0 +1,123 @@
+"""
+Profiling
+=============================================================
+Opt-in instrumentation of agent hot paths: call counts and cumulative time
+of every action performed by Infant._perform_action and
+Parent._perform_action, and of every event handled by Parent.handle_event,
+per agent class.
+
+The hooks are installed on the base classes only while profiling is active,
+so there is no cost otherwise. Times are inclusive, events handled during
+an infant's action are counted in both.
+
+    with profiling.profile() as profiler:
+        for _ in range(1000):
+            model.step()
+
+    profiler.to_dataframe()
+"""
+
+import contextlib
+import time
+
+import pandas as pd
+
+from infant_abm.agents.infant import Infant
+from infant_abm.agents.parent import Parent
+
+PROFILE_FILENAME = "profile.csv"
+
+_active = None
+_originals = {}
+
+
+class Profiler:
+    def __init__(self, stats=None):
+        # (agent class, "action" | "event", name): [calls, seconds]
+        self.stats: dict[tuple, list] = stats or {}
+
+    def record(self, key, elapsed):
+        entry = self.stats.get(key)
+        if entry is None:
+            self.stats[key] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def merge(self, other: "Profiler"):
+        for key, (calls, seconds) in other.stats.items():
+            entry = self.stats.setdefault(key, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+
+    def to_dataframe(self) -> pd.DataFrame:
+        rows = [
+            {
+                "agent": agent,
+                "kind": kind,
+                "name": name,
+                "calls": calls,
+                "seconds": seconds,
+                "mean_us": seconds / calls * 1e6,
+            }
+            for (agent, kind, name), (calls, seconds) in self.stats.items()
+        ]
+        columns = ["agent", "kind", "name", "calls", "seconds", "mean_us"]
+
+        df = pd.DataFrame(rows, columns=columns)
+        return df.sort_values("seconds", ascending=False, ignore_index=True)
+
+    def save(self, path):
+        self.to_dataframe().to_csv(path, index=False)
+
+
+@contextlib.contextmanager
+def profile(profiler: Profiler = None):
+    profiler = profiler or Profiler()
+    enable(profiler)
+    try:
+        yield profiler
+    finally:
+        disable()
+
+
+def enable(profiler: Profiler):
+    global _active
+    _active = profiler
+
+    if not _originals:
+        _install(Infant, "_perform_action", _action_name)
+        _install(Parent, "_perform_action", _action_name)
+        _install(Parent, "handle_event", _event_name)
+
+
+def disable():
+    global _active
+    _active = None
+
+    for (cls, method_name), method in _originals.items():
+        setattr(cls, method_name, method)
+    _originals.clear()
+
+
+def _install(cls, method_name, key_fn):
+    method = getattr(cls, method_name)
+    _originals[cls, method_name] = method
+
+    def profiled(self, arg):
+        start = time.perf_counter()
+        result = method(self, arg)
+        _active.record(key_fn(self, arg), time.perf_counter() - start)
+        return result
+
+    setattr(cls, method_name, profiled)
+
+
+def _action_name(agent, action):
+    # Infant actions are objects, parent actions enum members
+    name = getattr(action, "name", None) or type(action).__name__
+    return type(agent).__name__, "action", name
+
+
+def _event_name(agent, event):
+    return type(agent).__name__, "event", type(event).__name__
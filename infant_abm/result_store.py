@@ -0,0 +1,213 @@
+"""
+Result store
+=============================================================
+All results of a run in a `store` directory of compressed chunks, one zip
+file per parameter set.
+
+* Array outputs are stored densely per parameter set as one member of shape
+  (repetitions, *array_shape) per collector key. Shorter arrays of runs
+  stopped early are zero-padded along the first axis and their lengths are
+  kept next to them.
+* Everything else is kept in a scalar record, one JSON member per chunk,
+  readable for the whole run as a DataFrame with (index, repetition) rows.
+
+Only the main process writes to the store. Every chunk is written to a
+temporary file and renamed once complete, so a crash never damages the sets
+saved before, and an existing chunk marks its parameter set as saved.
+"""
+
+import io
+import json
+import os
+import zipfile
+from os import path
+
+import numpy as np
+import pandas as pd
+
+STORE_DIRNAME = "store"
+SCALARS_NAME = "scalars.json"
+
+
+class ResultStore:
+    def __init__(self, run_path):
+        self.run_path = run_path
+        self.dir = path.join(run_path, STORE_DIRNAME)
+
+        self._indices = set()
+        if path.isdir(self.dir):
+            for name in os.listdir(self.dir):
+                if name.endswith(".zip"):
+                    self._indices.add(int(name.removesuffix(".zip")))
+
+    @staticmethod
+    def exists(run_path) -> bool:
+        return path.isdir(path.join(run_path, STORE_DIRNAME))
+
+    def indices(self) -> list[int]:
+        return sorted(self._indices)
+
+    def array_keys(self) -> list[str]:
+        """
+        Array outputs, as saved for the first parameter set
+        """
+        if not self._indices:
+            return []
+
+        with zipfile.ZipFile(self._chunk_path(min(self._indices)), "r") as chunk:
+            return sorted(_array_keys(chunk))
+
+    def contains(self, index: int) -> bool:
+        return index in self._indices
+
+    def write(self, index: int, result: dict):
+        """
+        Save the result of a parameter set, in the save_partial format:
+        {repetition: {key: value}}
+        """
+        repetitions = sorted(result, key=int)
+        keys = result[repetitions[0]].keys()
+
+        scalars = {rep: {} for rep in repetitions}
+        arrays = {}
+        for key in keys:
+            values = [result[rep][key] for rep in repetitions]
+            if isinstance(values[0], np.ndarray) and values[0].ndim > 0:
+                arrays[key] = _stack(values)
+            else:
+                for rep, value in zip(repetitions, values):
+                    scalars[rep][key] = value
+
+        os.makedirs(self.dir, exist_ok=True)
+        chunk_path = self._chunk_path(index)
+        tmp_path = f"{chunk_path}.{os.getpid()}.tmp"
+
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as chunk:
+            for key, (values, lengths) in arrays.items():
+                chunk.writestr(_array_name(key), _to_bytes(values))
+                chunk.writestr(_lengths_name(key), _to_bytes(lengths))
+            chunk.writestr(SCALARS_NAME, json.dumps(scalars, default=_json_scalar))
+
+        # Renamed once complete, marks the parameter set as saved
+        os.replace(tmp_path, chunk_path)
+        self._indices.add(index)
+
+    def read_partial(self, index: int) -> dict:
+        """
+        Result of a parameter set in the load_partial format
+        """
+        with zipfile.ZipFile(self._chunk_path(index), "r") as chunk:
+            result = json.loads(chunk.read(SCALARS_NAME))
+
+            for key in _array_keys(chunk):
+                values = _from_bytes(chunk.read(_array_name(key)))
+                lengths = _from_bytes(chunk.read(_lengths_name(key)))
+                for rep, rep_values, length in zip(result, values, lengths):
+                    result[rep][key] = rep_values[:length]
+
+        return result
+
+    def read_array(
+        self,
+        key: str,
+        indices=None,
+        repetitions=slice(None),
+        steps=slice(None),
+    ) -> np.ndarray:
+        """
+        Dense (index, repetition, step, ...) array of a collector output.
+        Parameter sets with fewer repetitions or steps are zero-padded, see
+        read_lengths for the recorded steps.
+        """
+        if indices is None:
+            indices = self.indices()
+
+        chunks = [self._read_member(index, _array_name(key)) for index in indices]
+        return pad_stack([values[repetitions, steps] for values in chunks])
+
+    def read_lengths(self, key: str, indices=None) -> np.ndarray:
+        """
+        Recorded steps of every (index, repetition), zero for repetitions
+        missing from a parameter set
+        """
+        if indices is None:
+            indices = self.indices()
+
+        return pad_stack(
+            [self._read_member(index, _lengths_name(key)) for index in indices]
+        )
+
+    def read_scalars(self) -> pd.DataFrame:
+        rows = []
+        for index in self.indices():
+            scalars = json.loads(self._read_member(index, SCALARS_NAME, array=False))
+            for rep, values in scalars.items():
+                rows.append({"index": index, "repetition": int(rep), **values})
+
+        return pd.DataFrame(rows)
+
+    def _read_member(self, index, name, array=True):
+        with zipfile.ZipFile(self._chunk_path(index), "r") as chunk:
+            data = chunk.read(name)
+
+        return _from_bytes(data) if array else data
+
+    def _chunk_path(self, index):
+        return path.join(self.dir, f"{index}.zip")
+
+
+def _stack(values):
+    max_length = max(len(v) for v in values)
+    lengths = np.array([len(v) for v in values], dtype=np.int64)
+
+    chunk = np.zeros((len(values), max_length, *values[0].shape[1:]), values[0].dtype)
+    for i, v in enumerate(values):
+        chunk[i, : len(v)] = v
+
+    return chunk, lengths
+
+
+def _to_bytes(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _from_bytes(data):
+    return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+def pad_stack(arrays):
+    """
+    Stack arrays of the same number of dimensions, zero-padding every axis to
+    the longest array along it
+    """
+    shape = np.max([a.shape for a in arrays], axis=0)
+    stacked = np.zeros((len(arrays), *shape), arrays[0].dtype)
+    for i, a in enumerate(arrays):
+        stacked[(i, *(slice(0, n) for n in a.shape))] = a
+
+    return stacked
+
+
+def _json_scalar(value):
+    # NumPy scalars and 0-d arrays, e.g. counters of collectors
+    if isinstance(value, (np.generic, np.ndarray)) and np.ndim(value) == 0:
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _array_keys(chunk):
+    return [
+        name.removeprefix("arrays/").removesuffix(".npy")
+        for name in chunk.namelist()
+        if name.startswith("arrays/") and not name.endswith(".lengths.npy")
+    ]
+
+
+def _array_name(key):
+    return f"arrays/{key}.npy"
+
+
+def _lengths_name(key):
+    return f"arrays/{key}.lengths.npy"
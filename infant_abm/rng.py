@@ -0,0 +1,65 @@
+import bisect
+import itertools
+
+import numpy as np
+
+
+class RandomSource:
+    """
+    Random number source owned by a single model.
+
+    Wraps a np.random.Generator, which is available as `generator` for array
+    draws. Scalar uniforms are pre-drawn in blocks and handed out as Python
+    floats, all other scalar variates are derived from them, so the per-call
+    cost on agent hot paths is a single iterator step.
+    """
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, seed=None, block_size: int = BLOCK_SIZE):
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+
+        self._next_uniform = iter(()).__next__
+
+    def random(self) -> float:
+        """
+        Uniform variate from [0, 1)
+        """
+        try:
+            return self._next_uniform()
+        except StopIteration:
+            self._refill()
+            return self._next_uniform()
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        return low + (high - low) * self.random()
+
+    def integers(self, high: int) -> int:
+        """
+        Uniform integer from [0, high)
+        """
+        return int(self.random() * high)
+
+    def choice(self, seq, p=None):
+        """
+        Random element of a sequence, with optional (not necessarily
+        normalized) probabilities
+        """
+        if p is None:
+            return seq[self.integers(len(seq))]
+
+        if isinstance(p, np.ndarray):
+            cumulative = np.cumsum(p)
+            index = int(
+                cumulative.searchsorted(self.random() * cumulative[-1], "right")
+            )
+        else:
+            cumulative = list(itertools.accumulate(p))
+            index = bisect.bisect_right(cumulative, self.random() * cumulative[-1])
+
+        return seq[min(index, len(seq) - 1)]
+
+    def _refill(self):
+        block = self.generator.random(self.block_size).tolist()
+        self._next_uniform = iter(block).__next__
@@ -1 +1,7 @@
 from .simulation import *  # noqa: F403
+from .collectors import *  # noqa: F403
+from .stopping import *  # noqa: F403
+from .adaptive import *  # noqa: F403
+from .sweep import *  # noqa: F403
+from .surrogate import *  # noqa: F403
+from .aggregation import *  # noqa: F403
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+from scipy import stats
+
+
+class AdaptiveRepeats:
+    """
+    Sequential stopping rule for the repetitions of a parameter set.
+
+    Repetitions run in batches: after min_repeats, and after every further
+    batch_size, the confidence interval of the mean of every output is
+    computed and the set stops once all intervals are narrower than
+    `ci_width`, or when max_repeats is reached.
+
+    outputs - collector output keys, or a dict of name: callable computing a
+        value from a single run's result. Array outputs are reduced to their
+        mean, missing (None) values are ignored.
+    ci_width - target full width of the intervals, a number or a dict per output
+    """
+
+    def __init__(
+        self,
+        outputs,
+        ci_width,
+        min_repeats=10,
+        max_repeats=1000,
+        batch_size=10,
+        confidence=0.95,
+    ):
+        if not 2 <= min_repeats <= max_repeats:
+            raise ValueError("Repeat bounds must satisfy 2 <= min <= max")
+
+        if not isinstance(outputs, dict):
+            outputs = {key: output_getter(key) for key in outputs}
+        self.outputs = outputs
+
+        if not isinstance(ci_width, dict):
+            ci_width = {name: ci_width for name in outputs}
+        self.ci_width = ci_width
+
+        self.min_repeats = min_repeats
+        self.max_repeats = max_repeats
+        self.batch_size = batch_size
+        self.confidence = confidence
+
+    def precision(self, results: list[dict]) -> dict[str, float]:
+        """
+        Confidence interval width of every output over the given runs
+        """
+        return {
+            name: self._interval_width([statistic(r) for r in results])
+            for name, statistic in self.outputs.items()
+        }
+
+    def next_batch(self, results: list[dict]) -> int:
+        """
+        Number of repetitions to add to a set with the given results, 0 when done
+        """
+        n = len(results)
+        if n >= self.max_repeats:
+            return 0
+
+        widths = self.precision(results)
+        if all(widths[name] <= self.ci_width[name] for name in self.outputs):
+            return 0
+
+        return min(self.batch_size, self.max_repeats - n)
+
+    def _interval_width(self, values):
+        values = np.array([v for v in values if v is not None], dtype=np.float64)
+        n = len(values)
+        if n < 2:
+            return math.inf
+
+        quantile = stats.t.ppf((1 + self.confidence) / 2, df=n - 1)
+        return float(2 * quantile * values.std(ddof=1) / math.sqrt(n))
+
+
+def output_getter(key):
+    """
+    Statistic of a single run's result: the output under `key`, arrays
+    reduced to their mean
+    """
+
+    def statistic(result):
+        value = result[key]
+        if isinstance(value, np.ndarray):
+            return value.mean()
+        return value
+
+    return statistic
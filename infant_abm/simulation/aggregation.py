@@ -0,0 +1,243 @@
+import numpy as np
+
+
+class Aggregate:
+    """
+    Cross-repeat aggregation of the outputs of a parameter set.
+
+    Instead of the result of every repetition, only per-element statistics
+    over the repetitions are saved: count, mean and sample variance (ddof=1)
+    of every output, and optionally quantiles. Workers fold the repetitions
+    they run into accumulators, which the main process merges, so raw results
+    never leave the workers, except for the first `keep` repetitions of every
+    set, which are saved as usual.
+
+    Quantiles are estimated from per-element histograms over the `bins`
+    edges, with linear interpolation within a bin. Values beyond the edges
+    count in the outer bins, so the edges should cover the range of the
+    output.
+
+    outputs - collector output keys, scalars or arrays. Arrays of runs
+        stopped early only contribute to the steps they recorded.
+    quantiles - quantile levels estimated for every output
+    bins - histogram edges of the quantile sketches, a sequence or a dict
+        per output
+    keep - number of repetitions saved in full
+    """
+
+    def __init__(self, outputs, quantiles=(), bins=None, keep=0):
+        self.outputs = list(outputs)
+        self.quantiles = tuple(quantiles)
+        self.keep = keep
+
+        if self.quantiles and bins is None:
+            raise ValueError("Quantiles require histogram bins")
+        if not isinstance(bins, dict):
+            bins = {name: bins for name in self.outputs}
+        self.bins = {
+            name: None if edges is None else np.asarray(edges, dtype=np.float64)
+            for name, edges in bins.items()
+        }
+
+    def accumulator(self) -> "Accumulator":
+        return Accumulator(
+            {
+                name: (
+                    Welford(),
+                    QuantileSketch(self.bins[name]) if self.quantiles else None,
+                )
+                for name in self.outputs
+            }
+        )
+
+    def to_dict(self, accumulator: "Accumulator") -> dict[str, np.ndarray]:
+        """
+        Saved aggregates: <output>_count, <output>_mean, <output>_var and,
+        with quantile levels, <output>_quantiles of shape (levels, ...)
+        """
+        result = {"repetitions": np.array(accumulator.repetitions)}
+        if self.quantiles:
+            result["quantiles"] = np.array(self.quantiles)
+
+        for name, (moments, sketch) in accumulator.outputs.items():
+            # Output missing (None) in all repetitions
+            if moments.count is None:
+                continue
+
+            result[f"{name}_count"] = moments.count
+            result[f"{name}_mean"] = moments.mean
+            result[f"{name}_var"] = moments.variance()
+            if sketch is not None:
+                result[f"{name}_quantiles"] = sketch.quantiles(self.quantiles)
+
+        return result
+
+
+class Accumulator:
+    """
+    Streaming statistics of the outputs over the repetitions added so far
+    """
+
+    def __init__(self, outputs: dict):
+        self.outputs = outputs
+        self.repetitions = 0
+
+    def add(self, result: dict):
+        self.repetitions += 1
+
+        for name, (moments, sketch) in self.outputs.items():
+            value = result[name]
+            if value is None:
+                continue
+
+            value = np.asarray(value, dtype=np.float64)
+            moments.add(value)
+            if sketch is not None:
+                sketch.add(value)
+
+    def merge(self, other: "Accumulator"):
+        self.repetitions += other.repetitions
+
+        for name, (moments, sketch) in self.outputs.items():
+            other_moments, other_sketch = other.outputs[name]
+            moments.merge(other_moments)
+            if sketch is not None:
+                sketch.merge(other_sketch)
+
+
+class Welford:
+    """
+    Per-element count, mean and sum of squared deviations, updated with
+    Welford's algorithm and merged with Chan's parallel formula. Arrays grow
+    along the first axis to the longest value added.
+    """
+
+    def __init__(self):
+        self.count = None
+        self.mean = None
+        self.m2 = None
+
+    def add(self, value: np.ndarray):
+        self._grow(value.shape)
+        part = _leading(value)
+
+        count = self.count[part]
+        count += 1
+        delta = value - self.mean[part]
+        self.mean[part] += delta / count
+        self.m2[part] += delta * (value - self.mean[part])
+
+    def merge(self, other: "Welford"):
+        if other.count is None:
+            return
+        self._grow(other.count.shape)
+        part = _leading(other.count)
+
+        count = self.count[part] + other.count
+        delta = other.mean - self.mean[part]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(count > 0, other.count / count, 0.0)
+
+        self.mean[part] += delta * weight
+        self.m2[part] += other.m2 + delta**2 * self.count[part] * weight
+        self.count[part] = count
+
+    def variance(self) -> np.ndarray:
+        """
+        Sample variance, NaN where fewer than two values were added
+        """
+        if self.count is None:
+            return None
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    def _grow(self, shape):
+        if self.count is None:
+            self.count = np.zeros(shape, dtype=np.int64)
+            self.mean = np.zeros(shape)
+            self.m2 = np.zeros(shape)
+            return
+
+        if len(shape) and shape[0] > self.count.shape[0]:
+            padding = [(0, shape[0] - self.count.shape[0])] + [(0, 0)] * (
+                len(shape) - 1
+            )
+            self.count = np.pad(self.count, padding)
+            self.mean = np.pad(self.mean, padding)
+            self.m2 = np.pad(self.m2, padding)
+
+
+class QuantileSketch:
+    """
+    Per-element histograms over fixed edges. Sketches with the same edges
+    merge by adding their counts.
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = edges
+        self.counts = None
+
+    def add(self, value: np.ndarray):
+        n_bins = len(self.edges) - 1
+        self._grow(value.shape + (n_bins,))
+
+        bins = np.searchsorted(self.edges, value, side="right") - 1
+        bins = np.clip(bins, 0, n_bins - 1)
+
+        self.counts[_leading(value)] += bins[..., None] == np.arange(n_bins)
+
+    def merge(self, other: "QuantileSketch"):
+        if other.counts is None:
+            return
+        self._grow(other.counts.shape)
+        self.counts[_leading(other.counts)] += other.counts
+
+    def quantiles(self, levels) -> np.ndarray:
+        """
+        Estimated quantiles of shape (levels, ...), NaN where no values were
+        added
+        """
+        if self.counts is None:
+            return None
+
+        cumulative = np.cumsum(self.counts, axis=-1)
+        total = cumulative[..., -1:]
+
+        estimates = []
+        for level in levels:
+            target = level * total
+            # First bin reaching the target, skipping leading empty bins
+            below_target = (cumulative < target) | (cumulative == 0)
+            bins = np.minimum(
+                np.sum(below_target, axis=-1, keepdims=True),
+                self.counts.shape[-1] - 1,
+            )
+
+            in_bin = np.take_along_axis(self.counts, bins, axis=-1)
+            below = np.take_along_axis(cumulative, bins, axis=-1) - in_bin
+            with np.errstate(invalid="ignore", divide="ignore"):
+                fraction = np.clip((target - below) / in_bin, 0.0, 1.0)
+
+            low, high = self.edges[bins], self.edges[bins + 1]
+            estimate = low + np.nan_to_num(fraction) * (high - low)
+            estimates.append(np.where(total > 0, estimate, np.nan)[..., 0])
+
+        return np.stack(estimates)
+
+    def _grow(self, shape):
+        if self.counts is None:
+            self.counts = np.zeros(shape, dtype=np.int32)
+        elif len(shape) > 1 and shape[0] > self.counts.shape[0]:
+            padding = [(0, shape[0] - self.counts.shape[0])] + [(0, 0)] * (
+                len(shape) - 1
+            )
+            self.counts = np.pad(self.counts, padding)
+
+
+def _leading(value):
+    # Elements covered by a value, the first `len(value)` along the first
+    # axis. Indexing with it gives a view, also of 0-d arrays.
+    if np.ndim(value) == 0:
+        return Ellipsis
+    return slice(0, len(value))
@@ -0,0 +1,96 @@
+import glob
+import os
+import pickle
+
+CHECKPOINT_DIRNAME = "checkpoints"
+
+
+class Checkpoint:
+    """
+    Snapshots of a single run (parameter set index, repetition) of a sweep.
+
+    While the run is in progress, the whole model together with its collector
+    and stopping criterion is pickled every `every` steps. This covers agent
+    positions, action state machines, parameters, toy counters, Q-tables, gaze
+    histories and the RNG state, so a resumed run continues exactly where the
+    snapshot was taken. Once the run completes, its result replaces the
+    snapshot until the whole parameter set is saved.
+
+    Files are written to a temporary name and renamed, so an interrupted write
+    leaves the previous snapshot intact.
+    """
+
+    def __init__(self, run_path, index: int, repetition: int, every: int):
+        self.dir = os.path.join(run_path, CHECKPOINT_DIRNAME)
+        self.every = every
+
+        name = f"{index}-{repetition}"
+        self.state_path = os.path.join(self.dir, f"{name}.state.pkl")
+        self.result_path = os.path.join(self.dir, f"{name}.result.pkl")
+
+    def due(self, step: int, iterations: int) -> bool:
+        """
+        Whether to snapshot after the given number of completed steps
+        """
+        return step % self.every == 0 and step < iterations
+
+    def save_state(self, step: int, model, collector, criterion=None):
+        state = {
+            "step": step,
+            "model": model,
+            "collector": collector,
+            "criterion": criterion,
+        }
+        self._dump(state, self.state_path)
+
+    def load_state(self) -> dict:
+        """
+        The last snapshot of the run, None if there is none
+        """
+        return self._load(self.state_path)
+
+    def save_result(self, result: dict):
+        self._dump(result, self.result_path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def load_result(self) -> dict:
+        """
+        Result of the completed run, None if it did not complete
+        """
+        return self._load(self.result_path)
+
+    @staticmethod
+    def remove_set(run_path, index: int):
+        """
+        Remove the snapshots of all repetitions of a saved parameter set,
+        including partial writes of interrupted workers
+        """
+        checkpoint_dir = os.path.join(run_path, CHECKPOINT_DIRNAME)
+        for path in glob.glob(os.path.join(checkpoint_dir, f"{index}-*")):
+            os.remove(path)
+
+    @staticmethod
+    def remove_dir(run_path):
+        """
+        Remove the snapshot directory once no snapshots are left
+        """
+        checkpoint_dir = os.path.join(run_path, CHECKPOINT_DIRNAME)
+        if os.path.isdir(checkpoint_dir) and not os.listdir(checkpoint_dir):
+            os.rmdir(checkpoint_dir)
+
+    def _dump(self, obj, path):
+        os.makedirs(self.dir, exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _load(path):
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            return pickle.load(f)
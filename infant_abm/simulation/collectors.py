@@ -0,0 +1,114 @@
+import math
+import operator
+
+import numpy as np
+
+from infant_abm.simulation.simulation import DataCollector
+
+
+class Series:
+    """
+    Per-step value recorded by an ArrayCollector.
+
+    value - callable taking the model, or a dotted attribute path of the
+        model, e.g. "infant.last_reward"
+    dtype - type of the stored values
+    every - decimation factor, only one value per `every` steps is kept
+    mean - with decimation, keep the mean over each window of `every` steps
+        instead of the value of the window's last step
+    packbits - store a boolean series packed 8 steps per byte
+    """
+
+    def __init__(self, value, dtype=np.float64, every=1, mean=False, packbits=False):
+        if every < 1:
+            raise ValueError("Decimation factor must be positive")
+        if packbits and (mean or dtype is not bool):
+            raise ValueError("Only boolean samples can be bit-packed")
+
+        self.value = value if callable(value) else operator.attrgetter(value)
+        self.dtype = dtype
+        self.every = every
+        self.mean = mean
+        self.packbits = packbits
+
+    def length(self, iterations: int) -> int:
+        return math.ceil(iterations / self.every)
+
+
+class ArrayCollector(DataCollector):
+    """
+    Collector of per-step series into buffers preallocated for the whole run.
+
+    Subclasses declare the recorded series as a class attribute:
+
+        class RewardCollector(ArrayCollector):
+            series = {"rewards": Series("infant.last_reward", dtype=np.uint8)}
+
+    and may extend after_step / to_dict, calling the base class. Series of
+    runs stopped early are truncated to the recorded steps. Bit-packed series
+    are stored with a `<name>_length` entry, see unpack_series.
+    """
+
+    series: dict[str, Series] = {}
+
+    def start(self, iterations: int):
+        self.steps = 0
+        self.buffers = {}
+        self.sums = {}
+
+        for name, series in self.series.items():
+            dtype = np.float64 if series.mean else series.dtype
+            self.buffers[name] = np.zeros(series.length(iterations), dtype=dtype)
+            if series.mean:
+                self.sums[name] = 0.0
+
+    def after_step(self):
+        step = self.steps
+        self.steps += 1
+
+        for name, series in self.series.items():
+            value = series.value(self.model)
+
+            if series.mean:
+                self.sums[name] += value
+                if self.steps % series.every == 0:
+                    self.buffers[name][step // series.every] = (
+                        self.sums[name] / series.every
+                    )
+                    self.sums[name] = 0.0
+            elif self.steps % series.every == 0:
+                self.buffers[name][step // series.every] = value
+
+        return True
+
+    def to_dict(self):
+        result = {}
+
+        for name, series in self.series.items():
+            buffer = self.buffers[name]
+            length = self.steps // series.every
+
+            # Incomplete last window
+            remainder = self.steps % series.every
+            if series.mean and remainder:
+                buffer[length] = self.sums[name] / remainder
+                length += 1
+
+            values = buffer[:length]
+            if series.mean:
+                values = values.astype(series.dtype)
+
+            if series.packbits:
+                result[name] = np.packbits(values)
+                result[f"{name}_length"] = length
+            else:
+                result[name] = values
+
+        return result
+
+
+def unpack_series(packed: np.ndarray, length: int) -> np.ndarray:
+    """
+    Boolean series from a bit-packed ArrayCollector output
+    """
+    return np.unpackbits(packed, count=length).astype(bool)
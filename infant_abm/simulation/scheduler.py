@@ -0,0 +1,149 @@
+import math
+import queue
+import time
+
+
+class RepetitionScheduler:
+    """
+    Dispatches (parameter set index, repetitions) tasks to a process pool.
+
+    Tasks go through the pool's shared task queue and idle workers pick up the
+    next one, so the load is balanced dynamically. Only a couple of tasks per
+    worker are queued at a time, which lets chunk sizes adapt to the measured
+    duration of a single repetition: chunks aim at `target_duration` seconds,
+    and shrink towards the end of the sweep, so the tail is spread across all
+    workers. The first tasks are single repetitions, to get measurements early.
+
+    A fixed `chunk_size` disables the adaptive sizing.
+    """
+
+    QUEUED_TASKS_PER_PROCESS = 2
+
+    # Weight of the newest measurement in the running mean of repetition time
+    SMOOTHING = 0.2
+
+    def __init__(self, processes: int, target_duration=10.0, chunk_size=None):
+        self.processes = processes
+        self.target_duration = target_duration
+        self.chunk_size = chunk_size
+
+        self.repetition_duration = None
+
+    def run(self, pool, task_fn, pending, on_result, total=None):
+        """
+        Run all pending repetitions, calling on_result(index, result) in the
+        main process with the result of every finished task. on_result may
+        return a list of further repetitions of the index to run, which are
+        dispatched before any new parameter set.
+
+        pending - (index, repetitions) pairs, or a dict of them. Pairs are
+            consumed lazily, only when their first task is dispatched, so
+            state is held only for the parameter sets in flight.
+        total - number of repetitions in pending, counted when not given.
+            An estimate suffices: it only shrinks chunks towards the end of
+            the sweep, and the exact count is used once pending is consumed.
+
+        task_fn((index, repetitions)) is called in the workers, its return
+        value is passed on as the result.
+        """
+        if isinstance(pending, dict):
+            pending = pending.items()
+        if total is None:
+            pending = list(pending)
+            total = sum(len(reps) for _, reps in pending)
+
+        self._sets = iter(pending)
+        self._active = {}
+        remaining = total
+
+        results = queue.Queue()
+        max_queued = self.QUEUED_TASKS_PER_PROCESS * self.processes
+        queued = 0
+
+        while True:
+            while queued < max_queued and self._pull():
+                if self._sets is None:
+                    # Exact once all sets are pulled
+                    remaining = sum(len(reps) for reps in self._active.values())
+
+                task = self._next_task(remaining)
+                remaining -= len(task[1])
+                queued += 1
+
+                pool.apply_async(
+                    _timed,
+                    (task_fn, task),
+                    callback=results.put,
+                    error_callback=results.put,
+                )
+
+            if not queued:
+                break
+
+            finished = results.get()
+            queued -= 1
+
+            if isinstance(finished, BaseException):
+                raise finished
+
+            (index, repetitions), result, elapsed = finished
+            self._record_duration(elapsed / len(repetitions))
+
+            more = on_result(index, result)
+            if more:
+                self._active.setdefault(index, []).extend(more)
+                remaining += len(more)
+
+    def _pull(self) -> bool:
+        """
+        Make sure a set with repetitions to dispatch is active, False when
+        all are dispatched
+        """
+        while not self._active and self._sets is not None:
+            entry = next(self._sets, None)
+            if entry is None:
+                self._sets = None
+            elif entry[1]:
+                index, repetitions = entry
+                self._active[index] = list(repetitions)
+
+        return bool(self._active)
+
+    def _next_task(self, remaining):
+        index = next(iter(self._active))
+        repetitions = self._active[index]
+
+        size = min(self._chunk_size(remaining), len(repetitions))
+        task = (index, repetitions[:size])
+
+        del repetitions[:size]
+        if not repetitions:
+            del self._active[index]
+
+        return task
+
+    def _chunk_size(self, remaining):
+        if self.chunk_size is not None:
+            return self.chunk_size
+
+        if self.repetition_duration is None:
+            return 1
+
+        size = max(1, round(self.target_duration / self.repetition_duration))
+
+        tail = math.ceil(remaining / (self.QUEUED_TASKS_PER_PROCESS * self.processes))
+        return min(size, max(1, tail))
+
+    def _record_duration(self, duration):
+        if self.repetition_duration is None:
+            self.repetition_duration = duration
+        else:
+            self.repetition_duration += self.SMOOTHING * (
+                duration - self.repetition_duration
+            )
+
+
+def _timed(task_fn, task):
+    start = time.perf_counter()
+    result = task_fn(task)
+    return task, result, time.perf_counter() - start
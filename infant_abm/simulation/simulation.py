@@ -1,15 +1,20 @@
+import ast
+import contextlib
+import dataclasses
+import hashlib
+import json
 import multiprocessing
 import os
 from pathlib import Path
 import uuid
+import numpy as np
 import pandas as pd
 import tqdm
 import logging
 
 from abc import ABC, abstractmethod
 
-from copy import deepcopy
-
+from infant_abm import profiling
 from infant_abm.config import Config
 from infant_abm.model import InfantModel
 from infant_abm.agents.infant import Params as InfantParams
@@ -24,7 +29,20 @@ from infant_abm.agents import (
     QLearnDetachedParent,
 )
 
-from infant_abm.db_utils import partial_exists, save_partial
+from infant_abm.db_utils import (
+    aggregate_exists,
+    load_run,
+    partial_exists,
+    save_aggregate,
+    save_partial,
+)
+from infant_abm.result_store import ResultStore
+from infant_abm.simulation.adaptive import AdaptiveRepeats
+from infant_abm.simulation.aggregation import Aggregate
+from infant_abm.simulation.checkpoint import Checkpoint
+from infant_abm.simulation.scheduler import RepetitionScheduler
+from infant_abm.simulation.surrogate import SurrogateSampler
+from infant_abm.simulation.work_queue import WorkQueue
 
 
 class Model_0_1_0:
@@ -55,6 +73,12 @@ class DataCollector(ABC):
     def __init__(self, model):
         self.model = model
 
+    def start(self, iterations: int):
+        """
+        Called once before the first step, with the number of iterations
+        """
+        pass
+
     @abstractmethod
     def after_step(self):
         pass
@@ -64,6 +88,28 @@ class DataCollector(ABC):
         pass
 
 
+DESCRIPTION_CHUNK_SIZE = 10_000
+SURROGATE_FILENAME = "surrogate.csv"
+PRECISION_DIRNAME = "precision"
+
+# Simulation run by a pool worker, set by _init_worker
+_worker_simulation = None
+
+
+def run_seed_sequence(
+    seed: int, run_name: str, index: int, repetition: int
+) -> np.random.SeedSequence:
+    """
+    Seed sequence of a single run.
+
+    Equal to spawning children of SeedSequence(seed) for the run name, the
+    parameter set index and the repetition, but computed directly, so any run
+    can be re-created without spawning the rest of the sweep.
+    """
+    run_key = int.from_bytes(hashlib.sha256(run_name.encode()).digest()[:4], "little")
+    return np.random.SeedSequence(seed, spawn_key=(run_key, index, repetition))
+
+
 class Simulation:
     def __init__(
         self,
@@ -76,23 +122,96 @@ class Simulation:
         output_dir="results",
         display=False,
         processes=None,
+        seed=None,
+        granularity="repetition",
+        task_duration=10.0,
+        storage="partials",
+        stopping=None,
+        adaptive: AdaptiveRepeats = None,
+        profile=False,
+        checkpoint_every=None,
+        resume=False,
+        sampler: SurrogateSampler = None,
+        aggregate: Aggregate = None,
     ):
+        """
+        granularity - "repetition" dispatches adaptive chunks of repetitions
+            aiming at task_duration seconds each, "set" dispatches whole
+            parameter sets
+        storage - "partials" saves a JSON file (plus array files) per parameter
+            set, "store" saves all results to a ResultStore
+        stopping - optional StoppingCriterion factory, ends converged runs
+            early and records the step as "converged_step"
+        adaptive - AdaptiveRepeats rule, replaces the fixed `repeats` with
+            batches run until the outputs are precise enough. The number of
+            repeats and the interval widths are added to the description.
+        profile - record per-action and per-event call counts and times in
+            the workers, summarized in profile.csv next to the description
+        checkpoint_every - snapshot every run in progress each this many
+            steps, and keep the results of completed runs until their
+            parameter set is saved
+        sampler - SurrogateSampler choosing which parameter sets to run, in
+            rounds, instead of running all of them. The round of every set
+            run is added to the description, the final surrogate map of all
+            sets is saved to surrogate.csv.
+        aggregate - Aggregate folding the repetitions of every parameter set
+            into cross-repeat statistics in the workers. Only the statistics,
+            see load_aggregate, and the first `keep` repetitions are saved.
+        resume - continue an interrupted run with the same run_name and
+            output_dir: saved parameter sets are skipped and the others
+            continue from their last snapshots, with identical results. The
+            seed is read from the saved description, a different seed
+            raises.
+        """
         self.model = model
         self.parameter_sets: dict = model_param_sets
         self.iterations: int = iterations
         self.repeats: int = repeats
         self.datacollector: DataCollector = datacollector
+        self.stopping = stopping
+        self.adaptive = adaptive
+        self.profile = profile
+        self.checkpoint_every = checkpoint_every
+        self.sampler = sampler
+        self.aggregate = aggregate
         self.display = display
-        self.processes = processes
+        self.processes = processes or os.cpu_count()
         self.base_dir = output_dir
 
+        if granularity not in ("repetition", "set"):
+            raise ValueError(f"Unknown granularity: {granularity}")
+        self.granularity = granularity
+        self.task_duration = task_duration
+
+        if storage not in ("partials", "store"):
+            raise ValueError(f"Unknown storage: {storage}")
+        self.storage = storage
+
+        if aggregate is not None and (
+            adaptive is not None or sampler is not None or profile
+        ):
+            raise ValueError(
+                "Aggregated runs support neither adaptive repeats, samplers "
+                "nor profiling"
+            )
+
         if run_name is None:
             run_name = str(uuid.uuid4())[:7]
         self.run_name = run_name
 
-        self._validate_output_path()
+        if not resume:
+            self._validate_output_path()
         self.output_dir = self._get_results_dir()
-        Path(self.output_dir).mkdir(parents=True, exist_ok=False)
+        if resume:
+            if not os.path.isdir(self.output_dir):
+                raise ValueError("No run to resume at the output path")
+            seed = self._resumed_seed(seed)
+
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed: int = seed
+
+        Path(self.output_dir).mkdir(parents=True, exist_ok=resume)
         self._maybe_save_description()
 
     def run(self):
@@ -102,14 +221,171 @@ class Simulation:
         if self.display:
             print(f"Runs no: {n_runs}, estimated output size: {file_size:.2f}MB")
 
-        pool = multiprocessing.Pool(processes=self.processes)
+        store = ResultStore(self.output_dir) if self.storage == "store" else None
+
+        if self.adaptive is not None:
+            repeats = self.adaptive.min_repeats
+            set_size = self.adaptive.batch_size
+        else:
+            repeats = set_size = self.repeats
 
-        for _ in tqdm.tqdm(
-            pool.imap(self._run_param_set, enumerate(self.parameter_sets), chunksize=1),
-            total=len(self.parameter_sets),
-            disable=not self.display,
+        if self.sampler is not None:
+            indices = self.sampler.start(self._load_description())
+        else:
+            indices = range(n_runs)
+
+        scheduler = RepetitionScheduler(
+            processes=self.processes,
+            target_duration=self.task_duration,
+            chunk_size=set_size if self.granularity == "set" else None,
+        )
+
+        partial_results = {}
+        accumulators = {}
+        requested = {}
+        rounds = {}
+        profiler = profiling.Profiler()
+        progress = tqdm.tqdm(total=0, disable=not self.display)
+
+        def merge_repetitions(index, result):
+            if self.aggregate is not None:
+                result, accumulator = result
+                accumulators[index].merge(accumulator)
+                progress.update(accumulator.repetitions)
+            else:
+                progress.update(len(result))
+
+            if self.profile:
+                for rep_result in result.values():
+                    profiler.merge(profiling.Profiler(rep_result.pop("_profile")))
+
+            partial = partial_results[index]
+            partial.update(result)
+
+            if self.aggregate is not None:
+                completed = accumulators[index].repetitions
+            else:
+                completed = len(partial)
+            if completed < requested[index]:
+                return None
+
+            if self.adaptive is not None:
+                results = list(partial.values())
+                more = self.adaptive.next_batch(results)
+                if more:
+                    progress.total += more
+                    progress.refresh()
+                    requested[index] += more
+                    return list(range(len(partial), len(partial) + more))
+
+                # Recorded before the results, a set saved without it reruns
+                self._save_set_precision(
+                    index, len(results), self.adaptive.precision(results)
+                )
+
+            if self.sampler is not None:
+                self.sampler.observe(index, list(partial.values()))
+
+            del partial_results[index]
+            del requested[index]
+            if self.aggregate is not None:
+                self._save_aggregate(index, partial, accumulators.pop(index), store)
+            else:
+                self._save_results(index, partial, store)
+            if self.checkpoint_every is not None:
+                Checkpoint.remove_set(self.output_dir, index)
+
+        def pending_sets(indices):
+            # Consumed by the scheduler as it dispatches, so bookkeeping is
+            # only held for the parameter sets in flight
+            for index in indices:
+                if self._is_saved(store, index):
+                    progress.total -= repeats
+                    if self.sampler is not None:
+                        saved = self._load_saved(store, index)
+                        self.sampler.observe(index, list(saved.values()))
+                    continue
+
+                partial_results[index] = {}
+                requested[index] = repeats
+                if self.aggregate is not None:
+                    accumulators[index] = self.aggregate.accumulator()
+
+                yield index, range(repeats)
+
+        # The simulation is handed to every worker once, tasks only carry the
+        # parameter set index and repetitions
+        with multiprocessing.Pool(
+            processes=self.processes, initializer=_init_worker, initargs=(self,)
+        ) as pool:
+            # Without a sampler, all parameter sets run in a single round
+            round_number = 0
+            while indices:
+                # Saved sets are subtracted as they are skipped
+                total = repeats * len(indices)
+                progress.total += total
+                progress.refresh()
+
+                scheduler.run(
+                    pool,
+                    _run_worker_task,
+                    pending_sets(indices),
+                    merge_repetitions,
+                    total=total,
+                )
+
+                if self.sampler is None:
+                    break
+
+                rounds.update({index: round_number for index in indices})
+                round_number += 1
+                indices = self.sampler.next_round()
+
+        progress.close()
+
+        if self.checkpoint_every is not None:
+            Checkpoint.remove_dir(self.output_dir)
+
+        if self.adaptive is not None:
+            self._save_precision()
+
+        if self.profile:
+            profiler.save(os.path.join(self.output_dir, profiling.PROFILE_FILENAME))
+
+        if self.sampler is not None:
+            self._save_rounds(rounds)
+            self.sampler.predict().to_csv(
+                os.path.join(self.output_dir, SURROGATE_FILENAME)
+            )
+
+    def submit(self, chunk_size=10):
+        """
+        Queue the sweep for workers of infant_abm.simulation.work_queue instead
+        of running it here. Tasks are whole parameter sets with "set"
+        granularity, otherwise chunks of chunk_size repetitions.
+        """
+        if (
+            self.adaptive is not None
+            or self.sampler is not None
+            or self.aggregate is not None
+            or self.storage != "partials"
+            or self.profile
         ):
-            pass
+            raise ValueError(
+                "Queued runs support neither adaptive repeats, samplers, "
+                "aggregation, the result store nor profiling"
+            )
+
+        if self.granularity == "set":
+            chunk_size = self.repeats
+
+        tasks = [
+            (index, list(range(first, min(first + chunk_size, self.repeats))))
+            for index in range(len(self.parameter_sets))
+            if not partial_exists(self.output_dir, index)
+            for first in range(0, self.repeats, chunk_size)
+        ]
+        WorkQueue.create(self.output_dir, self, tasks)
 
     @staticmethod
     def from_description(
@@ -119,38 +395,76 @@ class Simulation:
         repeats,
         display=False,
         processes=None,
+        storage="partials",
     ):
         csv_path = os.path.join(output_dir, "description.csv")
-        out_df = pd.read_csv(csv_path)
-
-        parameter_sets = []
-        for i, row in out_df.iterrows():
-            infant_params = InfantParams.from_array(
-                [row["perception"], row["persistence"], row["coordination"]]
-            )
-
-            config = Config(
-                row["persistence_boost_value"], row["coordination_boost_value"]
-            )
+        out_df = pd.read_csv(csv_path, index_col=0)
 
-            parameter_sets.append(
-                {
-                    "infant_params": infant_params,
-                    "config": config,
-                    "infant_class": model.infant_class,
-                    "parent_class": model.parent_class,
-                }
-            )
+        parameter_sets = [
+            Simulation._param_set_from_description(row) for _, row in out_df.iterrows()
+        ]
 
         return Simulation(
+            model=model,
             model_param_sets=parameter_sets,
             iterations=iterations,
             repeats=repeats,
             output_dir=output_dir,
             display=display,
             processes=processes,
+            seed=int(out_df["seed"].iloc[0]),
+            storage=storage,
+        )
+
+    @staticmethod
+    def replay(
+        model,
+        run_path,
+        index: int,
+        repetition: int,
+        iterations: int,
+        datacollector: DataCollector,
+        stopping=None,
+    ) -> dict:
+        """
+        Re-execute a single run of a finished sweep, reproducing its result
+        """
+        csv_path = os.path.join(run_path, "description.csv")
+        row = pd.read_csv(csv_path, index_col=0).loc[index]
+
+        run_name = os.path.basename(os.path.normpath(run_path))
+        seed_sequence = run_seed_sequence(int(row["seed"]), run_name, index, repetition)
+
+        return Simulation._run_model(
+            model,
+            Simulation._param_set_from_description(row),
+            iterations,
+            datacollector,
+            seed_sequence,
+            stopping,
+        )
+
+    @staticmethod
+    def _param_set_from_description(row) -> dict:
+        infant_params = InfantParams.from_array(
+            [row["perception"], row["persistence"], row["coordination"]]
+        )
+
+        # Descriptions of older runs lack the environment fields
+        config = Config(
+            **{
+                field.name: field.type(row[field.name])
+                for field in dataclasses.fields(Config)
+                if field.name in row
+            }
         )
 
+        param_set = {"infant_params": infant_params, "config": config}
+        if "infant_kwargs" in row:
+            param_set["infant_kwargs"] = ast.literal_eval(row["infant_kwargs"])
+
+        return param_set
+
     def _validate_output_path(self):
         if not os.path.exists(self.base_dir) or not os.path.isdir(self.base_dir):
             raise ValueError("Output path must point to an existing directory")
@@ -169,54 +483,259 @@ class Simulation:
             logging.info("Skipping description, file exists")
             return
 
-        parameter_sets = []
+        # Written in chunks, so large sweeps are never held in memory at once
+        n_sets = len(self.parameter_sets)
+        columns = None
+
+        with open(desc_path, "w", newline="") as file:
+            for start in range(0, n_sets, DESCRIPTION_CHUNK_SIZE):
+                stop = min(start + DESCRIPTION_CHUNK_SIZE, n_sets)
+                rows = [
+                    self._description_row(self.parameter_sets[index])
+                    for index in range(start, stop)
+                ]
+                if columns is None:
+                    columns = list(rows[0])
+
+                chunk_df = pd.DataFrame(rows, index=range(start, stop), columns=columns)
+                chunk_df.to_csv(file, header=start == 0)
+
+    def _description_row(self, param_set) -> dict:
+        rest = {
+            key: value
+            for key, value in param_set.items()
+            if key not in ("infant_params", "config")
+        }
 
-        for d in self.parameter_sets:
-            d = deepcopy(d)
-            infant_params = d.pop("infant_params")
-            config = d.pop("config", Config())
+        return {
+            **param_set["infant_params"].to_dict(),
+            **param_set.get("config", Config()).to_dict(),
+            **rest,
+            "seed": self.seed,
+        }
 
-            parameter_sets.append({**infant_params.to_dict(), **config.to_dict(), **d})
+    def _run_repetitions(self, task):
+        index, repetitions = task
+        param_set = self.parameter_sets[index]
 
-        columns = parameter_sets[0].keys()
+        if self.aggregate is None:
+            return {
+                str(repetition): self._single_run_param_set(
+                    param_set, index, repetition
+                )
+                for repetition in repetitions
+            }
 
-        data = [s.values() for s in parameter_sets]
-        out_df = pd.DataFrame(data, columns=columns)
-        out_df.to_csv(desc_path)
+        # Only the kept repetitions and the statistics leave the worker
+        accumulator = self.aggregate.accumulator()
+        kept = {}
+        for repetition in repetitions:
+            result = self._single_run_param_set(param_set, index, repetition)
+            accumulator.add(result)
+            if repetition < self.aggregate.keep:
+                kept[str(repetition)] = result
 
-    def _run_param_set(self, param_set):
-        index, param_set = param_set
+        return kept, accumulator
 
-        if partial_exists(self.output_dir, index):
-            return
+    def _is_saved(self, store, index):
+        if self.aggregate is not None:
+            return aggregate_exists(self.output_dir, index)
+
+        return self._is_partial_saved(store, index)
+
+    def _is_partial_saved(self, store, index):
+        if store is not None:
+            return store.contains(index)
+
+        return partial_exists(self.output_dir, index)
+
+    def _save_results(self, index, partial, store=None):
+        ordered = {str(rep): partial[str(rep)] for rep in range(len(partial))}
+
+        if store is not None:
+            store.write(index, ordered)
+        else:
+            save_partial(self.output_dir, index, ordered)
 
-        result = dict()
+    def _save_aggregate(self, index, kept, accumulator, store=None):
+        # The kept repetitions of an interrupted run may already be saved
+        if kept and not self._is_partial_saved(store, index):
+            self._save_results(index, kept, store)
 
-        for repetition in range(self.repeats):
-            result[str(repetition)] = self._single_run_param_set(
-                param_set, index, repetition
+        save_aggregate(self.output_dir, index, self.aggregate.to_dict(accumulator))
+
+    def _resumed_seed(self, seed):
+        # The seed the interrupted run saved with its description, if any
+        desc_path = os.path.join(self.output_dir, "description.csv")
+        if not os.path.exists(desc_path):
+            return seed
+
+        saved = pd.read_csv(desc_path, usecols=["seed"], nrows=1, dtype=str)
+        saved_seed = int(saved["seed"].iloc[0])
+        if seed is not None and seed != saved_seed:
+            raise ValueError(
+                f"Seed {seed} differs from the seed {saved_seed} of the run to resume"
             )
 
-        save_partial(self.output_dir, index, result)
+        return saved_seed
+
+    def _load_description(self) -> pd.DataFrame:
+        desc_path = os.path.join(self.output_dir, "description.csv")
+        return pd.read_csv(desc_path, index_col=0)
+
+    def _load_saved(self, store, index) -> dict:
+        if store is not None:
+            return store.read_partial(index)
+
+        _, load_partial = load_run(self.output_dir)
+        return load_partial(index)
+
+    def _save_rounds(self, rounds):
+        desc_path = os.path.join(self.output_dir, "description.csv")
+        out_df = pd.read_csv(desc_path, index_col=0)
+
+        for index, round_number in rounds.items():
+            out_df.loc[index, "round"] = round_number
+
+        out_df.to_csv(desc_path)
+
+    def _save_set_precision(self, index, repeats, widths):
+        precision_dir = os.path.join(self.output_dir, PRECISION_DIRNAME)
+        os.makedirs(precision_dir, exist_ok=True)
+
+        precision_path = os.path.join(precision_dir, f"{index}.json")
+        tmp_path = f"{precision_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"repeats": repeats, **widths}, file)
+        os.replace(tmp_path, precision_path)
+
+    def _save_precision(self):
+        """
+        Add the repeats and interval widths of all saved sets, including those
+        of interrupted earlier runs, to the description
+        """
+        desc_path = os.path.join(self.output_dir, "description.csv")
+        out_df = pd.read_csv(desc_path, index_col=0)
+        precision_dir = os.path.join(self.output_dir, PRECISION_DIRNAME)
+        if not os.path.isdir(precision_dir):
+            return
+
+        for name in os.listdir(precision_dir):
+            if not name.endswith(".json"):
+                continue
+
+            with open(os.path.join(precision_dir, name)) as file:
+                widths = json.load(file)
+
+            index = int(name.removesuffix(".json"))
+            out_df.loc[index, "repeats"] = widths.pop("repeats")
+            for output, width in widths.items():
+                out_df.loc[index, f"{output}_ci_width"] = width
+
+        out_df.to_csv(desc_path)
+
+    def __getstate__(self):
+        # Workers only run single repetitions
+        state = self.__dict__.copy()
+        state["adaptive"] = None
+        state["sampler"] = None
+        return state
 
     def _single_run_param_set(self, param_set, index, repetition):
-        model = InfantModel(
-            infant_class=self.model.infant_class,
-            parent_class=self.model.parent_class,
-            **param_set,
-        )
+        checkpoint = None
+        if self.checkpoint_every is not None:
+            checkpoint = Checkpoint(
+                self.output_dir, index, repetition, self.checkpoint_every
+            )
+            result = checkpoint.load_result()
+            if result is not None:
+                return result
+
+        seed_sequence = run_seed_sequence(self.seed, self.run_name, index, repetition)
+
+        profile = profiling.profile() if self.profile else contextlib.nullcontext()
+        with profile as profiler:
+            result = self._run_model(
+                self.model,
+                param_set,
+                self.iterations,
+                self.datacollector,
+                seed_sequence,
+                self.stopping,
+                checkpoint,
+            )
+
+        if profiler is not None:
+            result["_profile"] = profiler.stats
+
+        result = {"index": index, "repetition": repetition, **result}
+        if checkpoint is not None:
+            checkpoint.save_result(result)
+
+        return result
+
+    @staticmethod
+    def _run_model(
+        model_class,
+        param_set,
+        iterations,
+        datacollector,
+        seed_sequence,
+        stopping=None,
+        checkpoint: Checkpoint = None,
+    ):
+        state = checkpoint.load_state() if checkpoint is not None else None
+
+        if state is None:
+            model = InfantModel(
+                infant_class=model_class.infant_class,
+                parent_class=model_class.parent_class,
+                rng=seed_sequence,
+                headless=True,
+                **param_set,
+            )
+
+            collector = datacollector(model)
+            collector.start(iterations)
+
+            criterion = stopping(model) if stopping is not None else None
+            first_step = 0
+        else:
+            model = state["model"]
+            collector = state["collector"]
+            criterion = state["criterion"]
+            first_step = state["step"]
 
-        collector = self.datacollector(model)
+        converged_step = None
 
-        for _ in range(self.iterations):
+        for step in range(first_step, iterations):
             model.step()
 
             if not collector.after_step():
                 break
 
-        return {
-            "iterations": self.iterations,
-            "index": index,
-            "repetition": repetition,
-            **collector.to_dict(),
+            if criterion is not None and criterion.converged():
+                converged_step = step + 1
+                break
+
+            if checkpoint is not None and checkpoint.due(step + 1, iterations):
+                checkpoint.save_state(step + 1, model, collector, criterion)
+
+        result = {
+            "iterations": iterations,
+            "seed": seed_sequence.entropy,
+            "spawn_key": list(seed_sequence.spawn_key),
         }
+        if stopping is not None:
+            result["converged_step"] = converged_step
+
+        return {**result, **collector.to_dict()}
+
+
+def _init_worker(simulation):
+    global _worker_simulation
+    _worker_simulation = simulation
+
+
+def _run_worker_task(task):
+    return _worker_simulation._run_repetitions(task)
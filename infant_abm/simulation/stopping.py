@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class StoppingCriterion(ABC):
+    """
+    Ends a run early once it has converged.
+
+    Passed to Simulation like a DataCollector, as a callable creating the
+    criterion for a model, e.g. functools.partial(QTableConvergence, window=500).
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    @abstractmethod
+    def converged(self) -> bool:
+        """
+        Called after every step
+        """
+        pass
+
+
+class QTableConvergence(StoppingCriterion):
+    """
+    Converged when no Q-table entry of the infant changed by more than
+    `tolerance` over the last `window` steps
+    """
+
+    def __init__(self, model, window=1000, tolerance=1e-3):
+        super().__init__(model)
+        self.window = window
+        self.tolerance = tolerance
+
+        self.q_table = model.infant.q_learning_agent.q_table
+        self.snapshot = self.q_table.copy()
+        self.steps = 0
+
+    def converged(self):
+        self.steps += 1
+        if self.steps % self.window:
+            return False
+
+        change = np.abs(self.q_table - self.snapshot).max()
+        self.snapshot[:] = self.q_table
+
+        return change <= self.tolerance
+
+
+class GreedyPolicyConvergence(StoppingCriterion):
+    """
+    Converged when the greedy action of the infant did not change in any
+    state for `window` steps
+    """
+
+    def __init__(self, model, window=1000):
+        super().__init__(model)
+        self.window = window
+
+        self.q_table = model.infant.q_learning_agent.q_table
+        self.policy = self.q_table.argmax(axis=1)
+        self.stable_steps = 0
+
+    def converged(self):
+        policy = self.q_table.argmax(axis=1)
+
+        if np.array_equal(policy, self.policy):
+            self.stable_steps += 1
+        else:
+            self.policy = policy
+            self.stable_steps = 0
+
+        return self.stable_steps >= self.window
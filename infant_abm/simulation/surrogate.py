@@ -0,0 +1,233 @@
+import ast
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+from infant_abm.simulation.adaptive import output_getter
+from infant_abm.simulation.sweep import CONFIG_FIELDS, INFANT_PARAMS
+
+PARAMETER_COLUMNS = INFANT_PARAMS + CONFIG_FIELDS
+
+
+class SurrogateSampler:
+    """
+    Surrogate-guided choice of the parameter sets of a sweep to run.
+
+    The parameter sets of the simulation are candidates, e.g. a dense grid.
+    A space-filling design of `initial_points` candidates runs first, then
+    every round a Gaussian process is fitted to the mean output of the sets
+    run so far, and the `batch_size` candidates with the highest score run
+    next. The score is the posterior standard deviation, scaled up by
+    1 + gradient_weight * the slope of the posterior mean relative to its
+    maximum, so uncertain regions are explored and steep transitions refined.
+    Within a round, every chosen candidate is added to the fit with its
+    predicted value, which lowers the uncertainty around it and spreads the
+    batch.
+
+    Sampling stops after `max_points` sets, counting those whose output was
+    None in every repetition, or once the largest posterior standard
+    deviation over all candidates is below `target_std`.
+
+    output - collector output key, or a callable computing a value from a
+        single run's result. Arrays are reduced to their mean.
+    features - description columns spanning the space, by default the
+        numeric columns (infant_kwargs included) that vary between candidates
+    """
+
+    def __init__(
+        self,
+        output,
+        initial_points=16,
+        batch_size=8,
+        max_points=200,
+        target_std=None,
+        gradient_weight=1.0,
+        features=None,
+        seed=0,
+    ):
+        self.statistic = output if callable(output) else output_getter(output)
+        self.initial_points = initial_points
+        self.batch_size = batch_size
+        self.max_points = max_points
+        self.target_std = target_std
+        self.gradient_weight = gradient_weight
+        self.features = features
+        self.seed = seed
+
+        self.candidates: pd.Index = None
+        self.X: np.ndarray = None
+        self.observed: dict[int, float] = {}
+        # Sets run, also those without a value, e.g. all repetitions None
+        self.attempted: set[int] = set()
+        self.gp: GaussianProcessRegressor = None
+
+    def start(self, description: pd.DataFrame) -> list[int]:
+        """
+        Set up the candidates from the run description, returns the indices
+        of the initial design
+        """
+        frame = _feature_frame(description, self.features)
+        self.features = list(frame.columns)
+        self.candidates = frame.index
+
+        X = frame.to_numpy(dtype=np.float64)
+        low, high = X.min(axis=0), X.max(axis=0)
+        self.X = (X - low) / np.where(high > low, high - low, 1.0)
+
+        n = min(self.initial_points, self.max_points, len(self.X))
+        return [int(self.candidates[i]) for i in self._farthest_points(n)]
+
+    def observe(self, index: int, results: list[dict]):
+        self.attempted.add(index)
+        values = [self.statistic(result) for result in results]
+        values = [v for v in values if v is not None]
+        if values:
+            self.observed[index] = float(np.mean(values))
+
+    def next_round(self) -> list[int]:
+        """
+        Indices of the parameter sets to run next, empty when done
+        """
+        remaining = self.max_points - len(self.attempted)
+        if remaining <= 0 or len(self.attempted) == len(self.candidates):
+            return []
+        # Nothing to fit the surrogate to
+        if not self.observed:
+            return []
+
+        mean, std = self._fit_predict()
+        if self.target_std is not None and std.max() < self.target_std:
+            return []
+
+        slope = self._slope(mean)
+        weight = 1 + self.gradient_weight * slope / _positive_max(slope)
+
+        available = np.ones(len(self.X), dtype=bool)
+        available[self.candidates.get_indexer(list(self.attempted))] = False
+
+        # Kriging believer: every chosen candidate is added to the fit with
+        # its predicted mean, which shrinks the uncertainty around it
+        X_fit, y_fit = self._training_data()
+        gp = self.gp
+        chosen = []
+        for _ in range(min(self.batch_size, remaining)):
+            if not available.any():
+                break
+
+            score = np.where(available, std * weight, -np.inf)
+            best = int(np.argmax(score))
+            chosen.append(best)
+            available[best] = False
+
+            X_fit = np.vstack([X_fit, self.X[best]])
+            y_fit = np.append(y_fit, mean[best])
+            gp = GaussianProcessRegressor(
+                kernel=self.gp.kernel_, optimizer=None, normalize_y=True
+            ).fit(X_fit, y_fit)
+            std = _latent_std(gp, self.X, y_fit)
+
+        return [int(self.candidates[i]) for i in chosen]
+
+    def predict(self) -> pd.DataFrame:
+        """
+        Surrogate mean and standard deviation at every candidate, with the
+        observed value of the sets that ran
+        """
+        mean, std = self._fit_predict()
+        observed = pd.Series(self.observed, dtype=np.float64)
+
+        return pd.DataFrame(
+            {"mean": mean, "std": std, "observed": observed.reindex(self.candidates)},
+            index=self.candidates,
+        )
+
+    def _fit_predict(self):
+        kernel = ConstantKernel() * Matern(
+            length_scale=np.full(self.X.shape[1], 0.3),
+            length_scale_bounds=(1e-2, 1e2),
+            nu=2.5,
+        ) + WhiteKernel(noise_level=1e-2, noise_level_bounds=(1e-8, 1e1))
+        self.gp = GaussianProcessRegressor(
+            kernel=kernel,
+            normalize_y=True,
+            n_restarts_optimizer=2,
+            random_state=self.seed,
+        )
+
+        X_train, y_train = self._training_data()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            self.gp.fit(X_train, y_train)
+
+        return self.gp.predict(self.X), _latent_std(self.gp, self.X, y_train)
+
+    def _training_data(self):
+        positions = self.candidates.get_indexer(list(self.observed))
+        return self.X[positions], np.array(list(self.observed.values()))
+
+    def _slope(self, mean, step=0.01):
+        """
+        Norm of the finite-difference gradient of the posterior mean
+        """
+        squares = np.zeros(len(self.X))
+        for feature in range(self.X.shape[1]):
+            shifted = self.X.copy()
+            shifted[:, feature] += step
+            squares += ((self.gp.predict(shifted) - mean) / step) ** 2
+
+        return np.sqrt(squares)
+
+    def _farthest_points(self, n):
+        generator = np.random.default_rng(self.seed)
+        chosen = [int(generator.integers(len(self.X)))]
+        distances = np.linalg.norm(self.X - self.X[chosen[0]], axis=1)
+
+        while len(chosen) < n:
+            farthest = int(np.argmax(distances))
+            chosen.append(farthest)
+            distances = np.minimum(
+                distances, np.linalg.norm(self.X - self.X[farthest], axis=1)
+            )
+
+        return chosen
+
+
+def _feature_frame(description: pd.DataFrame, features=None) -> pd.DataFrame:
+    # Parameters only, not the seed or columns added by earlier runs
+    frame = description[[c for c in description if c in PARAMETER_COLUMNS]]
+
+    if "infant_kwargs" in description:
+        kwargs = description["infant_kwargs"].map(ast.literal_eval)
+        frame = frame.join(pd.DataFrame(list(kwargs), index=frame.index))
+
+    if features is not None:
+        return frame[list(features)]
+
+    numeric = frame.select_dtypes(include="number")
+    return numeric.loc[:, numeric.nunique() > 1]
+
+
+def _latent_std(gp, X, y_train):
+    """
+    Posterior standard deviation of the mean output, without the noise of
+    single observations
+    """
+    _, std = gp.predict(X, return_std=True)
+
+    # The noise level is fitted to the targets normalized by their standard
+    # deviation, which normalize_y takes as 1 when they are constant
+    scale = np.std(y_train)
+    if scale < 10 * np.finfo(np.float64).eps:
+        scale = 1.0
+
+    noise = gp.kernel_.k2.noise_level * scale**2
+    return np.sqrt(np.maximum(std**2 - noise, 0.0))
+
+
+def _positive_max(values):
+    top = values.max()
+    return top if top > 0 else 1.0
@@ -0,0 +1,194 @@
+import dataclasses
+import math
+from abc import abstractmethod
+from collections.abc import Sequence
+
+import numpy as np
+
+from infant_abm.agents.infant import Params as InfantParams
+from infant_abm.config import Config
+
+INFANT_PARAMS = tuple(field.name for field in dataclasses.fields(InfantParams))
+CONFIG_FIELDS = tuple(field.name for field in dataclasses.fields(Config))
+
+
+class Sweep(Sequence):
+    """
+    Lazy sequence of parameter sets, computed from their index on access.
+
+    Points of the sweep are dicts of parameter values. Infant parameters
+    (perception, persistence, coordination) build the InfantParams, Config
+    fields the Config, and any other names go to infant_kwargs. A tuple of
+    names is a single axis setting several parameters: its values are tuples,
+    or scalars assigned to all of them. `base` holds the values of parameters
+    that do not vary.
+
+    A Simulation takes a sweep in place of the list of parameter sets, and
+    only ever materializes the set a worker runs.
+
+        Sweep.product(
+            {
+                "perception": np.linspace(0.2, 0.8, 4),
+                ("alpha", "gamma", "epsilon"): [(0.1, 0.9, 0.1), (0.05, 0.7, 0.01)],
+            },
+            base={"persistence": 0.5, "coordination": 0.5},
+        )
+    """
+
+    def __init__(self, base=None):
+        self.base = dict(base or {})
+
+    @abstractmethod
+    def point(self, index: int) -> dict:
+        """
+        Parameter values of the point at a valid non-negative index
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Sweep index out of range")
+
+        return param_set({**self.base, **self.point(index)})
+
+    @staticmethod
+    def product(axes: dict, base=None) -> "ProductSweep":
+        return ProductSweep(axes, base)
+
+    @staticmethod
+    def latin_hypercube(
+        ranges: dict, n: int, seed=0, base=None
+    ) -> "LatinHypercubeSweep":
+        return LatinHypercubeSweep(ranges, n, seed, base)
+
+    @staticmethod
+    def explicit(points: list[dict], base=None) -> "ExplicitSweep":
+        return ExplicitSweep(points, base)
+
+
+class ProductSweep(Sweep):
+    """
+    Cartesian product of the axes, in itertools.product order: the last axis
+    varies fastest
+    """
+
+    def __init__(self, axes: dict, base=None):
+        super().__init__(base)
+        self.axes = {name: list(values) for name, values in axes.items()}
+
+        # Innermost axis first, for decoding indices
+        self._decoding = [(name, v, len(v)) for name, v in self.axes.items()]
+        self._decoding.reverse()
+
+    def __len__(self):
+        return math.prod(len(values) for values in self.axes.values())
+
+    def point(self, index):
+        point = {}
+        for name, values, size in self._decoding:
+            index, position = divmod(index, size)
+            _assign(point, name, values[position])
+
+        return point
+
+
+class LatinHypercubeSweep(Sweep):
+    """
+    n points of a Latin hypercube over the (low, high) ranges: every axis is
+    split into n equal intervals and every interval holds exactly one point.
+    The points are reproducible from the seed. Only one permutation per axis
+    is stored, the position of a point within its intervals is drawn from its
+    own seed on access.
+    """
+
+    def __init__(self, ranges: dict, n: int, seed=0, base=None):
+        super().__init__(base)
+        self.ranges = dict(ranges)
+        self.n = n
+        self.seed = seed
+
+        generator = np.random.default_rng(seed)
+        dtype = np.min_scalar_type(max(n - 1, 0))
+        self._intervals = [generator.permutation(n).astype(dtype) for _ in self.ranges]
+
+    def __len__(self):
+        return self.n
+
+    def point(self, index):
+        offsets = np.random.default_rng([self.seed, index]).random(len(self.ranges))
+
+        point = {}
+        for (name, (low, high)), intervals, offset in zip(
+            self.ranges.items(), self._intervals, offsets
+        ):
+            fraction = (int(intervals[index]) + offset) / self.n
+            _assign(point, name, low + fraction * (high - low))
+
+        return point
+
+
+class ExplicitSweep(Sweep):
+    """
+    Listed points
+    """
+
+    def __init__(self, points: list[dict], base=None):
+        super().__init__(base)
+        self.points = list(points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def point(self, index):
+        point = {}
+        for name, value in self.points[index].items():
+            _assign(point, name, value)
+
+        return point
+
+
+def param_set(values: dict) -> dict:
+    """
+    Parameter set of a Simulation from a flat dict of parameter values
+    """
+    missing = [name for name in INFANT_PARAMS if name not in values]
+    if missing:
+        raise ValueError(f"Missing infant parameters: {missing}")
+
+    infant_params = InfantParams.from_array([values[name] for name in INFANT_PARAMS])
+    config = Config(**{k: v for k, v in values.items() if k in CONFIG_FIELDS})
+    infant_kwargs = {
+        k: v
+        for k, v in values.items()
+        if k not in INFANT_PARAMS and k not in CONFIG_FIELDS
+    }
+
+    result = {"infant_params": infant_params, "config": config}
+    if infant_kwargs:
+        result["infant_kwargs"] = infant_kwargs
+
+    return result
+
+
+def _assign(point, name, value):
+    if not isinstance(name, tuple):
+        point[name] = _python_scalar(value)
+        return
+
+    values = value if isinstance(value, (tuple, list)) else [value] * len(name)
+    for single_name, single_value in zip(name, values):
+        point[single_name] = _python_scalar(single_value)
+
+
+def _python_scalar(value):
+    # NumPy scalars would show up as np.float64(...) in descriptions
+    return value.item() if isinstance(value, np.generic) else value
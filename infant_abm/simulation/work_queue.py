@@ -0,0 +1,380 @@
+"""
+Work queue
+=============================================================
+Runs a sweep with independent worker processes, on any number of hosts
+sharing the run directory.
+
+Simulation.submit() pickles the simulation and writes the task list, chunks
+of repetitions of parameter sets, to <run>/queue. Every worker then claims
+tasks through lease files, created atomically with O_EXCL and refreshed by a
+heartbeat while the task runs. A lease not refreshed for `lease_timeout`
+seconds belongs to a crashed worker and is taken over by the next worker
+looking for work. The results of every task are written next to the leases,
+and the worker completing the last task of a parameter set saves its partial
+in the run directory, as Simulation.run does.
+
+Every repetition has its own seed, so results do not depend on which worker
+runs a task; in the rare case of a lease taken over from a worker that was
+only slow, the task runs twice with identical results.
+
+    simulation.submit()
+
+and on every host, once per core:
+
+    python -m infant_abm.simulation.work_queue RUN_PATH
+
+Shards split the tasks deterministically, e.g. between the jobs of a cluster
+job array: worker --shard K --num-shards N only runs tasks whose number is
+K modulo N.
+
+The collector and stopping classes of the simulation have to be importable by
+the workers, e.g. defined at the top level of a module.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import socket
+import threading
+import time
+
+from infant_abm.db_utils import partial_exists
+from infant_abm.simulation.checkpoint import Checkpoint
+
+QUEUE_DIRNAME = "queue"
+SIMULATION_FILENAME = "simulation.pkl"
+TASKS_FILENAME = "tasks.json"
+
+
+class WorkQueue:
+    """
+    Lease-based queue of the tasks of a submitted run. Tasks are identified by
+    their position in the task list, a task is done once its results are
+    written or its parameter set is saved.
+    """
+
+    def __init__(self, run_path, lease_timeout=60.0, worker_id=None, heartbeat=None):
+        self.run_path = run_path
+        self.dir = os.path.join(run_path, QUEUE_DIRNAME)
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat or lease_timeout / 6
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+        with open(os.path.join(self.dir, TASKS_FILENAME)) as f:
+            self.tasks = [(index, repetitions) for index, repetitions in json.load(f)]
+
+        self.set_tasks = {}
+        for task_id, (index, _) in enumerate(self.tasks):
+            self.set_tasks.setdefault(index, []).append(task_id)
+
+    @staticmethod
+    def create(run_path, simulation, tasks: list[tuple[int, list[int]]]):
+        queue_dir = os.path.join(run_path, QUEUE_DIRNAME)
+        os.makedirs(queue_dir, exist_ok=True)
+
+        _atomic_write(
+            os.path.join(queue_dir, SIMULATION_FILENAME), pickle.dumps(simulation)
+        )
+        _atomic_write(
+            os.path.join(queue_dir, TASKS_FILENAME), json.dumps(tasks).encode()
+        )
+
+    @staticmethod
+    def load_simulation(run_path):
+        with open(
+            os.path.join(run_path, QUEUE_DIRNAME, SIMULATION_FILENAME), "rb"
+        ) as f:
+            simulation = pickle.load(f)
+
+        # The run directory may be mounted elsewhere on this host
+        simulation.output_dir = run_path
+        return simulation
+
+    def claim(self, task_ids: list[int]) -> int:
+        """
+        Lease the first task of task_ids that is neither done nor leased by a
+        live worker, None if there is none. Tasks found done are removed from
+        task_ids, so they are not checked again.
+        """
+        done = set()
+        claimed = None
+
+        for task_id in task_ids:
+            if self.is_done(task_id):
+                done.add(task_id)
+                continue
+
+            lease_path = self.lease_path(task_id)
+            if not self._acquire(lease_path):
+                continue
+
+            # Completed between the check and the lease
+            if self.is_done(task_id):
+                self.release(task_id)
+                done.add(task_id)
+                continue
+
+            claimed = task_id
+            break
+
+        if done:
+            task_ids[:] = [t for t in task_ids if t not in done]
+        return claimed
+
+    def release(self, task_id):
+        self._release(self.lease_path(task_id))
+
+    def complete(self, task_id, result: dict):
+        _atomic_write(self.result_path(task_id), pickle.dumps(result))
+        self.release(task_id)
+
+    def is_done(self, task_id) -> bool:
+        index, _ = self.tasks[task_id]
+        return os.path.exists(self.result_path(task_id)) or partial_exists(
+            self.run_path, index
+        )
+
+    def is_set_finished(self, index) -> bool:
+        """
+        Whether all tasks of the parameter set are completed but its partial
+        is not saved
+        """
+        return not partial_exists(self.run_path, index) and all(
+            os.path.exists(self.result_path(t)) for t in self.set_tasks[index]
+        )
+
+    def save_set(self, simulation, index) -> bool:
+        """
+        Merge the task results of a finished parameter set into its partial.
+        Returns False if another worker is saving it.
+        """
+        lock_path = os.path.join(self.dir, f"set-{index}.lease")
+        if not self._acquire(lock_path):
+            return False
+
+        try:
+            # Kept alive like task leases, a live saver is never taken over
+            with _Heartbeat(lock_path, self.heartbeat_interval):
+                self._save_set(simulation, index)
+        finally:
+            self._release(lock_path)
+
+        return True
+
+    def _save_set(self, simulation, index):
+        if partial_exists(self.run_path, index):
+            return
+
+        partial = {}
+        for task_id in self.set_tasks[index]:
+            with open(self.result_path(task_id), "rb") as f:
+                partial.update(pickle.load(f))
+
+        simulation._save_results(index, partial)
+        Checkpoint.remove_set(self.run_path, index)
+
+        for task_id in self.set_tasks[index]:
+            os.remove(self.result_path(task_id))
+
+    def lease_path(self, task_id):
+        return os.path.join(self.dir, f"task-{task_id}.lease")
+
+    def result_path(self, task_id):
+        return os.path.join(self.dir, f"task-{task_id}.result.pkl")
+
+    def heartbeat(self, task_id, interval=None):
+        return _Heartbeat(self.lease_path(task_id), interval or self.heartbeat_interval)
+
+    def _acquire(self, lease_path) -> bool:
+        if self._create_lease(lease_path):
+            return True
+
+        try:
+            expired = os.stat(lease_path)
+        except FileNotFoundError:
+            return False
+        if time.time() - expired.st_mtime <= self.lease_timeout:
+            return False
+
+        # Only one of the workers finding the expired lease renames it
+        stale_path = f"{lease_path}.{self.worker_id}.expired"
+        try:
+            os.rename(lease_path, stale_path)
+        except FileNotFoundError:
+            return False
+
+        # Another worker may have taken the lease over between the check and
+        # the rename, then the renamed lease is its new one and is put back
+        renamed = os.stat(stale_path)
+        if (renamed.st_ino, renamed.st_mtime_ns) != (
+            expired.st_ino,
+            expired.st_mtime_ns,
+        ):
+            try:
+                os.link(stale_path, lease_path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+
+        os.remove(stale_path)
+        return self._create_lease(lease_path)
+
+    def _create_lease(self, lease_path) -> bool:
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+
+        with os.fdopen(fd, "w") as f:
+            f.write(self.worker_id)
+        return True
+
+    def _release(self, lease_path):
+        """
+        Remove a lease, unless another worker took it over after it expired
+        """
+        try:
+            with open(lease_path) as f:
+                owner = f.read()
+        except FileNotFoundError:
+            return
+
+        if owner == self.worker_id:
+            try:
+                os.remove(lease_path)
+            except FileNotFoundError:
+                pass
+
+
+class _Heartbeat:
+    """
+    Refreshes the modification time of a lease file from a background thread
+    """
+
+    def __init__(self, lease_path, interval):
+        self.lease_path = lease_path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            try:
+                os.utime(self.lease_path)
+            except FileNotFoundError:
+                pass
+
+
+def run_worker(
+    run_path,
+    shard=0,
+    num_shards=1,
+    lease_timeout=60.0,
+    heartbeat=10.0,
+    poll_interval=1.0,
+    worker_id=None,
+) -> int:
+    """
+    Run tasks of a submitted run until all tasks of the shard are done, and
+    save the parameter sets they finish. Returns the number of tasks run.
+
+    While the remaining tasks are leased by other workers, or finished sets
+    are locked by another saver, the worker waits, taking over the tasks and
+    sets of workers whose leases expire.
+    """
+    if not 0 <= shard < num_shards:
+        raise ValueError("Shard must satisfy 0 <= shard < num_shards")
+    if heartbeat >= lease_timeout:
+        raise ValueError("Heartbeat interval must be shorter than the lease timeout")
+
+    simulation = WorkQueue.load_simulation(run_path)
+    work_queue = WorkQueue(run_path, lease_timeout, worker_id, heartbeat)
+
+    remaining = [
+        task_id
+        for task_id in range(len(work_queue.tasks))
+        if task_id % num_shards == shard
+    ]
+    # Sets of the shard not known to be saved, finished sets among them are
+    # saved while waiting, e.g. those of workers that crashed while saving
+    unsaved = {work_queue.tasks[task_id][0] for task_id in remaining}
+    tasks_run = 0
+
+    while True:
+        task_id = work_queue.claim(remaining) if remaining else None
+
+        if task_id is None:
+            # Finished sets locked by another saver, which may have crashed,
+            # are waited for until they are saved or their lock expires
+            locked = False
+            for index in list(unsaved):
+                if work_queue.is_set_finished(index):
+                    locked |= not work_queue.save_set(simulation, index)
+                if partial_exists(run_path, index):
+                    unsaved.discard(index)
+
+            if not remaining and not locked:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        with work_queue.heartbeat(task_id):
+            result = simulation._run_repetitions(work_queue.tasks[task_id])
+        work_queue.complete(task_id, result)
+        tasks_run += 1
+
+        remaining.remove(task_id)
+        index, _ = work_queue.tasks[task_id]
+        if work_queue.is_set_finished(index):
+            work_queue.save_set(simulation, index)
+
+    return tasks_run
+
+
+def _atomic_write(path, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("run_path", help="Directory of a submitted run")
+    parser.add_argument("--shard", type=int, default=0)
+    parser.add_argument("--num-shards", type=int, default=1)
+    parser.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=60.0,
+        help="Seconds without heartbeat after which a task is taken over",
+    )
+    parser.add_argument(
+        "--heartbeat", type=float, default=10.0, help="Seconds between heartbeats"
+    )
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    tasks_run = run_worker(
+        args.run_path,
+        shard=args.shard,
+        num_shards=args.num_shards,
+        lease_timeout=args.lease_timeout,
+        heartbeat=args.heartbeat,
+        poll_interval=args.poll_interval,
+    )
+    print(f"Ran {tasks_run} task(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class ToyChoice:
+    """
+    Random choice of a model's toys weighted by their interaction counts,
+    with weights (count + OFFSET) ** exponent.
+
+    The weights of every exponent in use are kept in a sum tree, updated as
+    toys are interacted with, so a choice costs a single uniform variate and
+    O(log n_toys) steps instead of a pass over all toys.
+    """
+
+    OFFSET = 1e-5
+
+    def __init__(self, counts: np.ndarray):
+        # Shared with the model, updated through interact
+        self.counts = counts
+        self._trees = {}
+
+    def interact(self, index: int):
+        self.counts[index] += 1
+
+        count = int(self.counts[index])
+        for tree in self._trees.values():
+            tree.update(index, count)
+
+    def choose(self, exponent: float, rng) -> int:
+        """
+        Index of a random toy, drawn with one rng.random()
+        """
+        tree = self._trees.get(exponent)
+        if tree is None:
+            tree = self._trees[exponent] = _SumTree(self.counts, exponent)
+
+        return tree.find(rng.random() * tree.total())
+
+
+class _SumTree:
+    """
+    Binary tree over the weights of the toys, every node holding the sum of
+    its two children. Leaves start at `size`, padded with zero weights.
+    """
+
+    def __init__(self, counts, exponent):
+        self.exponent = exponent
+        self.n = len(counts)
+        self.size = 1 << max(self.n - 1, 0).bit_length()
+
+        weights = np.power(counts + ToyChoice.OFFSET, exponent)
+        self.nodes = [0.0] * (2 * self.size)
+        self.nodes[self.size : self.size + self.n] = weights.tolist()
+        for node in range(self.size - 1, 0, -1):
+            self.nodes[node] = self.nodes[2 * node] + self.nodes[2 * node + 1]
+
+    def total(self) -> float:
+        return self.nodes[1]
+
+    def update(self, index, count):
+        nodes = self.nodes
+        node = self.size + index
+        nodes[node] = (count + ToyChoice.OFFSET) ** self.exponent
+
+        node //= 2
+        while node:
+            nodes[node] = nodes[2 * node] + nodes[2 * node + 1]
+            node //= 2
+
+    def find(self, target) -> int:
+        """
+        First leaf whose cumulative weight exceeds target
+        """
+        nodes = self.nodes
+        node = 1
+        while node < self.size:
+            left = nodes[2 * node]
+            if target < left:
+                node = 2 * node
+            else:
+                target -= left
+                node = 2 * node + 1
+
+        # Rounding may step past the last toy into the padding
+        return min(node - self.size, self.n - 1)
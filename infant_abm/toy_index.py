@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+
+
+class ToyIndex:
+    """
+    Positions of a model's toys as one contiguous (n_toys, 2) array, with
+    radius queries.
+
+    Queries have the semantics of mesa's ContinuousSpace.get_neighbors with
+    include_center=False: toys with 0 < distance <= radius, in toy order.
+    Small toy sets are scanned with a single vectorized distance computation,
+    larger ones (more than GRID_THRESHOLD toys) are bucketed into a uniform
+    grid of `cell_size` cells, so only the cells overlapping the query circle
+    are scanned.
+    """
+
+    GRID_THRESHOLD = 64
+
+    def __init__(self, positions, cell_size=None):
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+
+        self.cells = None
+        if len(self.positions) > self.GRID_THRESHOLD:
+            self.cell_size = cell_size or 10.0
+            self.cells = {}
+            self._toy_cells = [None] * len(self.positions)
+            for index, pos in enumerate(self.positions):
+                self._add_to_cell(index, pos)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def move(self, index: int, pos):
+        if self.cells is not None:
+            self.cells[self._toy_cells[index]].remove(index)
+            self._add_to_cell(index, pos)
+
+        self.positions[index] = pos
+
+    def query(self, pos, radius: float) -> np.ndarray:
+        """
+        Indices of the toys within radius of pos, excluding toys exactly at pos
+        """
+        if self.cells is None:
+            return self._filter(np.arange(len(self.positions)), pos, radius)
+
+        # Padded against rounding of the cell bounds
+        reach = radius + 1e-9
+        x, y = pos[0], pos[1]
+        first_x, last_x = self._cell(x - reach), self._cell(x + reach)
+        first_y, last_y = self._cell(y - reach), self._cell(y + reach)
+
+        candidates = [
+            index
+            for cell_x in range(first_x, last_x + 1)
+            for cell_y in range(first_y, last_y + 1)
+            for index in self.cells.get((cell_x, cell_y), ())
+        ]
+        candidates = np.sort(np.array(candidates, dtype=np.intp))
+
+        return self._filter(candidates, pos, radius)
+
+    def _filter(self, candidates, pos, radius):
+        deltas = np.abs(self.positions[candidates] - np.array(pos))
+        dists = deltas[:, 0] ** 2 + deltas[:, 1] ** 2
+
+        return candidates[(dists <= radius**2) & (dists > 0)]
+
+    def _cell(self, coordinate):
+        return math.floor(coordinate / self.cell_size)
+
+    def _add_to_cell(self, index, pos):
+        cell = (self._cell(pos[0]), self._cell(pos[1]))
+        self.cells.setdefault(cell, set()).add(index)
+        self._toy_cells[index] = cell
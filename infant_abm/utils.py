@@ -10,5 +10,5 @@ def moving_average(a, n=3):
     return ret[n - 1 :] / n
 
 
-def chance(total_chance, n_steps):
-    return 1 - np.power((1 - total_chance), 1.0 / n_steps) > np.random.rand()
+def chance(total_chance, n_steps, rng=np.random):
+    return 1 - np.power((1 - total_chance), 1.0 / n_steps) > rng.random()
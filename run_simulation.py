@@ -1,12 +1,11 @@
 import numpy as np
-import itertools
 import warnings
 import os
 import platform
 
-from infant_abm import Config, InfantParams
 from infant_abm.simulation import (
     Simulation,
+    Sweep,
     DataCollector,
     Model_0_1_0,  # noqa: F401
     Model_0_1_1,  # noqa: F401
@@ -53,22 +52,18 @@ def run_comparative_boost_simulation(
     linspace,
     boost_linspace=(0, 0, 1),
 ):
-    perception, persistence, coordination = [
-        np.round(np.linspace(*linspace), 3) for _ in range(3)
-    ]
-
-    boost = np.linspace(*boost_linspace)
-    params = []
-
-    for param_set in itertools.product(*[perception, persistence, coordination, boost]):
-        prc, prs, crd, bst = param_set
-
-        i_params = InfantParams.from_array([prc, prs, crd])
-        base_params = {
-            "config": Config(persistence_boost_value=bst, coordination_boost_value=bst),
+    values = np.round(np.linspace(*linspace), 3)
+
+    params = Sweep.product(
+        {
+            "perception": values,
+            "persistence": values,
+            "coordination": values,
+            ("persistence_boost_value", "coordination_boost_value"): np.linspace(
+                *boost_linspace
+            ),
         }
-
-        params.append({**base_params, "infant_params": i_params})
+    )
 
     run_basic_simulation(
         run_name=run_name,
@@ -4,10 +4,11 @@ import warnings
 import os
 import platform
 
-from infant_abm import Config, InfantParams
 from infant_abm.simulation import (
     Simulation,
-    DataCollector,
+    Sweep,
+    ArrayCollector,
+    Series,
     Model_0_2_0,  # noqa: F401
 )
 
@@ -39,28 +40,16 @@ def run_basic_simulation(
 def run_comparative_boost_simulation(
     model, collector, run_name, iterations, repeats, linspace, q_learn_params
 ):
-    perception, persistence, coordination = [
-        np.round(np.linspace(*linspace), 3) for _ in range(3)
-    ]
-
-    params = []
-
-    for param_set in itertools.product(
-        *[perception, persistence, coordination, q_learn_params]
-    ):
-        prc, prs, crd, q_lrn = param_set
-
-        i_params = InfantParams.from_array([prc, prs, crd])
-        base_params = {
-            "config": Config(),
+    values = np.round(np.linspace(*linspace), 3)
+
+    params = Sweep.product(
+        {
+            "perception": values,
+            "persistence": values,
+            "coordination": values,
+            ("alpha", "gamma", "epsilon"): q_learn_params,
         }
-
-        a, g, e = q_lrn
-        kwargs = {"alpha": a, "gamma": g, "epsilon": e}
-
-        params.append(
-            {**base_params, "infant_params": i_params, "infant_kwargs": kwargs}
-        )
+    )
 
     run_basic_simulation(
         run_name=run_name,
@@ -88,19 +77,12 @@ def run_from_description(model, iterations, output_dir, repeats):
     return simulation
 
 
-class v2Collector(DataCollector):
-    def __init__(self, model):
-        super().__init__(model)
-
-        self.rewards = []
-
-    def after_step(self):
-        self.rewards.append(self.model.infant.last_reward)
-        return True
+class v2Collector(ArrayCollector):
+    series = {"rewards": Series("infant.last_reward", dtype=np.uint8)}
 
     def to_dict(self):
         return {
-            "rewards": np.array(self.rewards),
+            **super().to_dict(),
             "q_table": self.model.infant.q_learning_agent.q_table,
         }
 
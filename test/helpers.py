@@ -0,0 +1,120 @@
+"""
+Parameter sets, collectors and runners shared by the tests
+"""
+
+import numpy as np
+
+from infant_abm import InfantParams
+from infant_abm.agents import QLearnDetachedInfant, QLearnDetachedParent
+from infant_abm.config import Config
+from infant_abm.db_utils import load_run
+from infant_abm.model import InfantModel
+from infant_abm.simulation import (
+    ArrayCollector,
+    DataCollector,
+    Model_0_2_0,
+    Series,
+    Simulation,
+)
+
+parameter_sets = [
+    {
+        "infant_params": InfantParams.from_array([p, 0.5, 0.5]),
+        "config": Config(),
+        "infant_kwargs": {"alpha": 0.1, "gamma": 0.9, "epsilon": 0.1},
+    }
+    for p in [0.3, 0.7]
+]
+
+param_set = {
+    "infant_params": InfantParams.from_array([0.5, 0.5, 0.5]),
+    "config": Config(),
+}
+
+
+class QTableCollector(DataCollector):
+    def after_step(self):
+        return True
+
+    def to_dict(self):
+        return {"q_table": self.model.infant.q_learning_agent.q_table}
+
+
+class RewardCollector(ArrayCollector):
+    series = {"rewards": Series("infant.last_reward", dtype=np.uint8)}
+
+
+def new_simulation(
+    output_dir, run_name, seed=None, datacollector=QTableCollector, **kwargs
+):
+    settings = {
+        "model_param_sets": parameter_sets,
+        "iterations": 300,
+        "repeats": 2,
+        "processes": 2,
+        **kwargs,
+    }
+    return Simulation(
+        model=Model_0_2_0(),
+        datacollector=datacollector,
+        run_name=run_name,
+        output_dir=output_dir,
+        seed=seed,
+        **settings,
+    )
+
+
+def run_simulation(
+    output_dir, run_name, seed=None, datacollector=QTableCollector, **kwargs
+):
+    simulation = new_simulation(output_dir, run_name, seed, datacollector, **kwargs)
+    simulation.run()
+
+    return simulation
+
+
+def load_q_tables(simulation):
+    _, load_partial = load_run(simulation.output_dir)
+    return {
+        (index, int(repetition)): result["q_table"]
+        for index in range(len(parameter_sets))
+        for repetition, result in load_partial(index).items()
+    }
+
+
+def new_model(rng=None):
+    return InfantModel(
+        infant_class=QLearnDetachedInfant,
+        parent_class=QLearnDetachedParent,
+        rng=rng,
+        **param_set,
+    )
+
+
+def make_result(lengths, offset=0):
+    return {
+        str(rep): {
+            "iterations": length,
+            "seed": 2**100 + rep,
+            "rewards": np.arange(length, dtype=np.int8) + offset,
+            "q_table": np.full((8, 6), rep + offset, dtype=np.float64),
+        }
+        for rep, length in enumerate(lengths)
+    }
+
+
+class SynchronousPool:
+    def __init__(self):
+        self.tasks = []
+
+    def apply_async(self, fn, args, callback, error_callback):
+        self.tasks.append(args[1])
+        try:
+            callback(fn(*args))
+        except Exception as e:
+            error_callback(e)
+
+
+def run_task(task):
+    index, repetitions = task
+    return {str(rep): index for rep in repetitions}
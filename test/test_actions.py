@@ -0,0 +1,61 @@
+import copy
+
+import pytest
+
+from infant_abm import Config, InfantModel, InfantParams
+from infant_abm.agents import infant_actions
+from infant_abm.agents.events import THROW_EVALUATION, ToyThrown
+from infant_abm.agents.parameter import Parameter
+from infant_abm.simulation import Model_0_1_1
+
+
+def test_actions_are_shared_and_immutable():
+    evaluate = infant_actions.EVALUATE_TOY
+    assert evaluate.next() is infant_actions.EvaluateToy.of(1)
+    assert evaluate.next().next().duration == 2
+    assert infant_actions.EvaluateThrow.of(1) is not evaluate.next()
+
+    with pytest.raises(AttributeError):
+        infant_actions.CRAWL.metadata = "boost"
+    with pytest.raises(AttributeError):
+        THROW_EVALUATION.toy = None
+    with pytest.raises(AttributeError):
+        Parameter(0.5).e3 = 0.0
+
+    action = copy.deepcopy(infant_actions.EvaluateThrow.of(3))
+    assert type(action) is infant_actions.EvaluateThrow and action.duration == 3
+
+
+def test_steady_state_uses_preallocated_actions_and_events():
+    model = InfantModel(
+        infant_class=Model_0_1_1.infant_class,
+        parent_class=Model_0_1_1.parent_class,
+        infant_params=InfantParams.from_array([0.5, 0.5, 0.5]),
+        config=Config(),
+        rng=0,
+        headless=True,
+    )
+    events = []
+    handle_event = model.parent.handle_event
+    model.parent.handle_event = lambda event: (
+        events.append(event) or handle_event(event)
+    )
+
+    preallocated = {
+        id(value)
+        for value in vars(infant_actions).values()
+        if isinstance(value, infant_actions.InfantAction)
+    }
+    actions = set()
+    for _ in range(2000):
+        model.step()
+        actions.add(id(model.infant.next_action))
+
+    durations = infant_actions.EvaluateToy._instances.values()
+    throw_durations = infant_actions.EvaluateThrow._instances.values()
+    shared = preallocated | {id(a) for a in [*durations, *throw_durations]}
+    assert actions <= shared
+
+    toy_events = [event for event in events if isinstance(event, ToyThrown)]
+    assert toy_events
+    assert all(event is event.toy.thrown_event for event in toy_events)
@@ -0,0 +1,105 @@
+import math
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from infant_abm.db_utils import load_run
+from infant_abm.simulation import AdaptiveRepeats, DataCollector
+from infant_abm.simulation.scheduler import RepetitionScheduler
+
+from test.helpers import SynchronousPool, parameter_sets, run_simulation, run_task
+
+
+class ThrowCollector(DataCollector):
+    def after_step(self):
+        return True
+
+    def to_dict(self):
+        return {
+            "throws": sum(toy.times_interacted_with for toy in self.model.toys),
+            "rewards": np.zeros(3),
+        }
+
+
+def test_interval_width():
+    rule = AdaptiveRepeats(["throws", "rewards"], ci_width=1.0, min_repeats=2)
+    results = [{"throws": t, "rewards": np.full(3, t)} for t in [1, 2, 3, 6]]
+
+    sem = np.std([1, 2, 3, 6], ddof=1) / 2
+    width = 2 * stats.t.ppf(0.975, df=3) * sem
+    assert rule.precision(results) == {"throws": width, "rewards": width}
+
+    assert rule.precision([{"throws": None, "rewards": 0}])["throws"] == math.inf
+
+
+def test_next_batch():
+    rule = AdaptiveRepeats(["x"], ci_width=0.5, max_repeats=25, batch_size=10)
+
+    constant = [{"x": 1.0}] * 10
+    assert rule.next_batch(constant) == 0
+
+    noisy = [{"x": float(x)} for x in range(20)]
+    assert rule.next_batch(noisy) == 5
+    assert rule.next_batch(noisy + noisy[:5]) == 0
+
+
+def test_scheduler_adds_repetitions():
+    extended = set()
+
+    def on_result(index, result):
+        if index not in extended:
+            extended.add(index)
+            return [5, 6]
+
+    pool = SynchronousPool()
+    scheduler = RepetitionScheduler(processes=1, chunk_size=5)
+    scheduler.run(pool, run_task, {0: list(range(5))}, on_result)
+
+    assert pool.tasks == [(0, [0, 1, 2, 3, 4]), (0, [5, 6])]
+
+
+def test_simulation_with_adaptive_repeats(tmp_path):
+    # The second set never meets the target
+    rule = AdaptiveRepeats(
+        {"throws": lambda r: r["throws"] * r["index"]},
+        ci_width=0.0,
+        min_repeats=3,
+        max_repeats=7,
+        batch_size=3,
+    )
+    simulation = run_simulation(
+        tmp_path, "adaptive", datacollector=ThrowCollector, adaptive=rule
+    )
+
+    description, load_partial = load_run(simulation.output_dir)
+    assert len(load_partial(0)) == 3
+    assert len(load_partial(1)) == 7
+
+    assert list(description["repeats"]) == [3, 7]
+    assert description.loc[0, "throws_ci_width"] == 0
+    assert description.loc[1, "throws_ci_width"] > 0
+    assert not pd.isna(description["throws_ci_width"]).any()
+    assert len(description) == len(parameter_sets)
+
+
+def test_precision_of_sets_saved_before_resume(tmp_path):
+    rule = AdaptiveRepeats(["throws"], ci_width=0.0, min_repeats=2, max_repeats=4)
+    simulation = run_simulation(
+        tmp_path, "resumed", seed=0, datacollector=ThrowCollector, adaptive=rule
+    )
+    desc_path = f"{simulation.output_dir}/description.csv"
+    expected = pd.read_csv(desc_path, index_col=0)
+
+    # Interrupted after saving every set, before updating the description
+    expected.drop(columns=["repeats", "throws_ci_width"]).to_csv(desc_path)
+
+    run_simulation(
+        tmp_path,
+        "resumed",
+        seed=0,
+        datacollector=ThrowCollector,
+        adaptive=rule,
+        resume=True,
+    )
+    pd.testing.assert_frame_equal(pd.read_csv(desc_path, index_col=0), expected)
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+
+from infant_abm.db_utils import load_aggregate, load_run
+from infant_abm.simulation import Aggregate
+
+from test.helpers import RewardCollector, parameter_sets, run_simulation
+
+
+def test_merged_accumulators_match_numpy():
+    generator = np.random.default_rng(0)
+    arrays = [generator.normal(size=generator.integers(3, 6)) for _ in range(200)]
+    scalars = [generator.integers(0, 5) for _ in range(200)]
+
+    aggregate = Aggregate(
+        ["x", "n"],
+        quantiles=(0.1, 0.5, 0.9),
+        bins={"x": np.linspace(-5, 5, 1001), "n": np.arange(6)},
+    )
+    accumulators = [aggregate.accumulator() for _ in range(3)]
+    for i, (x, n) in enumerate(zip(arrays, scalars)):
+        accumulators[i % 3].add({"x": x, "n": n})
+    accumulators[0].add({"x": None, "n": None})
+
+    merged = aggregate.accumulator()
+    for accumulator in accumulators:
+        merged.merge(accumulator)
+    result = aggregate.to_dict(merged)
+
+    assert result["repetitions"] == 201
+    columns = [np.array([x[i] for x in arrays if len(x) > i]) for i in range(5)]
+    assert list(result["x_count"]) == [len(c) for c in columns]
+    np.testing.assert_allclose(result["x_mean"], [c.mean() for c in columns])
+    np.testing.assert_allclose(result["x_var"], [c.var(ddof=1) for c in columns])
+
+    levels = [0.1, 0.5, 0.9]
+    expected = np.array(
+        [np.quantile(c, levels, method="inverted_cdf") for c in columns]
+    ).T
+    # Within a bin of the order statistic
+    np.testing.assert_allclose(result["x_quantiles"], expected, atol=0.01 + 1e-9)
+
+    assert result["n_count"] == 200
+    assert result["n_mean"] == pytest.approx(np.mean(scalars))
+    assert result["n_var"] == pytest.approx(np.var(scalars, ddof=1))
+    assert result["n_quantiles"].shape == (3,)
+
+
+@pytest.mark.parametrize("storage", ["partials", "store"])
+def test_aggregated_simulation(tmp_path, storage):
+    def run(output_dir, aggregate=None):
+        output_dir.mkdir()
+        simulation = run_simulation(
+            output_dir,
+            "aggregated",
+            seed=0,
+            datacollector=RewardCollector,
+            iterations=200,
+            repeats=6,
+            storage=storage,
+            aggregate=aggregate,
+        )
+        return simulation.output_dir
+
+    aggregate = Aggregate(["rewards"], quantiles=(0.5,), bins=[-0.5, 0.5, 1.5], keep=2)
+    aggregated_path = run(tmp_path / "aggregated", aggregate)
+    raw_path = run(tmp_path / "raw")
+
+    _, load_raw = load_run(raw_path)
+    _, load_kept = load_run(aggregated_path)
+    for index in range(len(parameter_sets)):
+        raw = load_raw(index)
+        rewards = np.stack([result["rewards"] for result in raw.values()])
+
+        result = load_aggregate(aggregated_path, index)
+        assert result["repetitions"] == 6
+        assert np.all(result["rewards_count"] == 6)
+        np.testing.assert_allclose(result["rewards_mean"], rewards.mean(axis=0))
+        np.testing.assert_allclose(result["rewards_var"], rewards.var(axis=0, ddof=1))
+        assert result["rewards_quantiles"].shape == (1, 200)
+
+        kept = load_kept(index)
+        assert list(kept) == ["0", "1"]
+        for repetition, kept_result in kept.items():
+            assert np.array_equal(kept_result["rewards"], raw[repetition]["rewards"])
+
+
+def test_aggregate_without_sample(tmp_path):
+    simulation = run_simulation(
+        tmp_path,
+        "no_sample",
+        seed=0,
+        datacollector=RewardCollector,
+        model_param_sets=parameter_sets[:1],
+        iterations=50,
+        repeats=3,
+        processes=1,
+        aggregate=Aggregate(["rewards"]),
+    )
+
+    result = load_aggregate(simulation.output_dir, 0)
+    assert "rewards_quantiles" not in result
+    assert result["rewards_mean"].shape == (50,)
+    assert not any(name.endswith(".json") for name in os.listdir(simulation.output_dir))
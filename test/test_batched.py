@@ -0,0 +1,66 @@
+import numpy as np
+
+from infant_abm.batched import QLearnDetachedBatch
+
+from test.helpers import new_model, param_set
+
+
+def test_batched_states_match_q_learning_agent():
+    rng = np.random.default_rng(0)
+    model = new_model()
+    batch = QLearnDetachedBatch.from_param_set(param_set, replicas=500, rng=0)
+
+    # Sparse toy gazes make parent-follow and mutual gaze patterns frequent,
+    # the last rows have no toy gazes at all
+    p = [0.3, 0.3, 0.1, 0.1, 0.1, 0.1]
+    batch.infant_gaze[:] = rng.choice(6, size=batch.infant_gaze.shape, p=p)
+    batch.parent_gaze[:] = rng.choice(6, size=batch.parent_gaze.shape, p=p)
+    batch.infant_gaze[400:] = rng.choice(2, size=batch.infant_gaze[400:].shape)
+    batch.parent_gaze[400:] = rng.choice(2, size=batch.parent_gaze[400:].shape)
+
+    infant_targets = [None, model.parent] + model.toys
+    parent_targets = [None, model.infant] + model.toys
+
+    expected = []
+    for infant_gaze, parent_gaze in zip(batch.infant_gaze, batch.parent_gaze):
+        model.infant.gaze_directions = [infant_targets[c] for c in infant_gaze]
+        model.parent.gaze_directions = [parent_targets[c] for c in parent_gaze]
+        expected.append(model.infant.q_learning_agent.get_state())
+
+    states = batch.get_states()
+    assert set(states) == {0, 1, 4, 5, 6, 7}
+    assert np.array_equal(states, expected)
+
+
+def test_batched_results_format():
+    batch = QLearnDetachedBatch(
+        [param_set, {**param_set, "infant_kwargs": {"epsilon": 0.5}}], rng=0
+    )
+    results = batch.run(100)
+
+    assert len(results) == 2
+    for result in results:
+        assert result["rewards"].shape == (100,)
+        assert result["q_table"].shape == (8, 6)
+    assert np.array_equal(batch.epsilon, [0.1, 0.5])
+
+
+def test_batched_matches_object_model_statistically():
+    iterations = 500
+    repeats = 30
+
+    throws = []
+    for repetition in range(repeats):
+        model = new_model(rng=repetition)
+        for _ in range(iterations):
+            model.step()
+        throws.append(sum(toy.times_interacted_with for toy in model.toys))
+
+    batch = QLearnDetachedBatch.from_param_set(param_set, replicas=1000, rng=0)
+    batch.run(iterations)
+    batch_throws = batch.toy_interactions.sum(axis=1)
+
+    standard_error = np.sqrt(
+        np.var(throws) / repeats + np.var(batch_throws) / batch.n_replicas
+    )
+    assert abs(np.mean(throws) - np.mean(batch_throws)) < 4 * standard_error
@@ -0,0 +1,47 @@
+import json
+
+from infant_abm.benchmark import MODELS, compare, format_report, run_benchmarks
+
+
+def test_benchmark_report():
+    report = run_benchmarks(scale=0.05, processes=1)
+    results = report["results"]
+
+    assert set(results["steps_per_second"]) == set(MODELS)
+    assert all(s["median"] > 0 for s in results["steps_per_second"].values())
+    assert results["pool_scaling"]["1"]["efficiency"] == 1.0
+    assert set(results["dyad_scaling"]["v0.2.0"]) == {"1", "16", "64", "256"}
+    assert set(results["io"]) >= {"save_partial", "load_run"}
+
+    json.dumps(report)
+
+
+def gate_result(rate, memory, calibration=1000.0):
+    def summary(value):
+        return {"median": value, "samples": [value * 0.99, value, value * 1.01]}
+
+    return {
+        "calibration": summary(calibration),
+        "scenarios": {
+            "v0.2.0": {"steps_per_second": summary(rate), "peak_memory": memory}
+        },
+    }
+
+
+def test_regression_gate():
+    baseline = gate_result(rate=10000, memory=1_000_000)
+
+    report = compare(baseline, gate_result(rate=9500, memory=1_050_000))
+    assert [row["regressed"] for row in report] == [False, False]
+
+    report = compare(baseline, gate_result(rate=10000, memory=1_150_000))
+    assert [row["regressed"] for row in report] == [False, True]
+
+    report = compare(baseline, gate_result(rate=5000, memory=2_000_000))
+    assert [row["regressed"] for row in report] == [True, True]
+    assert "REGRESSED" in format_report(report)
+
+    # Slower machine, measured by the calibration workload
+    slower = gate_result(rate=5000, memory=1_000_000, calibration=500.0)
+    assert not compare(baseline, slower)[0]["regressed"]
+    assert compare(baseline, slower, absolute=True)[0]["regressed"]
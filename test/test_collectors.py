@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from infant_abm.simulation import ArrayCollector, Series, unpack_series
+
+
+class Counter:
+    def __init__(self):
+        self.step = 0
+        self.flag = False
+
+    def advance(self):
+        self.step += 1
+        self.flag = self.step % 3 == 0
+
+
+class CounterCollector(ArrayCollector):
+    series = {
+        "step": Series("counter.step", dtype=np.int32),
+        "sampled": Series(lambda model: model.counter.step, dtype=np.int64, every=4),
+        "mean": Series("counter.step", every=4, mean=True),
+        "flag": Series("counter.flag", dtype=bool, packbits=True),
+    }
+
+
+def collect(iterations, steps):
+    model = SimpleNamespace(counter=Counter())
+    collector = CounterCollector(model)
+    collector.start(iterations)
+
+    for _ in range(steps):
+        model.counter.advance()
+        collector.after_step()
+
+    return collector.to_dict()
+
+
+def test_array_collector():
+    result = collect(iterations=10, steps=10)
+
+    assert result["step"].dtype == np.int32
+    assert np.array_equal(result["step"], np.arange(1, 11))
+    assert np.array_equal(result["sampled"], [4, 8])
+    assert np.array_equal(result["mean"], [2.5, 6.5, 9.5])
+
+    assert result["flag"].dtype == np.uint8 and len(result["flag"]) == 2
+    flags = unpack_series(result["flag"], result["flag_length"])
+    assert np.array_equal(flags, np.arange(1, 11) % 3 == 0)
+
+
+def test_array_collector_stopped_early():
+    result = collect(iterations=100, steps=9)
+
+    assert len(result["step"]) == 9
+    assert np.array_equal(result["sampled"], [4, 8])
+    assert np.array_equal(result["mean"], [2.5, 6.5, 9.0])
+    assert result["flag_length"] == 9
+
+
+def test_only_booleans_are_packed():
+    with pytest.raises(ValueError):
+        Series("counter.step", dtype=np.int8, packbits=True)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from infant_abm.db_utils import SweepArray, convert_run, load_run, save_partial
+
+from test.helpers import make_result
+
+
+@pytest.fixture
+def run_path(tmp_path):
+    (tmp_path / "description.csv").write_text(",perception\n0,0.1\n1,0.2\n2,0.3\n")
+    save_partial(tmp_path, 0, make_result([6, 6, 6]))
+    save_partial(tmp_path, 1, make_result([6, 4, 6], offset=10))
+    save_partial(tmp_path, 2, make_result([6, 6, 6], offset=20))
+    return tmp_path
+
+
+def test_lazy_load_run(run_path):
+    _, load_partial = load_run(run_path)
+    _, load_lazy = load_run(run_path, lazy=True)
+
+    eager, lazy = load_partial(1), load_lazy(1)
+    assert isinstance(lazy["1"]["rewards"], np.memmap)
+    for rep, result in eager.items():
+        for key, value in result.items():
+            assert np.array_equal(lazy[rep][key], value)
+
+
+@pytest.mark.parametrize("converted", [False, True])
+def test_sweep_array(run_path, converted):
+    if converted:
+        convert_run(run_path, remove=True)
+
+    rewards = SweepArray(run_path, "rewards")
+
+    selected = rewards[[0, 2], 1:3, 2:5]
+    assert selected.shape == (2, 2, 3)
+    assert np.array_equal(selected[1, 0], [22, 23, 24])
+
+    # The shorter run is zero-padded
+    assert np.array_equal(rewards[1][1], [10, 11, 12, 13, 0, 0])
+    assert np.array_equal(rewards[:, 0, -1], [5, 15, 25])
+
+    q_tables = SweepArray(run_path, "q_table")
+    assert q_tables[1:, 2, 0].shape == (2, 6)
+
+
+@pytest.mark.parametrize("converted", [False, True])
+def test_sweep_array_uneven_repeats(tmp_path, converted):
+    (tmp_path / "description.csv").write_text(",perception\n0,0.1\n1,0.2\n")
+    save_partial(tmp_path, 0, make_result([6, 6, 6]))
+    save_partial(tmp_path, 1, make_result([4, 3], offset=10))
+    if converted:
+        convert_run(tmp_path, remove=True)
+
+    rewards = SweepArray(tmp_path, "rewards")[:]
+    assert rewards.shape == (2, 3, 6)
+    assert np.array_equal(rewards[1, 0], [10, 11, 12, 13, 0, 0])
+    assert np.array_equal(rewards[1, 1], [10, 11, 12, 0, 0, 0])
+    assert not rewards[1, 2].any()
@@ -24,13 +24,9 @@ class Collector(DataCollector):
         return {}
 
 
-def run_basic_scenario(model, infant_params: InfantParams, config=Config()):
-    output_dir = Path("test/output")
-    filename = output_dir.joinpath("basic_scenario.hdf")
-
-    Path(filename).unlink(missing_ok=True)
-    Path.mkdir(output_dir, exist_ok=True)
-
+def run_basic_scenario(
+    output_dir: Path, model, infant_params: InfantParams, config=Config()
+):
     parameter_sets = [
         {
             "infant_params": infant_params,
@@ -54,46 +50,50 @@ def run_basic_scenario(model, infant_params: InfantParams, config=Config()):
     return simulation
 
 
-def test_model_v0_1_0():
+def test_model_v0_1_0(tmp_path):
     simulation = run_basic_scenario(
+        tmp_path,
         model=Model_0_1_0(),
         infant_params=infant_params,
     )
     _output_dir = simulation.output_dir
 
 
-def test_model_v0_1_1():
+def test_model_v0_1_1(tmp_path):
     simulation = run_basic_scenario(
+        tmp_path,
         model=Model_0_1_1(),
         infant_params=infant_params,
     )
     _output_dir = simulation.output_dir
 
 
-def test_v0_1_1_changing_global_params():
+def test_v0_1_1_changing_global_params(tmp_path):
     infant_params = InfantParams.new(0.5, 0.05, 0.05)
 
     config = Config(persistence_boost_value=0.0)
     _simulation = run_basic_scenario(
-        model=Model_0_1_1(), infant_params=infant_params, config=config
+        tmp_path, model=Model_0_1_1(), infant_params=infant_params, config=config
     )
 
     config = Config(persistence_boost_value=1.0, coordination_boost_value=1.0)
     _simulation_2 = run_basic_scenario(
-        model=Model_0_1_1(), infant_params=infant_params, config=config
+        tmp_path, model=Model_0_1_1(), infant_params=infant_params, config=config
     )
 
 
-def test_model_v0_1_2():
+def test_model_v0_1_2(tmp_path):
     simulation = run_basic_scenario(
+        tmp_path,
         model=Model_0_1_2(),
         infant_params=infant_params,
     )
     _output_dir = simulation.output_dir
 
 
-def test_model_v0_2_0():
+def test_model_v0_2_0(tmp_path):
     simulation = run_basic_scenario(
+        tmp_path,
         model=Model_0_2_0(),
         infant_params=infant_params,
     )
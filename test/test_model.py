@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from infant_abm import Config, InfantModel, InfantParams
+from infant_abm.simulation import Model_0_1_0, Model_0_1_1, Model_0_1_2, Model_0_2_0
+
+
+@pytest.mark.parametrize("model", [Model_0_1_0, Model_0_1_1, Model_0_1_2, Model_0_2_0])
+def test_headless_model_matches_mesa_model(model):
+    def trajectory(headless):
+        instance = InfantModel(
+            infant_class=model.infant_class,
+            parent_class=model.parent_class,
+            infant_params=InfantParams.from_array([0.5, 0.5, 0.5]),
+            config=Config(),
+            rng=3,
+            headless=headless,
+        )
+        positions = []
+        for _ in range(1000):
+            instance.step()
+            positions.append(
+                [instance.infant.pos, instance.parent.pos]
+                + [toy.pos for toy in instance.toys]
+            )
+        return instance, np.array(positions)
+
+    mesa_model, expected = trajectory(headless=False)
+    headless_model, positions = trajectory(headless=True)
+
+    assert headless_model.schedule is None
+    assert np.array_equal(positions, expected)
+    assert headless_model.infant.direction == mesa_model.infant.direction
+
+
+def test_toy_layouts():
+    quarters = [[25, 25], [25, 75], [75, 25], [75, 75]]
+    assert np.array_equal(Config().toy_positions(None), quarters)
+
+    grid = Config(n_toys=7, arena_size=300).toy_positions(None)
+    assert grid.shape == (7, 2)
+    assert np.array_equal(grid[:3, 0], [50, 50, 50])
+    assert np.array_equal(grid[:3, 1], [50, 150, 250])
+
+    config = Config(n_toys=500, toy_layout="random", arena_size=1000)
+    positions = config.toy_positions(np.random.default_rng(0))
+    assert positions.shape == (500, 2)
+    assert positions.min() >= 0 and positions.max() < 1000
+
+    with pytest.raises(ValueError):
+        Config(toy_layout="circle")
+
+
+@pytest.mark.parametrize("model", [Model_0_1_0, Model_0_2_0])
+def test_large_toy_population(model):
+    config = Config(n_toys=300, toy_layout="random", arena_size=200)
+    instance = InfantModel(
+        infant_class=model.infant_class,
+        parent_class=model.parent_class,
+        infant_params=InfantParams.from_array([0.5, 0.5, 0.5]),
+        config=config,
+        rng=0,
+        headless=True,
+    )
+    assert instance.toy_index.cells is not None
+
+    for _ in range(3000):
+        instance.step()
+
+    assert instance.infant.pos.max() < 200
+    assert instance.toy_interactions.sum() > 0
+    assert np.array_equal(
+        instance.toy_interactions, [toy.times_interacted_with for toy in instance.toys]
+    )
+    assert np.array_equal(
+        instance.toy_index.positions, [toy.pos for toy in instance.toys]
+    )
+
+
+@pytest.mark.parametrize("model", [Model_0_1_0, Model_0_1_1, Model_0_1_2, Model_0_2_0])
+def test_multiple_dyads(model):
+    config = Config(n_toys=40, toy_layout="random", arena_size=300, n_dyads=20)
+
+    def trajectory(headless):
+        instance = InfantModel(
+            infant_class=model.infant_class,
+            parent_class=model.parent_class,
+            infant_params=InfantParams.from_array([0.5, 0.5, 0.5]),
+            config=config,
+            rng=1,
+            headless=headless,
+        )
+        positions = []
+        for _ in range(300):
+            instance.step()
+            positions.append([agent.pos for dyad in instance.dyads for agent in dyad])
+        return instance, np.array(positions)
+
+    _, expected = trajectory(headless=False)
+    instance, positions = trajectory(headless=True)
+
+    assert np.array_equal(positions, expected)
+    assert (instance.infant, instance.parent) == instance.dyads[0]
+    assert len({id(infant.params) for infant, _ in instance.dyads}) == 20
+    for infant, parent in instance.dyads:
+        assert infant.parent is parent and parent.infant is infant
+
+    # Dyads start spread over the arena and move independently
+    assert len({tuple(infant.pos) for infant, _ in instance.dyads}) == 20
@@ -0,0 +1,64 @@
+import numpy as np
+
+from infant_abm import InfantModel, InfantParams
+from infant_abm.agents import NoVisionInfant, NoVisionParent
+from infant_abm.agents.position import Position
+
+
+def numpy_norm_vector(first, second):
+    vec = second - first
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return np.ones(2)
+    return vec / norm
+
+
+def test_scalar_geometry_matches_numpy():
+    rng = np.random.default_rng(0)
+    first = rng.random((5000, 2)) * 100
+    second = rng.random((5000, 2)) * 100
+    second[:10] = first[:10]
+
+    for a, b in zip(first, second):
+        expected = numpy_norm_vector(a, b)
+        assert np.array_equal(Position.calc_norm_vector(a, b), expected)
+        assert Position.angle(a, b) == np.arctan2(*expected) % (2 * np.pi)
+
+    vectors, norms = Position.calc_norm_vectors(first, second)
+    assert np.array_equal(norms, np.linalg.norm(second - first, axis=1))
+    assert np.array_equal(
+        Position.angles(first, second),
+        [Position.angle(a, b) for a, b in zip(first, second)],
+    )
+
+
+def test_correct_out_of_bounds():
+    Position.x_max = Position.y_max = 100
+
+    pos = np.array([-3.0, 120.0])
+    assert Position.correct_out_of_bounds(pos) is pos
+    assert pos.tolist() == [0.0, 100 - 1e-10]
+
+
+def test_move_to_updates_position_in_place():
+    model = InfantModel(
+        NoVisionInfant,
+        NoVisionParent,
+        infant_params=InfantParams.from_array([0.5, 0.5, 0.5]),
+        rng=0,
+        headless=True,
+    )
+    infant = model.infant
+    pos = infant.pos
+    x, y = pos.tolist()
+
+    new_pos = np.array([x + 3.0, -5.0])
+    expected_direction = Position.angle(
+        pos, Position.correct_out_of_bounds(new_pos.copy())
+    )
+    infant.move_agent(new_pos)
+
+    assert infant.pos is pos
+    assert pos.tolist() == [x + 3.0, 0.0]
+    assert new_pos.tolist() == [x + 3.0, 0.0]
+    assert infant.direction == expected_direction
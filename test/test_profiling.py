@@ -0,0 +1,39 @@
+import pandas as pd
+
+from infant_abm import profiling
+from infant_abm.db_utils import load_run
+from infant_abm.agents.infant import Infant
+
+from test.helpers import new_model, run_simulation
+
+
+def test_profiler_records_actions_and_events():
+    original = Infant._perform_action
+    model = new_model(rng=0)
+
+    with profiling.profile() as profiler:
+        assert Infant._perform_action is not original
+        for _ in range(500):
+            model.step()
+
+    assert Infant._perform_action is original
+
+    df = profiler.to_dataframe()
+    infant = df[df["agent"] == "QLearnDetachedInfant"]
+    assert infant["calls"].sum() == 500
+    assert {"LookForToy", "Crawl"} <= set(infant["name"])
+    assert (df["seconds"] > 0).all()
+
+
+def test_simulation_profile(tmp_path):
+    simulation = run_simulation(tmp_path, "profiled", profile=True)
+
+    df = pd.read_csv(tmp_path / "v0.2.0" / "profiled" / profiling.PROFILE_FILENAME)
+    actions = df[(df["agent"] == "QLearnDetachedInfant") & (df["kind"] == "action")]
+
+    # 2 parameter sets, 2 repetitions, 300 iterations
+    assert actions["calls"].sum() == 4 * 300
+    assert "ToyThrown" in set(df[df["kind"] == "event"]["name"])
+
+    _, load_partial = load_run(simulation.output_dir)
+    assert "_profile" not in load_partial(0)["0"]
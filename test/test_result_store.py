@@ -0,0 +1,93 @@
+import numpy as np
+
+from infant_abm.db_utils import convert_run, load_run, partial_exists, save_partial
+from infant_abm.result_store import STORE_DIRNAME, ResultStore
+
+from test.helpers import load_q_tables, make_result, run_simulation
+
+
+def test_store_roundtrip(tmp_path):
+    store = ResultStore(tmp_path)
+    store.write(0, make_result([5, 5, 5]))
+    store.write(1, make_result([5, 3, 5], offset=10))
+
+    reopened = ResultStore(tmp_path)
+    assert reopened.indices() == [0, 1]
+    assert reopened.array_keys() == ["q_table", "rewards"]
+
+    partial = reopened.read_partial(1)
+    assert list(partial) == ["0", "1", "2"]
+    assert partial["1"]["seed"] == 2**100 + 1
+    assert np.array_equal(partial["1"]["rewards"], np.arange(3) + 10)
+    assert partial["1"]["rewards"].dtype == np.int8
+
+    rewards = reopened.read_array("rewards", repetitions=slice(1, 3), steps=slice(2))
+    assert rewards.shape == (2, 2, 2)
+    assert np.array_equal(rewards[1, 0], [10, 11])
+    assert np.array_equal(reopened.read_lengths("rewards"), [[5, 5, 5], [5, 3, 5]])
+
+    scalars = reopened.read_scalars()
+    assert len(scalars) == 6
+    assert list(scalars.columns) == ["index", "repetition", "iterations", "seed"]
+
+
+def test_store_pads_sets_of_different_lengths(tmp_path):
+    store = ResultStore(tmp_path)
+    store.write(0, make_result([5, 5]))
+    store.write(1, make_result([3, 2, 3], offset=10))
+
+    rewards = store.read_array("rewards")
+    assert rewards.shape == (2, 3, 5)
+    assert np.array_equal(rewards[1, 1], [10, 11, 0, 0, 0])
+    assert np.array_equal(store.read_lengths("rewards"), [[5, 5, 0], [3, 2, 3]])
+
+
+def test_store_survives_interrupted_write(tmp_path):
+    store = ResultStore(tmp_path)
+    store.write(0, make_result([5]))
+
+    # Left over by a process killed while writing the next set
+    (tmp_path / STORE_DIRNAME / "1.zip.123.tmp").write_bytes(b"PK\x03\x04")
+
+    reopened = ResultStore(tmp_path)
+    assert reopened.indices() == [0]
+    assert not reopened.contains(1)
+    assert np.array_equal(reopened.read_partial(0)["0"]["rewards"], np.arange(5))
+
+
+def test_store_numpy_scalars(tmp_path):
+    store = ResultStore(tmp_path)
+    store.write(0, {"0": {"throws": np.int64(3), "mean": np.array(0.5)}})
+
+    assert store.read_partial(0) == {"0": {"throws": 3, "mean": 0.5}}
+
+
+def test_convert_run(tmp_path):
+    (tmp_path / "description.csv").write_text(",perception\n0,0.1\n1,0.2\n")
+    save_partial(tmp_path, 0, make_result([4, 4]))
+    save_partial(tmp_path, 1, make_result([4, 2], offset=1))
+
+    _, load_partial = load_run(tmp_path)
+    expected = {index: load_partial(index) for index in (0, 1)}
+
+    convert_run(tmp_path, remove=True)
+    assert not partial_exists(tmp_path, 0)
+
+    _, load_partial = load_run(tmp_path)
+    for index in (0, 1):
+        for rep, result in expected[index].items():
+            converted = load_partial(index)[rep]
+            for key, value in result.items():
+                assert np.array_equal(converted[key], value)
+
+
+def test_simulation_with_store(tmp_path):
+    partials = run_simulation(tmp_path, "run", seed=1)
+    stored = run_simulation(tmp_path / "v0.2.0", "run", seed=1, storage="store")
+
+    assert ResultStore.exists(stored.output_dir)
+    assert not partial_exists(stored.output_dir, 0)
+
+    q_tables = load_q_tables(partials)
+    for key, q_table in load_q_tables(stored).items():
+        assert np.array_equal(q_table, q_tables[key])
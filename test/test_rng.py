@@ -0,0 +1,43 @@
+import numpy as np
+
+from infant_abm import InfantParams
+from infant_abm.model import InfantModel
+from infant_abm.agents import QLearnDetachedInfant, QLearnDetachedParent
+from infant_abm.rng import RandomSource
+
+
+def test_random_source_blocks():
+    rng = RandomSource(0, block_size=16)
+    values = [rng.random() for _ in range(40)]
+
+    assert np.array_equal(values, np.random.default_rng(0).random(40))
+    assert all(isinstance(v, float) for v in values)
+
+
+def test_random_source_choice():
+    rng = RandomSource(0)
+    items = ["a", "b", "c"]
+
+    counts = {item: 0 for item in items}
+    for _ in range(10000):
+        counts[rng.choice(items, p=[0.0, 1.0, 3.0])] += 1
+
+    assert counts["a"] == 0
+    assert 0.2 < counts["b"] / 10000 < 0.3
+    assert {rng.choice(items) for _ in range(100)} == set(items)
+
+
+def test_model_rng_is_injectable():
+    def run(rng):
+        model = InfantModel(
+            infant_class=QLearnDetachedInfant,
+            parent_class=QLearnDetachedParent,
+            infant_params=InfantParams.from_array([0.5, 0.5, 0.5]),
+            rng=rng,
+        )
+        for _ in range(500):
+            model.step()
+        return model.infant.q_learning_agent.q_table
+
+    assert np.array_equal(run(1), run(RandomSource(1)))
+    assert not np.array_equal(run(1), run(2))
@@ -0,0 +1,71 @@
+import pytest
+
+from infant_abm.simulation.scheduler import RepetitionScheduler
+
+from test.helpers import SynchronousPool, run_task
+
+
+def test_scheduler_runs_every_repetition_once():
+    pool = SynchronousPool()
+    scheduler = RepetitionScheduler(processes=2, target_duration=1.0)
+
+    results = {}
+
+    def on_result(index, result):
+        for rep in result:
+            assert (index, rep) not in results
+            results[index, rep] = result[rep]
+
+    pending = {0: list(range(5)), 3: list(range(7)), 4: []}
+    scheduler.run(pool, run_task, pending, on_result)
+
+    assert sorted(results) == sorted(
+        [(0, str(rep)) for rep in range(5)] + [(3, str(rep)) for rep in range(7)]
+    )
+    assert pool.tasks[0] == (0, [0])
+
+
+def test_scheduler_chunk_sizes():
+    scheduler = RepetitionScheduler(processes=4, target_duration=1.0)
+    assert scheduler._chunk_size(remaining=1000) == 1
+
+    scheduler._record_duration(0.01)
+    assert scheduler._chunk_size(remaining=1000) == 100
+
+    # Tail of the sweep is spread over all workers
+    assert scheduler._chunk_size(remaining=40) == 5
+    assert scheduler._chunk_size(remaining=3) == 1
+
+    fixed = RepetitionScheduler(processes=4, chunk_size=10)
+    assert fixed._chunk_size(remaining=3) == 10
+
+
+def test_scheduler_raises_task_errors():
+    def failing_task(task):
+        raise RuntimeError("task failed")
+
+    scheduler = RepetitionScheduler(processes=1)
+    with pytest.raises(RuntimeError, match="task failed"):
+        scheduler.run(SynchronousPool(), failing_task, {0: [0]}, None)
+
+
+def test_scheduler_consumes_sets_lazily():
+    pulled = []
+
+    def pending():
+        for index in range(1000):
+            pulled.append(index)
+            yield index, range(3)
+
+    in_flight = []
+
+    def on_result(index, result):
+        in_flight.append(len(pulled) - index)
+
+    pool = SynchronousPool()
+    scheduler = RepetitionScheduler(processes=2, chunk_size=3)
+    scheduler.run(pool, run_task, pending(), on_result, total=3000)
+
+    assert len(pool.tasks) == 1000
+    # Sets pulled ahead of a result: at most one per queued task
+    assert max(in_flight) <= RepetitionScheduler.QUEUED_TASKS_PER_PROCESS * 2
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from infant_abm.db_utils import load_run
+from infant_abm.simulation import Model_0_2_0, Simulation
+
+from test.helpers import QTableCollector, load_q_tables, run_simulation
+
+
+def test_simulation_is_reproducible(tmp_path):
+    first = run_simulation(tmp_path, "run", seed=42)
+    second = run_simulation(tmp_path / "v0.2.0", "run", seed=42)
+
+    q_tables = load_q_tables(first)
+    assert len(q_tables) == 4
+    for key, q_table in load_q_tables(second).items():
+        assert np.array_equal(q_table, q_tables[key])
+
+    # Each run gets an independent stream
+    assert not np.array_equal(q_tables[0, 0], q_tables[0, 1])
+
+
+def test_replay_single_run(tmp_path):
+    simulation = run_simulation(tmp_path, "run")
+    description, _ = load_run(simulation.output_dir)
+    assert set(description["seed"].map(int)) == {simulation.seed}
+
+    result = Simulation.replay(
+        Model_0_2_0(),
+        simulation.output_dir,
+        index=1,
+        repetition=1,
+        iterations=300,
+        datacollector=QTableCollector,
+    )
+
+    assert np.array_equal(result["q_table"], load_q_tables(simulation)[1, 1])
+
+
+def test_set_granularity(tmp_path):
+    by_set = run_simulation(tmp_path, "set", granularity="set")
+    assert len(load_q_tables(by_set)) == 4
+
+    replayed = Simulation.replay(
+        Model_0_2_0(),
+        by_set.output_dir,
+        index=0,
+        repetition=1,
+        iterations=300,
+        datacollector=QTableCollector,
+    )
+    assert np.array_equal(replayed["q_table"], load_q_tables(by_set)[0, 1])
+
+
+class InterruptedCollector(QTableCollector):
+    interrupt_at = None
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.steps = 0
+
+    def after_step(self):
+        self.steps += 1
+        if self.steps == InterruptedCollector.interrupt_at:
+            raise RuntimeError("Interrupted")
+        return True
+
+
+def test_resume_from_checkpoint(tmp_path):
+    (tmp_path / "full").mkdir()
+    expected = load_q_tables(run_simulation(tmp_path / "full", "run", seed=7))
+
+    InterruptedCollector.interrupt_at = 250
+    with pytest.raises(RuntimeError):
+        run_simulation(
+            tmp_path,
+            "run",
+            seed=7,
+            datacollector=InterruptedCollector,
+            checkpoint_every=100,
+        )
+    checkpoint_dir = tmp_path / "v0.2.0" / "run" / "checkpoints"
+    assert list(checkpoint_dir.glob("*.state.pkl"))
+
+    InterruptedCollector.interrupt_at = None
+    resumed = run_simulation(
+        tmp_path,
+        "run",
+        seed=7,
+        datacollector=InterruptedCollector,
+        checkpoint_every=100,
+        resume=True,
+    )
+
+    q_tables = load_q_tables(resumed)
+    assert q_tables.keys() == expected.keys()
+    for key, q_table in q_tables.items():
+        assert np.array_equal(q_table, expected[key])
+    assert not checkpoint_dir.exists()
+
+
+def test_resume_after_crash_while_saving(tmp_path):
+    simulation = run_simulation(tmp_path, "run")
+    expected = load_q_tables(simulation)
+
+    # Arrays of the last set saved, but not the JSON marking it saved
+    run_path = tmp_path / "v0.2.0" / "run"
+    (run_path / "1.json").rename(run_path / "1.json.tmp")
+    assert (run_path / "1").is_dir()
+
+    with pytest.raises(ValueError, match="differs"):
+        run_simulation(tmp_path, "run", seed=simulation.seed + 1, resume=True)
+
+    resumed = run_simulation(tmp_path, "run", resume=True)
+    assert resumed.seed == simulation.seed
+
+    q_tables = load_q_tables(resumed)
+    assert q_tables.keys() == expected.keys()
+    for key, q_table in q_tables.items():
+        assert np.array_equal(q_table, expected[key])
@@ -0,0 +1,53 @@
+import functools
+
+import numpy as np
+
+from infant_abm.simulation import (
+    GreedyPolicyConvergence,
+    Model_0_2_0,
+    QTableConvergence,
+    Simulation,
+)
+
+from test.helpers import RewardCollector, parameter_sets
+
+
+def run_model(stopping, iterations=3000, seed=0):
+    return Simulation._run_model(
+        Model_0_2_0(),
+        parameter_sets[0],
+        iterations,
+        RewardCollector,
+        np.random.SeedSequence(seed),
+        stopping,
+    )
+
+
+def test_q_table_convergence():
+    loose = functools.partial(QTableConvergence, window=100, tolerance=np.inf)
+    result = run_model(loose)
+    assert result["converged_step"] == 100
+    assert len(result["rewards"]) == 100
+
+    strict = functools.partial(QTableConvergence, window=100, tolerance=0)
+    result = run_model(strict)
+    assert result["converged_step"] is None
+    assert len(result["rewards"]) == 3000
+
+
+def test_greedy_policy_convergence():
+    stopping = functools.partial(GreedyPolicyConvergence, window=200)
+    result = run_model(stopping, iterations=20000)
+
+    assert result["converged_step"] is not None
+    assert len(result["rewards"]) == result["converged_step"]
+
+    # Unchanged when the run is replayed with the same stream
+    assert (
+        run_model(stopping, iterations=20000)["converged_step"]
+        == (result["converged_step"])
+    )
+
+
+def test_without_stopping():
+    assert "converged_step" not in run_model(None, iterations=10)
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from infant_abm.db_utils import load_run
+from infant_abm.simulation import (
+    DataCollector,
+    Model_0_1_0,
+    Simulation,
+    SurrogateSampler,
+    Sweep,
+)
+from infant_abm.simulation.simulation import SURROGATE_FILENAME
+
+
+def bump(perception, persistence):
+    return np.exp(-((perception - 0.7) ** 2 + (persistence - 0.3) ** 2) / 0.01)
+
+
+def test_sampler_refines_bump():
+    values = np.linspace(0, 1, 21)
+    perception, persistence = (a.ravel() for a in np.meshgrid(values, values))
+    description = pd.DataFrame(
+        {
+            "perception": perception,
+            "persistence": persistence,
+            "coordination": 0.5,
+        }
+    )
+    truth = bump(perception, persistence)
+
+    sampler = SurrogateSampler("y", initial_points=16, batch_size=8, max_points=60)
+    indices = sampler.start(description)
+    assert sampler.features == ["perception", "persistence"]
+
+    while indices:
+        for index in indices:
+            sampler.observe(index, [{"y": truth[index]}])
+        indices = sampler.next_round()
+
+    assert len(sampler.observed) == 60
+
+    # Run sets cluster around the bump
+    observed = list(sampler.observed)
+    near = np.hypot(perception - 0.7, persistence - 0.3) < 0.25
+    assert near[observed].mean() > 1.5 * near.mean()
+
+    prediction = sampler.predict()
+    assert prediction["observed"].notna().sum() == 60
+    assert np.abs(prediction["mean"] - truth).mean() < 0.02
+
+
+def test_target_std_stops_sampling():
+    description = pd.DataFrame({"perception": np.linspace(0, 1, 50)})
+
+    sampler = SurrogateSampler("y", initial_points=8, target_std=0.05)
+    for index in sampler.start(description):
+        sampler.observe(index, [{"y": 2.0}, {"y": 2.0}])
+
+    assert sampler.next_round() == []
+
+
+class PerceptionCollector(DataCollector):
+    def after_step(self):
+        return True
+
+    def to_dict(self):
+        return {"perception": self.model.infant.params.perception.e2}
+
+
+def test_simulation_with_sampler(tmp_path):
+    sweep = Sweep.product(
+        {"perception": np.linspace(0.1, 0.9, 4), "persistence": [0.2, 0.4, 0.6, 0.8]},
+        base={"coordination": 0.5},
+    )
+    sampler = SurrogateSampler(
+        "perception", initial_points=4, batch_size=2, max_points=8
+    )
+    simulation = Simulation(
+        model=Model_0_1_0(),
+        model_param_sets=sweep,
+        iterations=10,
+        repeats=2,
+        datacollector=PerceptionCollector,
+        run_name="surrogate",
+        output_dir=tmp_path,
+        processes=2,
+        seed=0,
+        sampler=sampler,
+    )
+    simulation.run()
+
+    description, load_partial = load_run(simulation.output_dir)
+    run = description["round"].notna()
+    assert run.sum() == 8
+    assert list(description.loc[run, "round"].value_counts().sort_index()) == [4, 2, 2]
+    for index in description.index[run]:
+        assert len(load_partial(index)) == 2
+
+    surrogate = pd.read_csv(
+        os.path.join(simulation.output_dir, SURROGATE_FILENAME), index_col=0
+    )
+    assert len(surrogate) == len(sweep)
+    np.testing.assert_allclose(
+        surrogate.loc[run, "observed"], description.loc[run, "perception"]
+    )
+
+
+def test_sets_without_output_count_as_run():
+    description = pd.DataFrame({"perception": np.linspace(0, 1, 30)})
+
+    sampler = SurrogateSampler("y", initial_points=4, batch_size=4, max_points=12)
+    indices = sampler.start(description)
+    rounds = 0
+    while indices:
+        for index in indices:
+            # Half of the sets never produce the output
+            value = None if index % 2 else description["perception"][index]
+            sampler.observe(index, [{"y": value}])
+        indices = sampler.next_round()
+        assert not set(indices) & sampler.attempted
+        rounds += 1
+
+    assert len(sampler.attempted) == 12
+    assert rounds == 3
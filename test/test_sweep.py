@@ -0,0 +1,105 @@
+import itertools
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from infant_abm import Config, InfantParams
+from infant_abm.simulation import DataCollector, Model_0_1_0, Simulation, Sweep
+
+
+def test_product_order_and_coupled_axes():
+    values = [0.2, 0.5, 0.8]
+    sweep = Sweep.product(
+        {
+            "perception": values,
+            "persistence": values,
+            ("alpha", "gamma"): [(0.1, 0.9), (0.2, 0.8)],
+        },
+        base={"coordination": 0.5, "n_toys": 8},
+    )
+    assert len(sweep) == 18
+
+    expected = itertools.product(values, values, [(0.1, 0.9), (0.2, 0.8)])
+    for param_set, (perception, persistence, (alpha, gamma)) in zip(sweep, expected):
+        assert param_set["infant_params"] == InfantParams.from_array(
+            [perception, persistence, 0.5]
+        )
+        assert param_set["config"] == Config(n_toys=8)
+        assert param_set["infant_kwargs"] == {"alpha": alpha, "gamma": gamma}
+
+    assert sweep[-1]["infant_kwargs"] == sweep[17]["infant_kwargs"]
+    with pytest.raises(IndexError):
+        sweep[18]
+
+
+def test_latin_hypercube():
+    sweep = Sweep.latin_hypercube(
+        {"perception": (0.0, 1.0), "persistence": (0.2, 0.4)},
+        n=50,
+        seed=1,
+        base={"coordination": 0.5},
+    )
+    points = np.array([sweep.point(i) for i in range(len(sweep))])
+    perception = np.array([p["perception"] for p in points])
+    persistence = np.array([p["persistence"] for p in points])
+
+    # One point in every interval of every axis
+    assert sorted(np.floor(perception * 50)) == list(range(50))
+    assert sorted(np.floor((persistence - 0.2) / 0.2 * 50)) == list(range(50))
+
+    again = Sweep.latin_hypercube(sweep.ranges, n=50, seed=1)
+    assert again.point(7) == sweep.point(7)
+
+
+def test_large_sweep_is_compact():
+    values = np.linspace(0, 1, 101)
+    sweep = Sweep.product(
+        {"perception": values, "persistence": values, "coordination": values}
+    )
+    assert len(sweep) > 1_000_000
+    assert len(pickle.dumps(sweep)) < 10_000
+    assert sweep[1_000_000]["infant_params"].to_array()[0] == values[98]
+
+
+def test_sweep_is_abstract():
+    with pytest.raises(TypeError):
+        Sweep()
+
+
+class NullCollector(DataCollector):
+    def after_step(self):
+        return True
+
+    def to_dict(self):
+        return {}
+
+
+def test_simulation_accepts_sweep(tmp_path, monkeypatch):
+    sweep = Sweep.explicit(
+        [{"perception": p, "persistence": 0.5, "coordination": 0.5} for p in [0.1, 0.9]]
+        + [{"perception": 0.5, "persistence": 0.5, "coordination": 0.5, "n_toys": 6}]
+    )
+    monkeypatch.setattr("infant_abm.simulation.simulation.DESCRIPTION_CHUNK_SIZE", 2)
+
+    def run(parameter_sets, run_name):
+        simulation = Simulation(
+            model=Model_0_1_0(),
+            model_param_sets=parameter_sets,
+            iterations=10,
+            repeats=1,
+            datacollector=NullCollector,
+            run_name=run_name,
+            output_dir=tmp_path,
+            processes=1,
+            seed=0,
+        )
+        simulation.run()
+        return pd.read_csv(f"{simulation.output_dir}/description.csv", index_col=0)
+
+    description = run(sweep, "sweep")
+    expected = run(list(sweep), "list")
+
+    pd.testing.assert_frame_equal(description, expected)
+    assert list(description["n_toys"]) == [4, 4, 6]
@@ -0,0 +1,37 @@
+import numpy as np
+
+from infant_abm.rng import RandomSource
+from infant_abm.toy_choice import ToyChoice
+
+from test.helpers import new_model
+
+
+def test_choice_matches_weighted_choice():
+    generator = np.random.default_rng(0)
+
+    for n_toys in [1, 2, 5, 64, 100]:
+        counts = np.zeros(n_toys, dtype=np.int64)
+        toy_choice = ToyChoice(counts)
+        choices, expected = RandomSource(1), RandomSource(1)
+
+        for exponent in [-0.8, 0.0, 0.6]:
+            for _ in range(200):
+                toy_choice.interact(int(generator.integers(n_toys)))
+
+                weights = np.power(counts + ToyChoice.OFFSET, exponent)
+                index = toy_choice.choose(exponent, choices)
+                assert index == expected.choice(range(n_toys), p=weights)
+
+
+def test_model_keeps_choice_weights_in_sync():
+    model = new_model(rng=0)
+    exponent = 2 * model.infant.params.perception.e2 - 1
+    for _ in range(2000):
+        model.step()
+
+    assert model.toy_interactions.sum() > 0
+    tree = model.toy_choice._trees[exponent]
+    np.testing.assert_allclose(
+        tree.nodes[tree.size : tree.size + tree.n],
+        np.power(model.toy_interactions + ToyChoice.OFFSET, exponent),
+    )
@@ -0,0 +1,63 @@
+import mesa
+import numpy as np
+
+from infant_abm.toy_index import ToyIndex
+
+from test.helpers import new_model
+
+
+def test_query_matches_mesa_neighbors():
+    rng = np.random.default_rng(0)
+    positions = rng.random((300, 2)) * 100
+
+    space = mesa.space.ContinuousSpace(100, 100, False)
+    agents = [mesa.Agent(i, mesa.Model()) for i in range(len(positions))]
+    for agent, pos in zip(agents, positions):
+        space.place_agent(agent, pos)
+
+    small = ToyIndex(positions[:40])
+    grid = ToyIndex(positions)
+    assert small.cells is None and grid.cells is not None
+
+    for _ in range(200):
+        pos = rng.random(2) * 100
+        radius = rng.random() * 30
+        if rng.random() < 0.2:
+            pos = positions[rng.integers(40)]
+
+        expected = [a.unique_id for a in space.get_neighbors(pos, radius, False)]
+        assert list(grid.query(pos, radius)) == expected
+        assert list(small.query(pos, radius)) == [i for i in expected if i < 40]
+
+    # Moves keep the grid in sync
+    for index in rng.integers(len(positions), size=100):
+        new_pos = rng.random(2) * 100
+        grid.move(index, new_pos)
+        space.move_agent(agents[index], new_pos)
+
+    pos = np.array([50.0, 50.0])
+    expected = [a.unique_id for a in space.get_neighbors(pos, 25, False)]
+    assert list(grid.query(pos, 25)) == expected
+
+
+def test_model_keeps_index_in_sync():
+    model = new_model(rng=0)
+    for _ in range(2000):
+        model.step()
+
+    assert sum(toy.times_interacted_with for toy in model.toys) > 0
+    assert np.array_equal(model.toy_index.positions, [toy.pos for toy in model.toys])
+
+
+def test_toy_color_is_computed_on_demand():
+    model = new_model(rng=0)
+    assert {toy.color for toy in model.toys} == {"#00FF00"}
+
+    first, second = model.toys[:2]
+    for _ in range(4):
+        first.interact()
+    second.interact()
+
+    assert first.color == "#ff0000"
+    assert second.color == "#40bf00"
+    assert model.toys[2].color == "#00ff00"
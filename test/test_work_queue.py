@@ -0,0 +1,166 @@
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from infant_abm.db_utils import load_run
+from infant_abm.simulation.work_queue import WorkQueue, run_worker
+
+from test.helpers import RewardCollector, new_simulation, parameter_sets
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sweep_simulation(output_dir):
+    output_dir.mkdir()
+    return new_simulation(
+        output_dir,
+        "sweep",
+        seed=3,
+        datacollector=RewardCollector,
+        iterations=200,
+        repeats=4,
+    )
+
+
+def load_rewards(run_path):
+    _, load_partial = load_run(run_path)
+    return {
+        (index, repetition): np.array(result["rewards"])
+        for index in range(len(parameter_sets))
+        for repetition, result in load_partial(index).items()
+    }
+
+
+def assert_same_results(run_path, expected_path):
+    rewards = load_rewards(run_path)
+    expected = load_rewards(expected_path)
+
+    assert rewards.keys() == expected.keys()
+    for key, value in rewards.items():
+        assert np.array_equal(value, expected[key])
+
+
+def test_sharded_workers(tmp_path):
+    reference = sweep_simulation(tmp_path / "reference")
+    reference.run()
+
+    simulation = sweep_simulation(tmp_path / "queued")
+    simulation.submit(chunk_size=2)
+
+    # Every parameter set has one task in each shard
+    assert run_worker(simulation.output_dir, shard=0, num_shards=2) == 2
+    assert not any(name.endswith(".json") for name in os.listdir(simulation.output_dir))
+
+    assert run_worker(simulation.output_dir, shard=1, num_shards=2) == 2
+    assert_same_results(simulation.output_dir, reference.output_dir)
+    assert run_worker(simulation.output_dir) == 0
+
+
+def test_workers_share_run_directory(tmp_path):
+    reference = sweep_simulation(tmp_path / "reference")
+    reference.run()
+
+    simulation = sweep_simulation(tmp_path / "queued")
+    simulation.submit(chunk_size=1)
+
+    # A task leased by a worker that died a while ago
+    work_queue = WorkQueue(simulation.output_dir)
+    assert work_queue.claim([0]) == 0
+    past = time.time() - 60
+    os.utime(work_queue.lease_path(0), (past, past))
+
+    command = [
+        sys.executable,
+        "-m",
+        "infant_abm.simulation.work_queue",
+        simulation.output_dir,
+        "--lease-timeout=5",
+        "--heartbeat=1",
+        "--poll-interval=0.1",
+    ]
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    workers = [subprocess.Popen(command, cwd=REPO_ROOT, env=env) for _ in range(3)]
+    for worker in workers:
+        assert worker.wait(timeout=120) == 0
+
+    assert_same_results(simulation.output_dir, reference.output_dir)
+
+    leftover = os.listdir(os.path.join(simulation.output_dir, "queue"))
+    assert sorted(leftover) == ["simulation.pkl", "tasks.json"]
+
+
+def test_leases_of_other_workers_are_kept(tmp_path):
+    simulation = sweep_simulation(tmp_path / "queued")
+    simulation.submit(chunk_size=2)
+
+    slow = WorkQueue(simulation.output_dir, lease_timeout=5, worker_id="slow")
+    other = WorkQueue(simulation.output_dir, lease_timeout=5, worker_id="other")
+
+    assert slow.claim([0]) == 0
+    past = time.time() - 60
+    os.utime(slow.lease_path(0), (past, past))
+    assert other.claim([0]) == 0
+
+    # The slow worker finishing late does not remove the new lease
+    slow.release(0)
+    assert os.path.exists(other.lease_path(0))
+    other.release(0)
+    assert not os.path.exists(other.lease_path(0))
+
+    other.complete(1, {})
+    remaining = [1, 2, 3]
+    assert other.claim(remaining) == 2
+    assert remaining == [2, 3]
+
+
+def test_expired_lease_is_taken_over_once(tmp_path, monkeypatch):
+    simulation = sweep_simulation(tmp_path / "queued")
+    simulation.submit(chunk_size=2)
+
+    crashed = WorkQueue(simulation.output_dir, lease_timeout=5, worker_id="crashed")
+    first = WorkQueue(simulation.output_dir, lease_timeout=5, worker_id="first")
+    second = WorkQueue(simulation.output_dir, lease_timeout=5, worker_id="second")
+
+    assert crashed.claim([0]) == 0
+    past = time.time() - 60
+    os.utime(crashed.lease_path(0), (past, past))
+
+    rename = os.rename
+
+    def interleaved(src, dst):
+        # The first worker takes over between the check and rename of the second
+        monkeypatch.setattr(os, "rename", rename)
+        assert first.claim([0]) == 0
+        rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", interleaved)
+    assert second.claim([0]) is None
+
+    with open(first.lease_path(0)) as f:
+        assert f.read() == "first"
+    assert sorted(os.listdir(first.dir)) == [
+        "simulation.pkl",
+        "task-0.lease",
+        "tasks.json",
+    ]
+
+
+def test_worker_waits_for_crashed_saver(tmp_path):
+    reference = sweep_simulation(tmp_path / "reference")
+    reference.run()
+
+    simulation = sweep_simulation(tmp_path / "queued")
+    simulation.submit(chunk_size=2)
+
+    # Lock of a worker that crashed while saving the first set
+    with open(os.path.join(simulation.output_dir, "queue", "set-0.lease"), "w") as f:
+        f.write("crashed")
+
+    run_worker(
+        simulation.output_dir, lease_timeout=1.0, heartbeat=0.2, poll_interval=0.1
+    )
+
+    assert_same_results(simulation.output_dir, reference.output_dir)